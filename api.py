@@ -0,0 +1,146 @@
+"""
+Read-only HTTP API for Hollywood Moguls
+
+Dashboards, stream overlays and monitoring can follow a game without a
+Socket.IO connection:
+
+    GET /api/rooms/<room_id>/state       full game state (as broadcast)
+    GET /api/rooms/<room_id>/phase       phase, year, turn and ready gates
+    GET /api/rooms/<room_id>/standings   players ranked by score
+    GET /api/rooms/<room_id>/releases    released films with box office (?season=Spring)
+    GET /api/rooms/<room_id>/awards      award categories, nominees and winners
+
+Each response is rendered once per state version and shared by every
+reader, with a strong ETag built from the game ID and version. Send it back
+in If-None-Match to get a 304 while nothing has changed; add ?wait=<seconds>
+to long-poll, holding the request until the state moves on (or the wait
+runs out, which also answers 304).
+"""
+import json
+import zlib
+
+from flask import Response, abort, request
+
+# Longest a long-poll request may be held open, in seconds
+MAX_WAIT = 30
+
+# Rendered views kept at once (across rooms and query variants)
+MAX_CACHED = 1000
+
+
+def phase_view(game_state, args):
+    return {
+        'phase': game_state.phase,
+        'year': game_state.year,
+        'turn': game_state.turn,
+        'bidding_mode': game_state.bidding_mode,
+        'ready': {
+            gate: barrier.progress(len(game_state.players))
+            for gate, barrier in game_state.barriers.items()
+        }
+    }
+
+
+def standings_view(game_state, args):
+    standings = [
+        {
+            'player_id': player_id,
+            'name': player['name'],
+            'money': player['money'],
+            'score': player['score'],
+            'film_count': len(player.get('films', []))
+        }
+        for player_id, player in game_state.players.items()
+    ]
+    standings.sort(key=lambda p: p['score'], reverse=True)
+    return {'standings': standings}
+
+
+def releases_view(game_state, args):
+    season = args.get('season')
+    films = []
+    for film in game_state.all_films():
+        results = game_state.release_results.get(film['id'])
+        if results and (season is None or results.get('season') == season):
+            films.append({**film, **results})
+    films.sort(key=lambda f: f['box_office'], reverse=True)
+    return {'season': season, 'films': films}
+
+
+def awards_view(game_state, args):
+    return {'awards': game_state.awards}
+
+
+# {view name: (render function, query parameters that select a variant)}
+VIEWS = {
+    'state': (lambda game_state, args: dict(game_state.snapshot), ()),
+    'phase': (phase_view, ()),
+    'standings': (standings_view, ()),
+    'releases': (releases_view, ('season',)),
+    'awards': (awards_view, ())
+}
+
+
+def register_api(app, rooms, owner_redirect):
+    """
+    Add the read-only API routes to `app`.
+
+    Args:
+        app: The Flask app
+        rooms: This worker's RoomRegistry
+        owner_redirect: Callable(room_id) returning a redirect to the worker
+            hosting the room, or None if it is this one
+    """
+    cache = {}  # {(room_id, view, variant): (version, etag, body)}
+
+    def render(room, view, variant):
+        """
+        This view's JSON for the room's current version, rendered at most
+        once per version. Returns (version, etag, body).
+        """
+        game_state = room.game_state
+        version = game_state.version
+        etag = f'{room.game_id}.{version}.{view}'
+        if any(variant):
+            etag += f'.{zlib.crc32(json.dumps(variant).encode("utf-8")):08x}'
+        key = (room.room_id, view, variant)
+        cached = cache.get(key)
+        if cached is None or cached[1] != etag:
+            render_view, params = VIEWS[view]
+            data = render_view(game_state, {p: v for p, v in zip(params, variant) if v})
+            data['version'] = version
+            if len(cache) >= MAX_CACHED:
+                cache.clear()
+            cached = cache[key] = (version, etag, json.dumps(data))
+        return cached
+
+    @app.route('/api/rooms/<room_id>/<view>')
+    def api_view(room_id, view):
+        """One read-only view of a room's game"""
+        if view not in VIEWS:
+            abort(404)
+        redirect = owner_redirect(room_id)
+        if redirect is not None:
+            return redirect
+        room = rooms.get(room_id)
+        if room is None:
+            abort(404)
+
+        variant = tuple(request.args.get(param, '') for param in VIEWS[view][1])
+        with room.engine.lock:
+            version, etag, body = render(room, view, variant)
+
+        if etag in request.if_none_match:
+            wait = min(request.args.get('wait', 0, type=float), MAX_WAIT)
+            if wait <= 0 or not room.wait_for_update(version, wait):
+                return cacheable(Response(status=304), etag)
+            with room.engine.lock:
+                version, etag, body = render(room, view, variant)
+
+        return cacheable(Response(body, mimetype='application/json'), etag)
+
+    def cacheable(response, etag):
+        """Let caches keep the response but revalidate it every time"""
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
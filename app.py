@@ -1,39 +1,183 @@
 """
 Main Flask application for Hollywood Moguls
+
+Development server: python app.py
+Production (multi-core, no reloader): python server.py
 """
-from flask import Flask, render_template
+import atexit
+import os
+from urllib.parse import urlsplit
+
+from flask import Flask, abort, jsonify, redirect, render_template, request
 from flask_socketio import SocketIO
-from game_logic import GameState
+from api import register_api
+from archive import GameArchive
+from config import load_config
+from game_logic import MATCH_SEATS, load_name_corpus
+from lifecycle import RoomLifecycle, SnapshotStore
+from matchmaking import DEFAULT_SEATS, MATCHMAKING_KEY, Matchmaker, register_matchmaking
+from memory_accounting import MemoryAccountant
+from migration import Migrator, register_internal
+import ratelimit
+from rooms import DEFAULT_ROOM, RoomRegistry, valid_room_id, worker_for_room
 import socket_handlers
+from tracing import tracer
+import wire
+
+
+def create_app(config=None, async_mode=None, worker_index=0, directory=None):
+    """
+    Build the Flask app and its Socket.IO server.
+
+    Args:
+        config: Config dict from config.load_config() (default: the environment)
+        async_mode: Socket.IO async mode (None = let Flask-SocketIO pick)
+        worker_index: Which of config['WORKERS'] worker processes this is
+        directory: RoomDirectory shared by the workers (rooms can move
+            between them)
+
+    Returns:
+        (app, socketio)
+    """
+    config = config or load_config()
+
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = config['SECRET_KEY']
+    socketio = SocketIO(
+        app,
+        cors_allowed_origins=config['CORS_ORIGINS'],
+        async_mode=async_mode,
+        logger=config['DEBUG'],
+        engineio_logger=config['DEBUG'],
+        json=wire.PacketJSON   # game_update payloads arrive already JSON-encoded
+    )
+
+    # Finished games are written to SQLite by a background thread
+    archive = None
+    if config['ARCHIVE_PATH']:
+        archive = GameArchive(config['ARCHIVE_PATH'])
+        atexit.register(archive.close)
+
+    # Spans for each room's turns, written as a Chrome trace per worker
+    if config['TRACE_DIR']:
+        tracer.configure(os.path.join(config['TRACE_DIR'], f'moguls-{worker_index}.trace.json'),
+                         max_mb=config['TRACE_MAX_MB'], backups=config['TRACE_BACKUPS'],
+                         process_name=f'worker {worker_index}')
+        tracer.start()
+        atexit.register(tracer.flush)
+
+    # Each worker hosts its share of the rooms
+    # Idle rooms are spilled to disk and finished ones expire, so memory stays flat
+    store = SnapshotStore(config['SPILL_DIR']) if config['SPILL_DIR'] else None
+    rooms = RoomRegistry(worker_index=worker_index, workers=config['WORKERS'], archive=archive,
+                         directory=directory, store=store)
+    lifecycle = RoomLifecycle(rooms, max_rooms=config['MAX_ROOMS'], max_memory_mb=config['ROOM_MEMORY_MB'])
+    lifecycle.start()
+    name_corpus = load_name_corpus(config['NAME_CORPUS']) if config['NAME_CORPUS'] else None
+    limiter, admission, outbox = socket_handlers.register_handlers(socketio, rooms, name_corpus)
+
+    # Opt-in: memory per room and per module, sampled over time
+    accountant = None
+    if config['MEMORY_ACCOUNTING']:
+        accountant = MemoryAccountant(rooms)
+        accountant.start()
+
+    def owner_redirect(room_id):
+        """
+        Redirect to the worker that hosts `room_id`, so pages, sockets and
+        API reads all talk to that worker (None if it is this one).
+        """
+        return worker_redirect(rooms.owner_of(room_id))
 
-app = Flask(__name__)
-app.config['SECRET_KEY'] = 'hollywood-game-secret'
-socketio = SocketIO(app, cors_allowed_origins="*")
+    def worker_redirect(owner):
+        """Redirect this request to worker `owner` (None if it is this one)"""
+        if rooms.workers > 1:
+            owner_port = config['WORKER_PORT_BASE'] + owner
+            if int(request.environ.get('SERVER_PORT', 0)) != owner_port:
+                hostname = urlsplit(request.host_url).hostname
+                if ':' in hostname:
+                    hostname = f'[{hostname}]'
+                return redirect(f'{request.scheme}://{hostname}:{owner_port}{request.full_path}')
+        return None
 
-# Initialize game state
-game_state = GameState()
+    def room_page(template):
+        """Render a page for the requested room on the worker that hosts it"""
+        room_id = request.args.get('room') or DEFAULT_ROOM
+        if not valid_room_id(room_id):
+            abort(404)
+        return owner_redirect(room_id) or render_template(template, room=room_id)
 
-# Register socket handlers
-socket_handlers.register_handlers(socketio, game_state)
+    @app.route('/')
+    def index():
+        """Host view"""
+        return room_page('host.html')
 
-@app.route('/')
-def index():
-    """Host view"""
-    return render_template('host.html')
+    @app.route('/player')
+    def player():
+        """Player view"""
+        return room_page('player.html')
+
+    @app.route('/audience')
+    def audience():
+        """Audience view: vote in the award ceremony"""
+        return room_page('audience.html')
+
+    # One matchmaking queue, on the worker MATCHMAKING_KEY hashes to. Not
+    # rooms.owner_of(): that skips draining workers, and a worker restarted
+    # by a rolling restart is still marked draining while it boots
+    matchmaker = Matchmaker(rooms)
+    queue_worker = worker_for_room(MATCHMAKING_KEY, rooms.workers)
+    app.extensions['matchmaker'] = matchmaker
+
+    def queue_redirect():
+        return worker_redirect(queue_worker)
+
+    @app.route('/play')
+    def play():
+        """Find a game: matchmaking into a new room (served by the queue's worker)"""
+        return queue_redirect() or render_template('play.html', seats=MATCH_SEATS, default_seats=DEFAULT_SEATS)
+
+    @app.route('/stats')
+    def stats():
+        """Inbound event counters and room lifecycle counts for this worker"""
+        return jsonify(worker=worker_index, rooms=len(rooms.rooms), lifecycle=dict(lifecycle.stats),
+                       outbound=outbox.stats(), **ratelimit.stats(limiter, rooms, admission))
+
+    @app.route('/admin/memory')
+    def admin_memory():
+        """Memory per room (over time) and per module, with anything growing steadily"""
+        if accountant is None:
+            abort(404)
+        return jsonify(accountant.report())
+
+    register_api(app, rooms, owner_redirect)
+
+    if queue_worker == worker_index:
+        matchmaker.start()
+    register_matchmaking(app, matchmaker, queue_redirect)
+
+    # With several workers, rooms can be moved between them live
+    if config['WORKERS'] > 1:
+        migrator = Migrator(rooms, socketio, config)
+        register_internal(app, migrator)
+        migrator.start()
+
+    return app, socketio
 
-@app.route('/player')
-def player():
-    """Player view"""
-    return render_template('player.html')
 
 if __name__ == '__main__':
+    config = load_config()
+    app, socketio = create_app(config)
+
     print("\n" + "="*50)
-    print("🎬 HOLLYWOOD MOGULS SERVER")
+    print("🎬 HOLLYWOOD MOGULS SERVER (development)")
     print("="*50)
-    print("\nHost view: http://localhost:8080")
-    print("Players connect to: http://YOUR_LOCAL_IP:8080/player")
+    print(f"\nHost view: http://localhost:{config['PORT']}")
+    print(f"Players connect to: http://YOUR_LOCAL_IP:{config['PORT']}/player")
     print("\nTo find your local IP:")
     print("  Mac/Linux: ifconfig | grep inet")
     print("  Windows: ipconfig")
+    print("\nFor multi-core production use: python server.py")
     print("="*50 + "\n")
-    socketio.run(app, host='0.0.0.0', port=8080, debug=True)
\ No newline at end of file
+    socketio.run(app, host=config['HOST'], port=config['PORT'], debug=config['DEBUG'],
+                 use_reloader=False, allow_unsafe_werkzeug=True)
@@ -0,0 +1,367 @@
+"""
+SQLite archive of finished Hollywood Moguls games
+
+When a game reaches game_complete its players, talent pool, films (with box
+office), bidding wars and award winners are snapshotted into a plain dict and
+queued. A background writer thread inserts queued games in batches, one
+transaction per batch, on its own WAL-mode connection, so handlers only pay
+for building the snapshot.
+
+Usage:
+    python archive.py stats  [--db moguls_archive.db]
+    python archive.py export [--db moguls_archive.db] > games.jsonl
+"""
+import argparse
+import contextlib
+import json
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+DEFAULT_PATH = 'moguls_archive.db'
+
+# Games waiting to be written; beyond this, new games are dropped (and counted)
+# rather than ever blocking a game thread
+QUEUE_SIZE = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game_id      TEXT PRIMARY KEY,
+    room_id      TEXT,
+    finished_at  REAL,
+    num_players  INTEGER,
+    bidding_mode TEXT
+);
+CREATE TABLE IF NOT EXISTS players (
+    game_id   TEXT,
+    player_id TEXT,
+    name      TEXT,
+    strategy  TEXT,
+    money     INTEGER,
+    score     INTEGER,
+    winner    INTEGER
+);
+CREATE TABLE IF NOT EXISTS talent (
+    game_id  TEXT,
+    card_id  TEXT,
+    name     TEXT,
+    role     TEXT,
+    heat     INTEGER,
+    prestige INTEGER,
+    salary   INTEGER,
+    genre    TEXT,
+    audience TEXT
+);
+CREATE TABLE IF NOT EXISTS films (
+    game_id    TEXT,
+    film_id    TEXT,
+    player_id  TEXT,
+    title      TEXT,
+    genre      TEXT,
+    audience   TEXT,
+    heat       INTEGER,
+    prestige   INTEGER,
+    cost       INTEGER,
+    box_office INTEGER,
+    multiplier REAL,
+    season     TEXT
+);
+CREATE TABLE IF NOT EXISTS bids (
+    game_id   TEXT,
+    phase     TEXT,
+    turn      INTEGER,
+    card_id   TEXT,
+    player_id TEXT,
+    bid       INTEGER,
+    won       INTEGER
+);
+CREATE TABLE IF NOT EXISTS awards (
+    game_id   TEXT,
+    category  TEXT,
+    film_id   TEXT,
+    player_id TEXT,
+    votes     INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_films_genre_audience ON films (genre, audience);
+CREATE INDEX IF NOT EXISTS idx_films_game ON films (game_id);
+CREATE INDEX IF NOT EXISTS idx_players_strategy ON players (strategy);
+CREATE INDEX IF NOT EXISTS idx_players_game ON players (game_id);
+CREATE INDEX IF NOT EXISTS idx_bids_game ON bids (game_id);
+CREATE INDEX IF NOT EXISTS idx_awards_game ON awards (game_id);
+"""
+
+# Column order for each table, matching the row tuples built by snapshot_game()
+COLUMNS = {
+    'games': ('game_id', 'room_id', 'finished_at', 'num_players', 'bidding_mode'),
+    'players': ('game_id', 'player_id', 'name', 'strategy', 'money', 'score', 'winner'),
+    'talent': ('game_id', 'card_id', 'name', 'role', 'heat', 'prestige', 'salary', 'genre', 'audience'),
+    'films': ('game_id', 'film_id', 'player_id', 'title', 'genre', 'audience', 'heat', 'prestige',
+              'cost', 'box_office', 'multiplier', 'season'),
+    'bids': ('game_id', 'phase', 'turn', 'card_id', 'player_id', 'bid', 'won'),
+    'awards': ('game_id', 'category', 'film_id', 'player_id', 'votes')
+}
+
+
+def snapshot_game(game_state, game_id, room_id=None, strategies=None):
+    """
+    Capture everything worth keeping from a finished game as plain data.
+
+    Args:
+        game_state: The finished GameState
+        game_id: Unique ID for this game
+        room_id: Room the game was played in
+        strategies: Optional {player_id: strategy name} (bot games)
+
+    Returns:
+        Dict of {table: [row tuples]} ready for GameArchive.submit()
+    """
+    strategies = strategies or {}
+    players = game_state.players
+    best = max((p['score'] for p in players.values()), default=0)
+
+    rows = {table: [] for table in COLUMNS}
+    rows['games'].append((game_id, room_id, time.time(), len(players), game_state.bidding_mode))
+
+    for player_id, player in players.items():
+        rows['players'].append((
+            game_id, player_id, player['name'], strategies.get(player_id),
+            player['money'], player['score'], int(player['score'] == best)
+        ))
+
+        for film in player.get('films', []):
+            results = game_state.release_results.get(film['id'], {})
+            rows['films'].append((
+                game_id, film['id'], player_id, film['title'], film['genre'], film['audience'],
+                film['heat'], film['prestige'], sum(r['salary'] for r in film['roles']),
+                results.get('box_office'), results.get('multiplier'), results.get('season')
+            ))
+
+    for talent in game_state.talent_pool:
+        rows['talent'].append((
+            game_id, talent.get('id'), talent['name'], talent['role'], talent['heat'],
+            talent['prestige'], talent['salary'], talent.get('genre'), talent.get('audience')
+        ))
+
+    for war in game_state.bid_log:
+        for player_id, bid in war['bids'].items():
+            rows['bids'].append((
+                game_id, war['phase'], war['turn'], war['card_id'], player_id, bid,
+                int(player_id == war['winner'])
+            ))
+
+    if game_state.awards:
+        for category_key, category in game_state.awards['categories'].items():
+            winner = category.get('winner')
+            if winner:
+                nominee_index = category['nominees'].index(winner)
+                votes = game_state.tallies[category_key]['players'].counts()[nominee_index]
+                rows['awards'].append((game_id, category_key, winner['id'], winner.get('player_id'), votes))
+
+    return rows
+
+
+class GameArchive:
+    """Background, batched writer for finished games plus analytics queries"""
+
+    def __init__(self, path=DEFAULT_PATH, batch_size=100, flush_interval=1.0):
+        """
+        Args:
+            path: SQLite database file
+            batch_size: Most games written per transaction
+            flush_interval: Seconds to wait for a batch to fill before writing
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self.written = 0
+        self.dropped = 0
+        self.duplicates = 0
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+        with contextlib.closing(self.connect()) as conn:
+            conn.executescript(SCHEMA)
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    # ============================================================================
+    # WRITING
+    # ============================================================================
+
+    def submit(self, rows):
+        """Queue a snapshot_game() result; never blocks"""
+        self._ensure_writer()
+        try:
+            self.queue.put_nowait(rows)
+        except queue.Full:
+            self.dropped += 1
+            print(f'⚠️ Archive queue full, dropped a game ({self.dropped} dropped so far)')
+
+    def _ensure_writer(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='game-archive', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        conn = self.connect()
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            stop = batch[0] is None
+            while not stop and len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                else:
+                    batch.append(item)
+
+            games = [rows for rows in batch if rows is not None]
+            if games:
+                try:
+                    self._write(conn, games)
+                except sqlite3.Error as e:
+                    print(f'❌ Archive write failed ({len(games)} games lost): {e}')
+            for _ in batch:
+                self.queue.task_done()
+            if stop:
+                conn.close()
+                return
+
+    def _write(self, conn, games):
+        try:
+            self._insert(conn, games)
+        except sqlite3.IntegrityError:
+            # Some game in the batch is already archived: write the rest one by one
+            for game in games:
+                try:
+                    self._insert(conn, [game])
+                except sqlite3.IntegrityError:
+                    self.duplicates += 1
+                    print(f"⚠️ Game {game['games'][0][0]} is already archived, skipped")
+
+    def _insert(self, conn, games):
+        with conn:
+            for table, columns in COLUMNS.items():
+                rows = [row for game in games for row in game[table]]
+                if rows:
+                    placeholders = ', '.join('?' * len(columns))
+                    conn.executemany(
+                        f'INSERT INTO {table} ({", ".join(columns)}) VALUES ({placeholders})', rows
+                    )
+        self.written += len(games)
+
+    def flush(self):
+        """Block until every queued game has been written"""
+        if self._thread is not None:
+            self.queue.join()
+
+    def close(self):
+        """Write what's queued and stop the writer thread"""
+        if self._thread is not None:
+            self.queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    # ============================================================================
+    # QUERIES
+    # ============================================================================
+
+    def query(self, sql, params=()):
+        """Run a read query, returning rows as dicts"""
+        with contextlib.closing(self.connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            return [dict(row) for row in conn.execute(sql, params)]
+
+    def roi_by_genre_audience(self):
+        """Average box-office return on talent salaries, per genre and audience"""
+        return self.query("""
+            SELECT genre, audience,
+                   COUNT(*) AS films,
+                   AVG(box_office) AS avg_box_office,
+                   AVG((box_office - cost) * 1.0 / cost) AS avg_roi
+            FROM films
+            WHERE box_office IS NOT NULL AND cost > 0
+            GROUP BY genre, audience
+            ORDER BY avg_roi DESC
+        """)
+
+    def win_rate_by_strategy(self):
+        """Share of seats that finished on top, per bot strategy (human seats: None)"""
+        return self.query("""
+            SELECT strategy,
+                   COUNT(*) AS seats,
+                   AVG(winner) AS win_rate,
+                   AVG(score) AS avg_score
+            FROM players
+            GROUP BY strategy
+            ORDER BY win_rate DESC
+        """)
+
+    def iter_games(self, chunk_size=500):
+        """
+        Stream archived games one at a time as dicts (oldest first), without
+        loading the whole archive into memory.
+        """
+        with contextlib.closing(self.connect()) as conn, contextlib.closing(self.connect()) as details:
+            conn.row_factory = details.row_factory = sqlite3.Row
+            games = conn.execute('SELECT * FROM games ORDER BY finished_at')
+            while True:
+                chunk = games.fetchmany(chunk_size)
+                if not chunk:
+                    return
+                for game in chunk:
+                    record = dict(game)
+                    for table in ('players', 'films', 'bids', 'awards'):
+                        record[table] = [
+                            dict(row) for row in
+                            details.execute(f'SELECT * FROM {table} WHERE game_id = ?', (game['game_id'],))
+                        ]
+                    yield record
+
+    def export_jsonl(self, out):
+        """Write every archived game to `out` as one JSON object per line"""
+        count = 0
+        for record in self.iter_games():
+            out.write(json.dumps(record) + '\n')
+            count += 1
+        return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the Hollywood Moguls game archive')
+    parser.add_argument('command', choices=['stats', 'export'])
+    parser.add_argument('--db', default=DEFAULT_PATH)
+    args = parser.parse_args()
+
+    archive = GameArchive(args.db)
+    if args.command == 'export':
+        archive.export_jsonl(sys.stdout)
+        return
+
+    print("\n🎬 ROI BY GENRE / AUDIENCE")
+    for row in archive.roi_by_genre_audience():
+        print(f"  {row['genre']:<10} {row['audience']:<10} {row['films']:6} films   "
+              f"avg ${row['avg_box_office']:7.1f}M   ROI {row['avg_roi']:6.2f}")
+
+    print("\n🏆 WIN RATE BY STRATEGY")
+    for row in archive.win_rate_by_strategy():
+        print(f"  {str(row['strategy']):<10} {row['seats']:6} seats   "
+              f"win rate {row['win_rate']:6.1%}   avg score {row['avg_score']:8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Ready barriers for Hollywood Moguls
+
+Every "wait until all players are ready" gate (continue after bidding results,
+done packaging, continue after releases, ...) is a ReadyBarrier: arriving and
+counting are O(1), and the barrier resets itself as soon as it completes.
+"""
+
+
+class ReadyBarrier:
+    """Tracks which players are ready to leave the current phase"""
+
+    def __init__(self, name):
+        self.name = name
+        self.arrived = set()
+        self.generation = 0       # Bumped on every reset so stale timers can be ignored
+        self.deadline = None      # Wall-clock time stragglers get auto-advanced, if any
+
+    def arrive(self, player_id, total):
+        """
+        Mark a player as ready.
+
+        Args:
+            player_id: The player who is ready
+            total: Number of players the barrier is waiting for
+
+        Returns:
+            True if this arrival completed the barrier (which is then reset)
+        """
+        self.arrived.add(player_id)
+        if len(self.arrived) >= total:
+            self.reset()
+            return True
+        return False
+
+    def is_ready(self, player_id):
+        return player_id in self.arrived
+
+    @property
+    def count(self):
+        return len(self.arrived)
+
+    def reset(self):
+        """Clear arrivals and the deadline, starting a new generation"""
+        self.arrived = set()
+        self.deadline = None
+        self.generation += 1
+
+    def progress(self, total):
+        """Progress payload for the UI"""
+        return {
+            'ready': len(self.arrived),
+            'total': total,
+            'arrived': list(self.arrived),
+            'deadline': self.deadline
+        }
@@ -0,0 +1,286 @@
+"""
+Micro-benchmarks for the pure functions in game_logic
+
+Every case runs against seeded synthetic lobbies (4 up to thousands of
+players) or talent pools (up to 100k talent) and records, per size, the best
+time over a few repeats and the peak memory allocated (tracemalloc). From
+the timings a scaling exponent is fitted (time ~ size^k on a log-log scale:
+k = 1 is linear, 2 is quadratic), which unlike raw times doesn't depend on
+the machine. Results are compared against benchmarks/baselines.json: a case
+fails if its exponent grows by more than EXPONENT_TOLERANCE or its peak
+allocations by more than ALLOCATION_TOLERANCE at any size.
+
+Usage:
+    python benchmarks/bench_game_logic.py             # compare with baselines
+    python benchmarks/bench_game_logic.py --quick     # smaller sizes
+    python benchmarks/bench_game_logic.py --only generate_turn_cards
+    python benchmarks/bench_game_logic.py --update    # rewrite the baselines
+"""
+import argparse
+import contextlib
+import json
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_logic  # noqa: E402
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+SEED = 1234
+REPEATS = 3
+
+# A case regresses if its scaling exponent grows by more than this...
+EXPONENT_TOLERANCE = 0.3
+# ...or its peak allocations by more than this factor (plus a little slack
+# for tiny sizes, where allocator noise dominates)
+ALLOCATION_TOLERANCE = 1.5
+ALLOCATION_SLACK = 16 * 1024
+
+PLAYER_SIZES = [4, 16, 64, 256, 1024, 4096]
+POOL_SIZES = [100, 1000, 10000, 100000]
+QUICK_PLAYER_SIZES = [4, 16, 64, 256]
+QUICK_POOL_SIZES = [100, 1000, 10000]
+
+ROLES = ('screenwriter', 'director', 'star')
+FILMS_PER_PLAYER = 3
+
+
+# ============================================================================
+# SYNTHETIC GAMES
+# ============================================================================
+
+def make_pool(size, rng):
+    """`size` interned talent cards; names repeat up to 3 times"""
+    random.seed(rng.random())
+    store = game_logic.CardStore()
+    return [
+        store.intern(game_logic.generate_talent_stats(ROLES[i % 3], f'Talent {i // 3}'))
+        for i in range(size)
+    ], store
+
+
+def make_film(roles, player, index, store):
+    stats = game_logic.calculate_film_stats(roles)
+    return store.intern_film({
+        'title': f"{player['name']} Picture {index}",
+        'teaser': '',
+        'roles': tuple(roles),
+        'studio': player['name'],
+        'player_id': player['id'],
+        **stats
+    })
+
+
+def make_players(size, rng, with_films=True):
+    """`size` seated players, each with FILMS_PER_PLAYER greenlit films"""
+    random.seed(rng.random())
+    store = game_logic.CardStore()
+    players = {}
+    for i in range(size):
+        player_id = f'p{i}'
+        player = {'id': player_id, 'name': f'Studio {i}', 'money': 100, 'score': 0, 'roles': [], 'films': []}
+        if with_films:
+            for f in range(FILMS_PER_PLAYER):
+                roles = [store.intern(game_logic.generate_talent_stats('producer', 'Producer', is_producer=True))]
+                roles += [store.intern(game_logic.generate_talent_stats(role, f'{role} {i}-{f}')) for role in ROLES]
+                player['films'].append(make_film(roles, player, f, store))
+        players[player_id] = player
+    return players
+
+
+def make_game_state(pool_size, rng, num_players=8):
+    """A game mid-phase: `pool_size` talent, half of it already taken"""
+    game_state = game_logic.GameState()
+    for i in range(num_players):
+        game_state.add_player(f'sid{i}', f'Studio {i}')
+    pool, store = make_pool(pool_size, rng)
+    game_state.cards = store
+    game_state.talent_pool = pool
+    game_state.selected_roles_this_phase = {t['name'] for t in pool[::2]}
+    return game_state
+
+
+# ============================================================================
+# CASES: name -> (size axis, setup(size, rng) -> args, run(*args))
+# ============================================================================
+
+def films_of(players):
+    return [film for player in players.values() for film in player['films']]
+
+
+CASES = {
+    'generate_talent_stats': (
+        'pool',
+        lambda size, rng: (size,),
+        lambda size: [game_logic.generate_talent_stats(ROLES[i % 3], 'Name') for i in range(size)]
+    ),
+    'generate_talent_batch': (
+        'pool',
+        lambda size, rng: ([f'Talent {i}' for i in range(size)],),
+        lambda names: game_logic.generate_talent_batch('director', names)
+    ),
+    'handle_duplicate_names': (
+        'pool',
+        lambda size, rng: ([{'name': f'Talent {i // 3}'} for i in range(size)],),
+        game_logic.handle_duplicate_names
+    ),
+    'generate_turn_cards': (
+        'pool',
+        lambda size, rng: (make_game_state(size, rng),),
+        game_logic.generate_turn_cards
+    ),
+    'calculate_film_stats': (
+        'players',
+        lambda size, rng: ([film['roles'] for film in films_of(make_players(size, rng))],),
+        lambda packages: [game_logic.calculate_film_stats(roles) for roles in packages]
+    ),
+    'process_film_releases': (
+        'players',
+        lambda size, rng: (make_players(size, rng), {}),
+        lambda players, results: game_logic.process_film_releases(players, results)
+    ),
+    'get_all_films_from_players': (
+        'players',
+        lambda size, rng: (make_players(size, rng),),
+        game_logic.get_all_films_from_players
+    ),
+    'AwardCategory.get_nominees': (
+        'players',
+        lambda size, rng: (films_of(make_players(size, rng)),),
+        game_logic.AWARD_CATEGORIES['best_picture'].get_nominees
+    ),
+    'AwardCategory.calculate_winner': (
+        'players',
+        lambda size, rng: (
+            [rng.randint(0, size) for _ in range(size * FILMS_PER_PLAYER)],
+            films_of(make_players(size, rng))
+        ),
+        game_logic.AWARD_CATEGORIES['best_picture'].calculate_winner
+    ),
+    'setup_awards': (
+        'players',
+        lambda size, rng: (make_players(size, rng),),
+        game_logic.setup_awards
+    ),
+}
+
+
+# ============================================================================
+# MEASURING
+# ============================================================================
+
+def measure(case, size):
+    """Best time over REPEATS runs and peak allocation of one run"""
+    _, setup, run = CASES[case]
+    best = math.inf
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for repeat in range(REPEATS):
+            rng = random.Random(f'{SEED}-{case}-{size}-{repeat}')
+            args = setup(size, rng)
+            random.seed(SEED)
+            started = time.perf_counter()
+            run(*args)
+            best = min(best, time.perf_counter() - started)
+
+        args = setup(size, random.Random(f'{SEED}-{case}-{size}-alloc'))
+        random.seed(SEED)
+        tracemalloc.start()
+        run(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return best, peak
+
+
+def scaling_exponent(points):
+    """Least-squares slope of log(time) against log(size)"""
+    xs = [math.log(size) for size, seconds in points]
+    ys = [math.log(max(seconds, 1e-9)) for size, seconds in points]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread if spread else 0.0
+
+
+def run_case(case, quick=False):
+    axis = CASES[case][0]
+    if axis == 'pool':
+        sizes = QUICK_POOL_SIZES if quick else POOL_SIZES
+    else:
+        sizes = QUICK_PLAYER_SIZES if quick else PLAYER_SIZES
+
+    results = {'axis': axis, 'sizes': {}}
+    points = []
+    for size in sizes:
+        seconds, peak = measure(case, size)
+        results['sizes'][str(size)] = {'seconds': seconds, 'peak_bytes': peak}
+        points.append((size, seconds))
+        print(f"  {case:<32} {axis:>7}={size:<7} {seconds * 1000:10.3f}ms  {peak / 1024:10.1f} KB")
+    # The smallest sizes are dominated by fixed overhead; fit the upper half
+    results['exponent'] = round(scaling_exponent(points[len(points) // 2 - 1:]), 3)
+    print(f"  {case:<32} scaling exponent {results['exponent']:.2f}\n")
+    return results
+
+
+def compare(case, result, baseline):
+    """Regressions of `result` against its baseline, as messages"""
+    problems = []
+    if result['exponent'] > baseline['exponent'] + EXPONENT_TOLERANCE:
+        problems.append(f"scaling exponent {result['exponent']:.2f} vs {baseline['exponent']:.2f} baseline")
+    for size, measured in result['sizes'].items():
+        expected = baseline['sizes'].get(size)
+        if expected and measured['peak_bytes'] > expected['peak_bytes'] * ALLOCATION_TOLERANCE + ALLOCATION_SLACK:
+            problems.append(f"peak allocations at {size}: {measured['peak_bytes'] / 1024:.0f} KB "
+                            f"vs {expected['peak_bytes'] / 1024:.0f} KB baseline")
+    return [f'{case}: {problem}' for problem in problems]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark game_logic at scaled input sizes')
+    parser.add_argument('--quick', action='store_true', help='Smaller sizes (fast check)')
+    parser.add_argument('--only', action='append', choices=sorted(CASES), help='Run only these cases')
+    parser.add_argument('--update', action='store_true', help='Write the results as the new baselines')
+    args = parser.parse_args()
+
+    print("\n" + "="*50)
+    print("⏱️  GAME LOGIC BENCHMARKS")
+    print("="*50 + "\n")
+
+    results = {case: run_case(case, args.quick) for case in (args.only or CASES)}
+
+    baselines = {}
+    if os.path.exists(BASELINES):
+        with open(BASELINES) as f:
+            baselines = json.load(f)
+
+    if args.update:
+        baselines.update(results)
+        with open(BASELINES, 'w') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"📝 Baselines written to {BASELINES}")
+        return 0
+
+    problems = []
+    for case, result in results.items():
+        if case in baselines:
+            problems += compare(case, result, baselines[case])
+        else:
+            print(f"⚠️ No baseline for {case} (run with --update)")
+
+    print("="*50)
+    if problems:
+        print("❌ REGRESSIONS")
+        for problem in problems:
+            print(f"  {problem}")
+        return 1
+    print("✓ No regressions against the baselines")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
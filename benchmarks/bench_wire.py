@@ -0,0 +1,93 @@
+"""
+Wire codec benchmark: encode time and bytes of game updates, per phase
+
+Plays seeded bot games through the real engine, takes the game_update
+snapshot after every round of bot actions, and encodes each one with every
+codec wire.py has installed. Reports, per phase and codec, the mean bytes
+per update and the mean encode time, against plain JSON.
+
+Usage:
+    python benchmarks/bench_wire.py
+    python benchmarks/bench_wire.py --games 10 --players 8 --bidding-mode auction
+"""
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_logic  # noqa: E402
+import tournament  # noqa: E402
+import wire  # noqa: E402
+from bots import STRATEGIES  # noqa: E402
+
+SEED = 1234
+REPEATS = 3
+
+
+def collect_snapshots(games, players, bidding_mode):
+    """{phase: [snapshots]} from `games` seeded bot games"""
+    snapshots = {}
+    strategies = list(STRATEGIES)
+
+    def observe(game_state):
+        snapshots.setdefault(game_state.phase, []).append(game_state.record_update())
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for game in range(games):
+            lineup = [strategies[(game + seat) % len(strategies)] for seat in range(players)]
+            tournament.play_game(lineup, SEED + game, bidding_mode, observe=observe)
+    return snapshots
+
+
+def measure(codec, snapshots):
+    """Mean bytes and best-of-REPEATS mean encode time (seconds) per snapshot"""
+    encode = wire.CODECS[codec]
+    size = sum(len(encode(snapshot)) for snapshot in snapshots) / len(snapshots)
+    best = float('inf')
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        for snapshot in snapshots:
+            encode(snapshot)
+        best = min(best, time.perf_counter() - started)
+    return size, best / len(snapshots)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare wire codecs on game updates, per phase')
+    parser.add_argument('--games', type=int, default=5)
+    parser.add_argument('--players', type=int, default=6)
+    parser.add_argument('--bidding-mode', choices=game_logic.BIDDING_MODES, default=game_logic.DEFAULT_BIDDING_MODE)
+    args = parser.parse_args()
+
+    print("\n" + "="*50)
+    print(f"📦 WIRE CODECS: {args.games} games, {args.players} players")
+    print("="*50)
+    missing = {'orjson', 'msgpack'} - set(wire.CODECS)
+    if missing:
+        print(f"⚠️ Not installed, skipped: {', '.join(sorted(missing))}")
+
+    snapshots = collect_snapshots(args.games, args.players, args.bidding_mode)
+    totals = {codec: [0, 0.0] for codec in wire.CODECS}
+    for phase, phase_snapshots in snapshots.items():
+        print(f"\n  {phase} ({len(phase_snapshots)} updates)")
+        json_size = None
+        for codec in wire.CODECS:
+            size, seconds = measure(codec, phase_snapshots)
+            json_size = json_size or size
+            totals[codec][0] += size * len(phase_snapshots)
+            totals[codec][1] += seconds * len(phase_snapshots)
+            print(f"    {codec:<8} {size / 1024:8.1f} KB ({size / json_size:4.0%} of json)  "
+                  f"{seconds * 1e6:8.1f} µs/encode")
+
+    count = sum(len(phase_snapshots) for phase_snapshots in snapshots.values())
+    print("\n" + "="*50)
+    for codec, (size, seconds) in totals.items():
+        print(f"  {codec:<8} {size / count / 1024:8.1f} KB/update  {seconds / count * 1e6:8.1f} µs/encode")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+Bot strategies for headless Hollywood Moguls games
+
+A bot makes every decision a player would make on their phone. Each strategy
+gets its own random.Random so decisions are reproducible from a seed.
+"""
+import random
+
+import package_optimizer
+from engine import player_war
+
+ROLE_TYPES = ['producer', 'screenwriter', 'director', 'star']
+
+
+def next_film_package(roles, no_name_talent, key='heat'):
+    """
+    Pick role indices for one film from a player's roles, filling any missing
+    role type with no-name talent (negative indices, as greenlight_film expects).
+
+    Returns:
+        List of role indices, or None if the player has no roles left
+    """
+    if not roles:
+        return None
+
+    no_name_index = {
+        talent['role']: -(i + 1) for i, talent in enumerate(no_name_talent.values())
+    }
+    package = []
+    for role_type in ROLE_TYPES:
+        candidates = [i for i, r in enumerate(roles) if r['role'] == role_type]
+        if candidates:
+            package.append(max(candidates, key=lambda i: roles[i][key]))
+        elif role_type in no_name_index:
+            package.append(no_name_index[role_type])
+    return package
+
+
+class Bot:
+    """Base strategy: override the choose_* methods"""
+
+    name = 'base'
+    package_key = 'heat'
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def affordable_cards(self, game_state, player_id):
+        money = game_state.players[player_id]['money']
+        return [
+            i for i, card in enumerate(game_state.current_turn_cards)
+            if card['salary'] <= money
+        ]
+
+    def contested_card(self, game_state, player_id):
+        """The card this player is bidding on"""
+        return player_war(game_state.bidding_war, player_id)['card_data']
+
+    def choose_card(self, game_state, player_id):
+        """Card index to select this turn, or 'pass'"""
+        raise NotImplementedError
+
+    def choose_bid(self, game_state, player_id):
+        """Extra amount to bid in the current bidding war"""
+        raise NotImplementedError
+
+    def choose_vote(self, game_state, player_id, nominees):
+        """Index of the nominee to vote for, or None if none are allowed"""
+        studio = game_state.players[player_id]['name']
+        allowed = [i for i, film in enumerate(nominees) if film.get('studio') != studio]
+        if not allowed:
+            return None
+        return max(allowed, key=lambda i: nominees[i].get('prestige', 0))
+
+    def next_film(self, game_state, player_id):
+        player = game_state.players[player_id]
+        return next_film_package(player.get('roles', []), game_state.no_name_talent, self.package_key)
+
+
+class RandomBot(Bot):
+    """Picks uniformly among affordable cards and bids at random"""
+
+    name = 'random'
+
+    def choose_card(self, game_state, player_id):
+        options = self.affordable_cards(game_state, player_id) + ['pass']
+        return self.rng.choice(options)
+
+    def choose_bid(self, game_state, player_id):
+        spare = game_state.players[player_id]['money'] - self.contested_card(game_state, player_id)['salary']
+        return self.rng.randint(0, max(0, min(spare, 10)))
+
+    def choose_vote(self, game_state, player_id, nominees):
+        studio = game_state.players[player_id]['name']
+        allowed = [i for i, film in enumerate(nominees) if film.get('studio') != studio]
+        return self.rng.choice(allowed) if allowed else None
+
+
+class HeatBot(Bot):
+    """Chases box office: hottest affordable card, aggressive bids"""
+
+    name = 'heat'
+
+    def choose_card(self, game_state, player_id):
+        options = self.affordable_cards(game_state, player_id)
+        if not options:
+            return 'pass'
+        cards = game_state.current_turn_cards
+        return max(options, key=lambda i: cards[i]['heat'])
+
+    def choose_bid(self, game_state, player_id):
+        # About 30% of what's spare: ties lose the card, so two HeatBots mustn't bid alike
+        spare = game_state.players[player_id]['money'] - self.contested_card(game_state, player_id)['salary']
+        return max(0, int(spare * self.rng.uniform(0.25, 0.35)))
+
+
+class PrestigeBot(Bot):
+    """Chases awards: most prestigious affordable card, modest bids"""
+
+    name = 'prestige'
+    package_key = 'prestige'
+
+    def choose_card(self, game_state, player_id):
+        options = self.affordable_cards(game_state, player_id)
+        if not options:
+            return 'pass'
+        cards = game_state.current_turn_cards
+        return max(options, key=lambda i: cards[i]['prestige'])
+
+    def choose_bid(self, game_state, player_id):
+        spare = game_state.players[player_id]['money'] - self.contested_card(game_state, player_id)['salary']
+        return max(0, min(spare, 5))
+
+
+class ThriftyBot(Bot):
+    """Best heat per dollar, never bids above salary"""
+
+    name = 'thrifty'
+
+    def choose_card(self, game_state, player_id):
+        options = self.affordable_cards(game_state, player_id)
+        if not options:
+            return 'pass'
+        cards = game_state.current_turn_cards
+        return max(options, key=lambda i: cards[i]['heat'] / max(1, cards[i]['salary']))
+
+    def choose_bid(self, game_state, player_id):
+        return 0
+
+
+class PlannerBot(Bot):
+    """Buys for heat and prestige alike, and packages with the optimizer, aiming for awards"""
+
+    name = 'planner'
+
+    def choose_card(self, game_state, player_id):
+        options = self.affordable_cards(game_state, player_id)
+        if not options:
+            return 'pass'
+        cards = game_state.current_turn_cards
+        return max(options, key=lambda i: cards[i]['heat'] + cards[i]['prestige'])
+
+    def choose_bid(self, game_state, player_id):
+        # Keeps more money back than HeatBot: it wants a full slate of films
+        spare = game_state.players[player_id]['money'] - self.contested_card(game_state, player_id)['salary']
+        return max(0, int(spare * self.rng.uniform(0.1, 0.2)))
+
+    def next_film(self, game_state, player_id):
+        roles = game_state.players[player_id].get('roles', [])
+        if not roles:
+            return None
+        result = package_optimizer.suggest_packages(roles, game_state.no_name_talent, objective='prestige', top_k=1)
+        if not result['suggestions']:
+            return super().next_film(game_state, player_id)
+        return result['suggestions'][0]['films'][0]['role_indices']
+
+
+STRATEGIES = {bot.name: bot for bot in (RandomBot, HeatBot, PrestigeBot, ThriftyBot, PlannerBot)}
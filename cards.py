@@ -0,0 +1,64 @@
+"""
+Shared, immutable talent and film records for Hollywood Moguls
+
+Every talent card and greenlit film is interned once per game in a CardStore
+and gets an ID. Turn cards, player rosters, bidding wars, films and award
+nominees all hold references to the same record instead of copies, and
+because records are frozen nobody can change a card out from under another
+holder. Facts that change during a game (box office, for instance) live in
+small overlays keyed by ID on the GameState.
+"""
+
+
+class Record(dict):
+    """A read-only dict: JSON-serializable like any dict, but frozen"""
+
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError(f"{self.get('id', 'record')} is immutable")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self):
+        # Rebuild through the constructor rather than item assignment
+        return (type(self), (dict(self),))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class CardStore:
+    """Interns a game's talent cards and films, keyed by ID"""
+
+    def __init__(self):
+        self.records = {}   # {id: Record}
+        self.counters = {}  # {prefix: last number used}
+
+    def _new_id(self, prefix):
+        self.counters[prefix] = self.counters.get(prefix, 0) + 1
+        return f'{prefix}{self.counters[prefix]}'
+
+    def intern(self, data, prefix='c'):
+        """
+        Store `data` as a frozen record with an 'id' (already interned
+        records are returned as they are).
+        """
+        if isinstance(data, Record) and data.get('id') in self.records:
+            return data
+        record = Record(data, id=self._new_id(prefix))
+        self.records[record['id']] = record
+        return record
+
+    def intern_film(self, data):
+        return self.intern(data, prefix='f')
+
+    def get(self, record_id):
+        return self.records.get(record_id)
+
+    def __len__(self):
+        return len(self.records)
@@ -0,0 +1,90 @@
+"""
+Server configuration for Hollywood Moguls, read from the environment
+
+    HOST           Interface to bind (default 0.0.0.0)
+    PORT           Public port (default 8080)
+    SECRET_KEY     Flask secret key (default: random per launch)
+    CORS_ORIGINS   Comma-separated allowed origins, or * (default *)
+    ASYNC_MODE     auto, eventlet, gevent or threading (default auto;
+                   server.py only runs threading when it is set explicitly)
+    WORKERS        Worker processes sharing PORT (default 1)
+    WORKER_PORT_BASE  Worker i also listens on WORKER_PORT_BASE + i, so a
+                   room's players can be sent to the worker hosting it
+                   (default PORT + 1)
+    DEBUG          1 to enable Flask/Socket.IO debug output (default 0)
+    ARCHIVE_PATH   SQLite file finished games are archived to; empty to
+                   disable (default moguls_archive.db)
+    SPILL_DIR      Directory idle rooms are spilled to; empty to drop them
+                   instead (default room_snapshots)
+    MAX_ROOMS      Rooms a worker keeps in memory (default 1000)
+    ROOM_MEMORY_MB Memory budget for a worker's rooms (default 256)
+    TRACE_DIR      Directory for Chrome trace / Perfetto span files; empty
+                   to disable tracing (default empty)
+    TRACE_MAX_MB   Size at which a worker's trace file is rotated (default 50)
+    TRACE_BACKUPS  Rotated trace files kept per worker (default 3)
+    MEMORY_ACCOUNTING  1 to trace allocations and report memory per room
+                   at /admin/memory (default 0; costs CPU and memory)
+    NAME_CORPUS    JSON file of talent names ({role: [names]}) for
+                   quick-started games (default: the built-in names)
+"""
+import os
+import secrets
+
+# Tried in this order when ASYNC_MODE=auto
+ASYNC_MODES = ['eventlet', 'gevent', 'threading']
+
+
+def env_flag(environ, name, default=False):
+    value = environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def load_config(environ=None):
+    """Build the server config dict from environment variables"""
+    environ = os.environ if environ is None else environ
+
+    origins = environ.get('CORS_ORIGINS', '*').strip()
+    if origins != '*':
+        origins = [origin.strip() for origin in origins.split(',') if origin.strip()]
+
+    port = int(environ.get('PORT', 8080))
+    return {
+        'HOST': environ.get('HOST', '0.0.0.0'),
+        'PORT': port,
+        'WORKER_PORT_BASE': int(environ.get('WORKER_PORT_BASE', port + 1)),
+        'SECRET_KEY': environ.get('SECRET_KEY') or secrets.token_hex(32),
+        'CORS_ORIGINS': origins,
+        'ASYNC_MODE': environ.get('ASYNC_MODE', 'auto').strip().lower(),
+        'WORKERS': max(1, int(environ.get('WORKERS', 1))),
+        'DEBUG': env_flag(environ, 'DEBUG'),
+        'ARCHIVE_PATH': environ.get('ARCHIVE_PATH', 'moguls_archive.db'),
+        'SPILL_DIR': environ.get('SPILL_DIR', 'room_snapshots'),
+        'MAX_ROOMS': max(1, int(environ.get('MAX_ROOMS', 1000))),
+        'ROOM_MEMORY_MB': max(1, int(environ.get('ROOM_MEMORY_MB', 256))),
+        'TRACE_DIR': environ.get('TRACE_DIR', ''),
+        'TRACE_MAX_MB': max(1, int(environ.get('TRACE_MAX_MB', 50))),
+        'TRACE_BACKUPS': max(0, int(environ.get('TRACE_BACKUPS', 3))),
+        'MEMORY_ACCOUNTING': env_flag(environ, 'MEMORY_ACCOUNTING'),
+        'NAME_CORPUS': environ.get('NAME_CORPUS', '')
+    }
+
+
+def select_async_mode(requested='auto'):
+    """
+    Pick the Socket.IO async mode: the requested one, or for 'auto' the
+    first of eventlet/gevent that is installed, falling back to threading.
+    """
+    if requested != 'auto':
+        if requested not in ASYNC_MODES:
+            raise ValueError(f'Unknown ASYNC_MODE: {requested}')
+        return requested
+
+    for mode in ASYNC_MODES[:-1]:
+        try:
+            __import__(mode)
+        except ImportError:
+            continue
+        return mode
+    return 'threading'
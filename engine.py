@@ -0,0 +1,1384 @@
+"""
+Game engine for Hollywood Moguls
+
+All game state transitions, independent of Socket.IO. Socket handlers (and
+headless simulations) call one command per player action; commands mutate the
+GameState and return True if anything changed, or raise GameError when the
+rules don't allow the action.
+"""
+import random
+import threading
+import time
+
+import game_logic
+import package_optimizer
+from tracing import traced, tracer
+from voting import VoteTally
+
+
+class GameError(Exception):
+    """A player action the rules don't allow"""
+
+    def __init__(self, event, message):
+        super().__init__(message)
+        self.event = event        # Error event to send back, e.g. 'bid_error'
+        self.message = message
+
+
+def empty_bidding_war():
+    return {
+        'active': False,
+        'wars': [],
+        'conflicts_queue': []
+    }
+
+
+def player_war(bidding_war, player_id):
+    """The running bidding war `player_id` is fighting in, or None"""
+    for war in bidding_war['wars']:
+        if player_id in war['participants']:
+            return war
+    return None
+
+
+def minimum_raise(war):
+    """Smallest bid that would lead a live auction"""
+    if not war['bids']:
+        return 0
+    return next(iter(war['bids'].values())) + game_logic.MIN_RAISE
+
+
+class GameEngine:
+    """Runs the rules of one game against its GameState"""
+
+    def __init__(self, game_state, scheduler=None, on_change=None, on_game_complete=None, name=None):
+        """
+        Args:
+            game_state: The GameState to drive
+            scheduler: Scheduler for deadlines and auto-bids (None = no timers,
+                e.g. in simulations where every bot always acts)
+            on_change: Called after a timer changed the state on its own
+            on_game_complete: Called once the game reaches game_complete
+                (e.g. to archive it)
+            name: Room ID, labelling this game's trace spans
+        """
+        self.game_state = game_state
+        self.name = name
+        self.scheduler = scheduler
+        self.on_change = on_change
+        self.on_game_complete = on_game_complete
+        self.lock = threading.RLock()
+        self.gate_timers = {}  # {gate: ScheduledCall} for the running deadline of each gate (and 'auction')
+        self.frozen = False    # Set while the game is being moved to another worker
+
+    def _changed(self):
+        if self.on_change:
+            self.on_change()
+
+    def _call_later(self, delay, fn, *args):
+        if self.scheduler is None:
+            return None
+        return self.scheduler.call_later(delay, self._locked, fn, *args)
+
+    def _locked(self, fn, *args):
+        with self.lock:
+            if not self.frozen:
+                fn(*args)
+
+    def trace_args(self, player_id=None):
+        """Attributes for this game's trace spans"""
+        game_state = self.game_state
+        args = {'room': self.name, 'phase': game_state.phase, 'turn': game_state.turn}
+        if player_id in game_state.players:
+            args['player'] = game_state.players[player_id]['name']
+        return args
+
+    def selection_key(self, player_id):
+        return f'select:{self.game_state.phase}:{self.game_state.turn}:{player_id}'
+
+    def war_key(self, war):
+        return f'war:{self.game_state.phase.split("_")[0]}:{self.game_state.turn}:{war["card_index"]}'
+
+    # ============================================================================
+    # MIGRATION
+    # ============================================================================
+
+    def freeze(self):
+        """Stop the game so its state can be moved: pending timers become no-ops"""
+        self.frozen = True
+        for timer in self.gate_timers.values():
+            if timer:
+                timer.cancel()
+        self.gate_timers.clear()
+
+    def thaw(self):
+        """Restart a frozen game, re-arming the timers it was waiting on"""
+        self.frozen = False
+        self.resume_timers()
+
+    def resume_timers(self):
+        """
+        Re-arm timers from the state alone (after a freeze, or on the worker a
+        game was moved to): gate deadlines keep their original wall-clock
+        time, and disconnected players get a fresh grace period.
+        """
+        game_state = self.game_state
+        now = time.time()
+        for gate, barrier in game_state.barriers.items():
+            if barrier.deadline is not None and gate not in self.gate_timers:
+                self.gate_timers[gate] = self._call_later(
+                    max(0, barrier.deadline - now), self.ready_gate_deadline, gate, barrier.generation
+                )
+        if self.auction_running() and 'auction' not in self.gate_timers:
+            closes_at = max(war['closes_at'] for war in game_state.bidding_war['wars'])
+            self.gate_timers['auction'] = self._call_later(max(0, closes_at - now), self.auction_deadline)
+        if game_state.match and game_state.phase == 'lobby' and 'match' not in self.gate_timers:
+            self.gate_timers['match'] = self._call_later(
+                max(0, game_state.match['start_by'] - now), self.match_deadline
+            )
+        if game_state.match and game_state.phase == 'phase0_naming' and 'naming' not in self.gate_timers:
+            self.gate_timers['naming'] = self._call_later(
+                max(0, game_state.match['name_by'] - now), self.naming_deadline
+            )
+
+        gate = game_logic.PHASE_GATES.get(game_state.phase)
+        for player_id, player in game_state.players.items():
+            if game_state.is_connected(player_id):
+                continue
+            if gate and not game_state.barriers[gate].is_ready(player_id):
+                self.schedule_disconnect_advance(gate, player_id)
+            war = player_war(game_state.bidding_war, player_id) if game_state.bidding_war.get('active') else None
+            if war is not None and player_id not in war['bids']:
+                self.schedule_auto_bid(player_id, player['name'])
+
+    # ============================================================================
+    # PLAYERS & SESSIONS
+    # ============================================================================
+
+    def join(self, sid, name):
+        """
+        Seat a new player.
+
+        Returns:
+            (player_id, resume_token)
+        """
+        game_state = self.game_state
+        name = name.strip()
+
+        if not name:
+            raise GameError('join_error', 'Studio name is required!')
+
+        # Names are display-only; seats are reclaimed with the resume token
+        if name in game_state.player_names:
+            raise GameError('join_error', f'{name} is already taken!')
+
+        match = game_state.match
+        if match and (game_state.phase != 'lobby' or len(game_state.players) >= match['seats']):
+            raise GameError('join_error', 'This table is full!')
+
+        player_id, token = game_state.add_player(sid, name)
+        print(f'{name} joined the game')
+        if match and len(game_state.players) == match['seats']:
+            self.start_match()
+        return player_id, token
+
+    # ============================================================================
+    # MATCHMADE TABLES
+    # ============================================================================
+
+    def setup_match(self, seats, bidding_mode):
+        """
+        Make this a matchmade table: nobody hosts it, so the game starts once
+        `seats` players have joined (or MATCH_JOIN_WINDOW runs out) and
+        production starts as soon as the talent is named.
+        """
+        game_state = self.game_state
+        game_state.bidding_mode = bidding_mode
+        game_state.match = {'seats': seats, 'start_by': time.time() + game_logic.MATCH_JOIN_WINDOW,
+                            'name_by': None, 'extensions': 0, 'closed': False}
+        self.gate_timers['match'] = self._call_later(game_logic.MATCH_JOIN_WINDOW, self.match_deadline)
+        print(f"🤝 Matchmade table for {seats} ({bidding_mode} bidding)")
+
+    def start_match(self):
+        timer = self.gate_timers.pop('match', None)
+        if timer:
+            timer.cancel()
+        self.open_naming()
+        self.game_state.match['name_by'] = time.time() + game_logic.MATCH_NAMING_WINDOW
+        self.gate_timers['naming'] = self._call_later(game_logic.MATCH_NAMING_WINDOW, self.naming_deadline)
+
+    def match_deadline(self):
+        """Not everyone matched showed up: start with those who did"""
+        game_state = self.game_state
+        match = game_state.match
+        self.gate_timers.pop('match', None)
+        if game_state.phase != 'lobby':
+            return
+        if len(game_state.players) < game_logic.MIN_MATCH_PLAYERS:
+            if match['extensions'] >= game_logic.MATCH_EXTENSIONS:
+                # Nobody else is coming: close the table (the room expires like a finished one)
+                print(f"🚪 Matchmade table closed: only {len(game_state.players)} of {match['seats']} showed up")
+                match['closed'] = True
+                game_state.phase = 'game_complete'
+            else:
+                # Too few to play: hold the table open a while longer
+                match['extensions'] += 1
+                match['start_by'] = time.time() + game_logic.MATCH_JOIN_WINDOW
+                self.gate_timers['match'] = self._call_later(game_logic.MATCH_JOIN_WINDOW, self.match_deadline)
+        else:
+            print(f"\n⏰ Matchmade table starting with {len(game_state.players)} of {game_state.match['seats']}")
+            game_state.match['seats'] = len(game_state.players)
+            self.start_match()
+        self._changed()
+
+    def naming_deadline(self):
+        """Matchmade players out of time to name talent: name the rest for them"""
+        self.gate_timers.pop('naming', None)
+        if self.game_state.phase != 'phase0_naming':
+            return
+        print("\n⏰ Naming time is up, naming the remaining talent")
+        self.name_remaining()
+        self._changed()
+
+    def resume(self, sid, token):
+        """
+        Reattach a reconnecting socket to its seat.
+
+        Returns:
+            The player ID, or None if the token is unknown
+        """
+        game_state = self.game_state
+        player_id = game_state.sessions.get(token)
+
+        if player_id is None:
+            return None
+
+        player_data = game_state.players[player_id]
+        game_state.bind_sid(player_id, sid)
+        print(f'🔄 {player_data["name"]} resumed session (socket: {sid[:8]})')
+
+        # Clear disconnect timer if they reconnected during bidding
+        if player_id in game_state.bidding_war.get('disconnect_times', {}):
+            del game_state.bidding_war['disconnect_times'][player_id]
+            print(f'  ⏱️ Cancelled auto-bid timeout for {player_data["name"]}')
+
+        print(f'  ✅ Restored: ${player_data["money"]}M, {player_data["score"]} pts, {len(player_data.get("roles", []))} roles, {len(player_data.get("films", []))} films')
+        return player_id
+
+    def disconnect(self, sid):
+        """Detach a socket; the player's seat and data are kept for reconnection"""
+        game_state = self.game_state
+        player_id = game_state.unbind_sid(sid)
+        if player_id is None:
+            return False
+
+        player_name = game_state.players[player_id]['name']
+        print(f'📱 {player_name} disconnected (socket: {sid[:8]})')
+        print(f'  💾 Player data preserved for reconnection')
+        changed = False
+
+        # Track disconnect during active bidding war
+        if game_state.bidding_war.get('active'):
+            war = player_war(game_state.bidding_war, player_id)
+            if war is not None:
+                if player_id not in war['bids']:
+                    # They disconnected without submitting a bid
+                    print(f'  ⚠️ {player_name} disconnected during bidding war without submitting bid')
+
+                    # Add to bidding_war state to track disconnect time
+                    if 'disconnect_times' not in game_state.bidding_war:
+                        game_state.bidding_war['disconnect_times'] = {}
+
+                    game_state.bidding_war['disconnect_times'][player_id] = time.time()
+
+                    # Schedule auto-bid after timeout
+                    self.schedule_auto_bid(player_id, player_name)
+                    changed = True
+
+        # Don't let a sleeping phone hold up a ready gate forever
+        gate = game_logic.PHASE_GATES.get(game_state.phase)
+        if gate and not game_state.barriers[gate].is_ready(player_id):
+            self.schedule_disconnect_advance(gate, player_id)
+
+        return changed
+
+    # ============================================================================
+    # READY GATES
+    # ============================================================================
+
+    def open_ready_gate(self, gate):
+        """
+        Start waiting for everyone to be ready in `gate`.
+        Stragglers are auto-advanced at the gate's deadline, and players who are
+        already disconnected get the (shorter) disconnect grace period.
+        """
+        game_state = self.game_state
+        barrier = game_state.barriers[gate]
+        barrier.reset()
+
+        timeout = game_logic.READY_TIMEOUTS.get(gate)
+        if timeout and self.scheduler is not None:
+            barrier.deadline = time.time() + timeout
+            self.gate_timers[gate] = self._call_later(
+                timeout, self.ready_gate_deadline, gate, barrier.generation
+            )
+
+        for player_id in game_state.players:
+            if not game_state.is_connected(player_id):
+                self.schedule_disconnect_advance(gate, player_id)
+
+    def mark_ready(self, gate, player_id):
+        """
+        Record a player as ready for `gate`, running the gate's transition
+        once everyone is.
+        """
+        game_state = self.game_state
+        if game_logic.PHASE_GATES.get(game_state.phase) != gate:
+            return False
+
+        barrier = game_state.barriers[gate]
+        total = len(game_state.players)
+
+        if not barrier.arrive(player_id, total):
+            player_name = game_state.players[player_id]['name']
+            print(f"  {player_name} ready ({barrier.count}/{total})")
+            return True
+
+        timer = self.gate_timers.pop(gate, None)
+        if timer:
+            timer.cancel()
+
+        self.gate_transitions[gate](self)
+        return True
+
+    def advance_player(self, gate, player_id):
+        """Move a player through a gate on their behalf"""
+        if gate.endswith('_packaging'):
+            self.release_unused_roles(self.game_state.players[player_id])
+        return self.mark_ready(gate, player_id)
+
+    def ready_gate_deadline(self, gate, generation):
+        """Deadline reached: advance everyone who still hasn't continued"""
+        game_state = self.game_state
+        barrier = game_state.barriers[gate]
+        if barrier.generation != generation:
+            return  # Gate already passed
+
+        self.gate_timers.pop(gate, None)
+        stragglers = [pid for pid in game_state.players if not barrier.is_ready(pid)]
+        names = [game_state.players[pid]['name'] for pid in stragglers]
+        print(f"\n⏰ TIMEOUT ({gate}): auto-advancing {', '.join(names)}")
+
+        for player_id in stragglers:
+            self.advance_player(gate, player_id)
+        self._changed()
+
+    def schedule_disconnect_advance(self, gate, player_id):
+        """Auto-advance a disconnected player if they don't come back in time"""
+        generation = self.game_state.barriers[gate].generation
+        self._call_later(
+            game_logic.DISCONNECT_GRACE, self.disconnect_grace_expired, gate, generation, player_id
+        )
+
+    def disconnect_grace_expired(self, gate, generation, player_id):
+        game_state = self.game_state
+        barrier = game_state.barriers[gate]
+        if barrier.generation != generation or barrier.is_ready(player_id):
+            return
+        if game_state.is_connected(player_id):
+            return
+
+        print(f"\n⏰ {game_state.players[player_id]['name']} still disconnected, auto-advancing ({gate})")
+        self.advance_player(gate, player_id)
+        self._changed()
+
+    # ============================================================================
+    # PHASE 0: TALENT NAMING
+    # ============================================================================
+
+    def start_phase0(self, bidding_mode=None):
+        """Host command: start the game from the lobby"""
+        game_state = self.game_state
+        if game_state.match or game_state.phase != 'lobby':
+            return False
+        return self.open_naming(bidding_mode)
+
+    def open_naming(self, bidding_mode=None):
+        game_state = self.game_state
+        if bidding_mode is not None:
+            if bidding_mode not in game_logic.BIDDING_MODES:
+                raise GameError('join_error', f'Unknown bidding mode: {bidding_mode}')
+            game_state.bidding_mode = bidding_mode
+        print(f"Starting Phase 0: Talent Naming ({game_state.bidding_mode} bidding)")
+        game_state.phase = 'phase0_naming'
+        game_state.naming_progress = {
+            'submissions': {
+                player_id: {'screenwriter': [], 'director': [], 'star': [], 'complete': False}
+                for player_id in game_state.players.keys()
+            }
+        }
+        return True
+
+    def submit_talent_name(self, player_id, name):
+        return self.submit_talent_names(player_id, [name])
+
+    def submit_talent_names(self, player_id, names):
+        """
+        Name several talent at once: all 11, or any part of what's left.
+        Names fill the screenwriter, then director, then star slots. The
+        batch is validated as a whole (nothing is added unless every name
+        fits), and names are deduped against the pool as they arrive.
+        """
+        game_state = self.game_state
+        prog = game_state.naming_progress
+
+        if player_id not in prog['submissions']:
+            return False
+
+        player_prog = prog['submissions'][player_id]
+
+        if player_prog['complete']:
+            return False
+
+        # The role each remaining slot is for, in the order they're filled
+        open_roles = [
+            role_type
+            for role_type, quota in game_logic.NAMING_QUOTAS.items()
+            for _ in range(quota - len(player_prog[role_type]))
+        ]
+        if not isinstance(names, list) or not names:
+            raise GameError('naming_error', 'No talent names submitted!')
+        if len(names) > len(open_roles):
+            raise GameError('naming_error', f'Only {len(open_roles)} more name(s) needed!')
+        names = [name.strip() if isinstance(name, str) else '' for name in names]
+        if not all(names):
+            raise GameError('naming_error', 'Talent names cannot be blank!')
+
+        # Generate stats
+        talent = []
+        for role_type, name in zip(open_roles, names):
+            player_prog[role_type].append(name)
+            unique_name = game_logic.dedupe_name(name, game_state.talent_name_counts)
+            talent.append(game_logic.generate_talent_stats(role_type, unique_name))
+        game_state.talent_pool.extend(talent)
+        game_state.touch('talent_pool')
+
+        print(f"{game_state.players[player_id]['name']} submitted " +
+              ', '.join(f"{t['role']}: {t['name']}" for t in talent))
+
+        # Check if this player is done
+        if len(names) == len(open_roles):
+            player_prog['complete'] = True
+            print(f"{game_state.players[player_id]['name']} completed Phase 0!")
+
+            # Check if ALL players are done
+            if all(p['complete'] for p in prog['submissions'].values()):
+                self.finish_naming()
+
+        return True
+
+    @traced('quick start')
+    def quick_start(self, bidding_mode=None, corpus=None):
+        """
+        Host command: start the game with every talent slot still open
+        named from `corpus` ({role: [names]}, default DEFAULT_NAMES) and the
+        talent generated in bulk, so the lobby goes straight to
+        phase0_complete.
+        """
+        game_state = self.game_state
+        if game_state.match:
+            return False
+        if game_state.phase == 'lobby':
+            self.open_naming(bidding_mode)
+        elif game_state.phase != 'phase0_naming':
+            return False
+        self.name_remaining(corpus)
+        return True
+
+    def name_remaining(self, corpus=None):
+        """Name every open talent slot from `corpus` and end phase 0"""
+        game_state = self.game_state
+        corpus = corpus or game_logic.DEFAULT_NAMES
+        waiting = [p for p in game_state.naming_progress['submissions'].values() if not p['complete']]
+
+        for role_type, quota in game_logic.NAMING_QUOTAS.items():
+            # Shuffled corpus, cycled as often as the lobby needs (repeats get suffixes)
+            names = random.sample(corpus[role_type], len(corpus[role_type]))
+            unique_names = []
+            for player_prog in waiting:
+                for _ in range(quota - len(player_prog[role_type])):
+                    name = names[len(unique_names) % len(names)]
+                    player_prog[role_type].append(name)
+                    unique_names.append(game_logic.dedupe_name(name, game_state.talent_name_counts))
+            game_state.talent_pool.extend(game_logic.generate_talent_batch(role_type, unique_names))
+
+        for player_prog in waiting:
+            player_prog['complete'] = True
+        print(f"⚡ Quick start: named {len(game_state.talent_pool)} talent for "
+              f"{len(game_state.players)} players")
+        self.finish_naming()
+
+    def finish_naming(self):
+        """Every player has named their talent: intern the pool and end phase 0"""
+        game_state = self.game_state
+        game_state.talent_pool = [game_state.cards.intern(t) for t in game_state.talent_pool]
+        game_state.touch('talent_pool')
+        game_state.phase = 'phase0_complete'
+        print("Phase 0 complete! All talent generated.")
+        if game_state.match:
+            timer = self.gate_timers.pop('naming', None)
+            if timer:
+                timer.cancel()
+            self.open_production()
+
+    # ============================================================================
+    # PRODUCTION
+    # ============================================================================
+
+    def start_phase1(self):
+        """Host command: start production once the talent is named"""
+        game_state = self.game_state
+        if game_state.match or game_state.phase != 'phase0_complete':
+            return False
+        return self.open_production()
+
+    def open_production(self):
+        game_state = self.game_state
+        print("Starting Phase 1: Winter Production")
+        game_state.selected_roles_this_phase = set()
+        game_state.phase = 'phase1_production'
+        game_state.year = 1
+        game_state.turn = 1
+        self.start_new_turn()
+        return True
+
+    @traced('deal')
+    def start_new_turn(self):
+        """Generate cards for the current turn"""
+        game_state = self.game_state
+        game_state.player_selections = {}
+
+        # Reset bidding war state
+        game_state.bidding_war = empty_bidding_war()
+
+        cards = game_logic.generate_turn_cards(game_state)
+        game_state.current_turn_cards = cards
+
+        print(f"\n=== Turn {game_state.turn} ===")
+        print(f"Generated {len(cards)} cards:")
+        for i, card in enumerate(cards):
+            print(f"  Card {i}: {card['name']} ({card['role']})")
+
+        if tracer.enabled:
+            for player_id in game_state.players:
+                tracer.begin('selection', self.selection_key(player_id), **self.trace_args(player_id))
+
+    def select_card(self, player_id, selection):
+        game_state = self.game_state
+
+        # Prevent re-selection during same turn
+        if player_id in game_state.player_selections:
+            raise GameError('selection_error', 'You have already made your selection for this turn!')
+
+        player = game_state.players[player_id]
+        player_name = player['name']
+
+        # Check affordability
+        if selection != 'pass':
+            if selection >= len(game_state.current_turn_cards):
+                raise GameError('selection_error', 'Invalid card selection!')
+
+            card = game_state.current_turn_cards[selection]
+            print(f"{player_name} selecting card {selection}: {card['name']} (${card['salary']}M)")
+
+            if player['money'] < card['salary']:
+                print(f"  -> BLOCKED: Cannot afford!")
+                raise GameError('selection_error', f"Can't afford {card['name']}!")
+
+        game_state.player_selections[player_id] = selection
+        tracer.end('selection', self.selection_key(player_id), room=self.name, selection=selection)
+
+        if selection == 'pass':
+            print(f"{player_name} passed")
+        else:
+            print(f"{player_name} selected {card['name']}")
+
+        # Check if all players have selected
+        if len(game_state.player_selections) == len(game_state.players):
+            self.resolve_selections()
+        return True
+
+    @traced('resolve selections')
+    def resolve_selections(self):
+        """Check for bidding wars and award cards"""
+        game_state = self.game_state
+        selections = game_state.player_selections
+
+        print(f"\n=== Resolving Turn {game_state.turn} ===")
+        for player_id, sel in selections.items():
+            player_name = game_state.players[player_id]['name']
+            if sel == 'pass':
+                print(f"  {player_name}: PASS")
+            else:
+                card = game_state.current_turn_cards[sel]
+                print(f"  {player_name}: {card['name']}")
+
+        # Group players by selection
+        selection_groups = {}
+        for player_id, selection in selections.items():
+            if selection != 'pass':
+                if selection not in selection_groups:
+                    selection_groups[selection] = []
+                selection_groups[selection].append(player_id)
+
+        # Separate contested cards from uncontested ones
+        contested_cards = {}    # {card_index: [player_ids]}
+        uncontested_cards = {}  # {card_index: [player_id]}
+
+        for card_index, player_list in selection_groups.items():
+            if len(player_list) > 1:
+                contested_cards[card_index] = player_list
+            else:
+                uncontested_cards[card_index] = player_list
+
+        # Check if we have any bidding wars
+        if contested_cards:
+            # Build the conflicts queue
+            game_state.bidding_war['conflicts_queue'] = [
+                (card_idx, players) for card_idx, players in contested_cards.items()
+            ]
+
+            print(f"\n💥 {len(contested_cards)} BIDDING WAR(S) DETECTED!")
+            for card_idx, players in contested_cards.items():
+                card = game_state.current_turn_cards[card_idx]
+                player_names = [game_state.players[player_id]['name'] for player_id in players]
+                print(f"  Card {card_idx} ({card['name']}): {', '.join(player_names)}")
+
+            # Start the first bidding war(s)
+            self.start_next_bidding_war(uncontested_cards)
+        else:
+            # No conflicts - award all cards directly
+            print("\nNo conflicts, awarding cards...")
+            for card_index, player_list in uncontested_cards.items():
+                self.award_card_to_player(player_list[0], card_index)
+
+            self.advance_turn()
+
+    @traced('award card', player=True)
+    def award_card_to_player(self, player_id, card_index, extra_bid=0):
+        """Give a card to a player and deduct cost"""
+        game_state = self.game_state
+        card = game_state.current_turn_cards[card_index]
+        player = game_state.players[player_id]
+
+        total_cost = card['salary'] + extra_bid
+
+        print(f"  → Awarding {card['name']} to {player['name']} for ${total_cost}M")
+        print(f"     Money: ${player['money']}M → ${player['money'] - total_cost}M")
+
+        player['money'] -= total_cost
+        player['roles'].append(card)
+
+        game_state.selected_roles_this_phase.add(card['name'])
+
+    def advance_turn(self):
+        """Move to next turn or phase"""
+        game_state = self.game_state
+        game_state.turn += 1
+
+        # Determine which phase we're in
+        current_phase = game_state.phase
+
+        if game_state.turn <= 5:
+            # Continue current production phase
+            if current_phase == 'phase1_production':
+                game_state.phase = 'phase1_production'
+                print(f"\n=== Starting Turn {game_state.turn} ===\n")
+            elif current_phase == 'phase2_production':
+                game_state.phase = 'phase2_production'
+                print(f"\n=== Starting Turn {game_state.turn} ===\n")
+            self.start_new_turn()
+        else:
+            # Move to packaging phase and provide no-name talent
+            if current_phase == 'phase1_production':
+                game_state.phase = 'phase1_packaging'
+                print("\n=== Winter production complete! Packaging phase ===\n")
+            elif current_phase == 'phase2_production':
+                game_state.phase = 'phase2_packaging'
+                print("\n=== Summer production complete! Packaging phase ===\n")
+
+            # Give each player access to no-name talent
+            no_name_talent = game_logic.generate_no_name_talent()
+            game_state.no_name_talent = {
+                role_type: game_state.cards.intern(talent)
+                for role_type, talent in no_name_talent.items()
+            }
+
+            for player_id, player in game_state.players.items():
+                role_count = len(player.get('roles', []))
+                print(f"  {player['name']} has {role_count} roles + no-name talent available")
+
+            self.open_ready_gate(game_logic.PHASE_GATES[game_state.phase])
+
+    # ============================================================================
+    # BIDDING WAR SYSTEM
+    # ============================================================================
+
+    def start_next_bidding_war(self, uncontested_cards):
+        """
+        Start the next bidding war(s) from the conflicts queue.
+        In concurrent mode every queued war whose participants don't overlap
+        an already started one runs at the same time; in sequential mode
+        only the first. If the queue is empty, award uncontested cards and
+        advance turn.
+
+        Args:
+            uncontested_cards: Dict of {card_index: [player_id]} for cards with single bidders
+        """
+        game_state = self.game_state
+        bidding_war = game_state.bidding_war
+        if not bidding_war['conflicts_queue']:
+            # No more conflicts - award uncontested cards and move on
+            print("\n✓ All bidding wars resolved!")
+            for card_index, player_list in uncontested_cards.items():
+                self.award_card_to_player(player_list[0], card_index)
+            self.advance_turn()
+            return
+
+        # Take every conflict that can run alongside the ones already taken
+        wars = []
+        busy = set()
+        waiting = []
+        for card_index, participants in bidding_war['conflicts_queue']:
+            can_start = not busy.intersection(participants)
+            if game_state.bidding_mode == 'sequential' and wars:
+                can_start = False
+            if not can_start:
+                waiting.append((card_index, participants))
+                continue
+            busy.update(participants)
+            war = {
+                'card_index': card_index,
+                'card_data': game_state.current_turn_cards[card_index],
+                'participants': participants,
+                'bids': {},           # In auctions, only the current high bid
+                'winner': None,       # Set when resolved (None = tie)
+                'winning_bid': None
+            }
+            if game_state.bidding_mode == 'auction':
+                war['closes_at'] = time.time() + game_logic.AUCTION_WINDOW
+            wars.append(war)
+
+        bidding_war['conflicts_queue'] = waiting
+        bidding_war['wars'] = wars
+        bidding_war['active'] = True
+
+        # Determine which phase we're in for UI
+        if game_state.phase == 'phase1_production':
+            game_state.phase = 'phase1_bidding'
+        elif game_state.phase == 'phase2_production':
+            game_state.phase = 'phase2_bidding'
+
+        for war in wars:
+            player_names = [game_state.players[player_id]['name'] for player_id in war['participants']]
+            print(f"\n🎬 STARTING BIDDING WAR for {war['card_data']['name']}")
+            print(f"   Participants: {', '.join(player_names)}")
+            if tracer.enabled:
+                tracer.begin('bidding war', self.war_key(war), card=war['card_data']['name'],
+                             participants=player_names, **self.trace_args())
+
+        # Store uncontested_cards for later use
+        bidding_war['uncontested_cards'] = uncontested_cards
+
+        if game_state.bidding_mode == 'auction':
+            print(f"   🔨 Live auction: {game_logic.AUCTION_WINDOW}s to raise")
+            self.gate_timers['auction'] = self._call_later(game_logic.AUCTION_WINDOW, self.auction_deadline)
+
+        # Participants who already dropped off get the usual auto-bid timeout
+        for player_id in busy:
+            if not game_state.is_connected(player_id):
+                self.schedule_auto_bid(player_id, game_state.players[player_id]['name'])
+
+    def submit_bid(self, player_id, bid_amount):
+        """
+        Handle a player's bid submission during a bidding war.
+        Validates affordability and automatically resolves when all bids are in.
+        """
+        game_state = self.game_state
+
+        # Validation checks
+        if not game_state.bidding_war.get('active'):
+            raise GameError('bid_error', 'No active bidding war!')
+
+        war = player_war(game_state.bidding_war, player_id)
+        if war is None:
+            raise GameError('bid_error', 'You are not a participant in this bidding war!')
+
+        if game_state.bidding_mode == 'auction':
+            raise GameError('bid_error', 'This is a live auction: raise the high bid instead!')
+
+        if player_id in war['bids']:
+            raise GameError('bid_error', 'You have already submitted your bid!')
+
+        # Validate bid amount
+        if bid_amount < 0:
+            raise GameError('bid_error', 'Bid cannot be negative!')
+
+        # Check affordability: player must be able to pay base salary + bid
+        player = game_state.players[player_id]
+        base_salary = war['card_data']['salary']
+        total_cost = base_salary + bid_amount
+
+        if player['money'] < total_cost:
+            raise GameError('bid_error', f'Cannot afford! Total cost: ${total_cost}M, Your budget: ${player["money"]}M')
+
+        # Bid is valid - record it
+        war['bids'][player_id] = bid_amount
+        player_name = player['name']
+
+        print(f"  💰 {player_name} bid ${bid_amount}M (Total: ${total_cost}M)")
+        self.check_bids_complete()
+        return True
+
+    def check_bids_complete(self):
+        """Resolve the running bidding wars once every participant has bid"""
+        wars = self.game_state.bidding_war['wars']
+        num_bids = sum(len(war['bids']) for war in wars)
+        num_participants = sum(len(war['participants']) for war in wars)
+
+        if num_bids == num_participants:
+            print(f"\n✓ All {num_participants} participants have submitted bids!")
+            self.resolve_bidding_war()
+        else:
+            print(f"  Waiting for {num_participants - num_bids} more bid(s)...")
+
+    def schedule_auto_bid(self, player_id, player_name):
+        """
+        Schedule an automatic $0 bid for a disconnected participant.
+        If they reconnect before the timeout, this will be cancelled.
+        """
+        if self.game_state.bidding_mode == 'auction':
+            return  # Auctions close on their own; not bidding is a valid move
+        self._call_later(game_logic.DISCONNECT_GRACE, self.auto_submit_bid, player_id, player_name)
+
+    def auto_submit_bid(self, player_id, player_name):
+        game_state = self.game_state
+
+        # Check if still needed (player might have reconnected and bid)
+        if not game_state.bidding_war.get('active'):
+            print(f'  ⏭️ Auto-bid cancelled: bidding war already resolved')
+            return
+
+        if game_state.is_connected(player_id):
+            print(f'  ⏭️ Auto-bid cancelled: {player_name} reconnected')
+            return
+
+        war = player_war(game_state.bidding_war, player_id)
+        if war is None:
+            print(f'  ⏭️ Auto-bid cancelled: {player_name} is not in a bidding war')
+            return
+
+        if player_id in war['bids']:
+            print(f'  ⏭️ Auto-bid cancelled: {player_name} already submitted bid')
+            return
+
+        # Still disconnected after timeout - auto-submit $0 bid
+        print(f'\n⏰ TIMEOUT: Auto-submitting $0 bid for disconnected player {player_name}')
+        war['bids'][player_id] = 0
+        self.check_bids_complete()
+        self._changed()
+
+    def raise_bid(self, player_id, bid_amount):
+        """
+        Raise the high bid in a live auction. Only the leading bid is kept, so
+        checking and recording a raise is O(1) however busy the auction; each
+        one keeps the war open at least AUCTION_EXTENSION more seconds.
+
+        Returns:
+            True once the raise leads. The table isn't re-sent for every
+            raise: callers stream auction_snapshot() at a capped rate.
+        """
+        game_state = self.game_state
+
+        if game_state.bidding_mode != 'auction' or not game_state.bidding_war.get('active'):
+            raise GameError('bid_error', 'No live auction running!')
+
+        war = player_war(game_state.bidding_war, player_id)
+        if war is None:
+            raise GameError('bid_error', 'You are not a participant in this bidding war!')
+
+        now = time.time()
+        if now >= war['closes_at']:
+            raise GameError('bid_error', 'Bidding has closed!')
+
+        if player_id in war['bids']:
+            raise GameError('bid_error', 'You already have the high bid!')
+
+        if not isinstance(bid_amount, int) or isinstance(bid_amount, bool):
+            raise GameError('bid_error', 'Bid must be a whole number!')
+
+        minimum = minimum_raise(war)
+        if bid_amount < minimum:
+            raise GameError('bid_error', f'Outbid! The next bid must be at least ${minimum}M')
+
+        player = game_state.players[player_id]
+        total_cost = war['card_data']['salary'] + bid_amount
+        if player['money'] < total_cost:
+            raise GameError('bid_error', f'Cannot afford! Total cost: ${total_cost}M, Your budget: ${player["money"]}M')
+
+        war['bids'] = {player_id: bid_amount}
+        war['closes_at'] = max(war['closes_at'], now + game_logic.AUCTION_EXTENSION)
+        print(f"  🔨 {player['name']} leads {war['card_data']['name']} at ${bid_amount}M")
+        return True
+
+    def auction_running(self):
+        game_state = self.game_state
+        return game_state.bidding_mode == 'auction' and bool(game_state.bidding_war.get('active')) \
+            and game_state.phase.endswith('_bidding')
+
+    def auction_deadline(self):
+        """Timer: resolve the live auctions once every war's window has closed"""
+        self.gate_timers.pop('auction', None)
+        if not self.auction_running():
+            return
+        closes_at = max(war['closes_at'] for war in self.game_state.bidding_war['wars'])
+        remaining = closes_at - time.time()
+        if remaining > 0:
+            # Raises pushed the close back since this timer was set
+            self.gate_timers['auction'] = self._call_later(remaining, self.auction_deadline)
+            return
+        print(f"\n🔨 Going, going, gone!")
+        self.resolve_bidding_war()
+        self._changed()
+
+    def close_auctions(self):
+        """
+        Close every live auction now (for headless games, which have no
+        timers to close them)
+        """
+        if not self.auction_running():
+            return False
+        timer = self.gate_timers.pop('auction', None)
+        if timer:
+            timer.cancel()
+        for war in self.game_state.bidding_war['wars']:
+            war['closes_at'] = time.time()
+        self.resolve_bidding_war()
+        return True
+
+    def resolve_bidding_war(self):
+        """
+        Determine the winner of each running bidding war and award the cards.
+        Called after all participants have submitted bids.
+        """
+        game_state = self.game_state
+
+        for war in game_state.bidding_war['wars']:
+            self.resolve_war(war)
+
+        # Move to results phase
+        if game_state.phase == 'phase1_bidding':
+            game_state.phase = 'phase1_bidding_results'
+        elif game_state.phase == 'phase2_bidding':
+            game_state.phase = 'phase2_bidding_results'
+
+        self.open_ready_gate('bidding_results')
+
+    @traced('resolve bidding war')
+    def resolve_war(self, war):
+        """Award one bidding war's card to its highest bidder (ties: nobody)"""
+        game_state = self.game_state
+        bids = war['bids']
+        card_data = war['card_data']
+
+        print(f"\n🎬 RESOLVING BIDDING WAR for {card_data['name']}")
+
+        # Show all bids
+        for player_id in war['participants']:
+            player_name = game_state.players[player_id]['name']
+            bid = bids.get(player_id, 0)
+            print(f"   {player_name}: ${bid}M")
+
+        # Find the highest bid
+        max_bid = max(bids.values(), default=None)
+        winners = [player_id for player_id, bid in bids.items() if bid == max_bid]
+        war['winning_bid'] = max_bid
+
+        if not winners:
+            # An auction nobody bid in
+            print(f"\n🦗 No bids - {card_data['name']} stays unsigned.")
+        elif len(winners) > 1:
+            # TIE - Nobody gets the card!
+            print(f"\n💔 TIE at ${max_bid}M!")
+            print(f"   {card_data['name']} is disgusted by studio politicking!")
+            print(f"   Nobody gets the role, bids refunded.")
+        else:
+            # We have a winner!
+            winner_id = winners[0]
+            winner_name = game_state.players[winner_id]['name']
+            print(f"\n🏆 WINNER: {winner_name} with bid of ${max_bid}M!")
+
+            # Award the card with the extra bid
+            self.award_card_to_player(winner_id, war['card_index'], extra_bid=max_bid)
+            war['winner'] = winner_id
+
+        game_state.bid_log.append({
+            'phase': game_state.phase.split('_')[0],
+            'turn': game_state.turn,
+            'card_id': card_data['id'],
+            'bids': dict(bids),
+            'winner': war['winner']
+        })
+        tracer.end('bidding war', self.war_key(war), room=self.name, winning_bid=war['winning_bid'])
+
+    def continue_after_bidding(self, player_id):
+        """A player is done viewing bidding results"""
+        return self.mark_ready('bidding_results', player_id)
+
+    def continue_after_bidding_results(self):
+        """
+        Called after showing bidding results.
+        Either starts the next bidding war or continues the turn.
+        """
+        game_state = self.game_state
+        uncontested_cards = game_state.bidding_war.get('uncontested_cards', {})
+
+        # Reset active bidding war
+        game_state.bidding_war['active'] = False
+
+        # CRITICAL FIX: Clear player selections BEFORE returning to production phase
+        # This prevents the UI from showing stale "selected" status
+        game_state.player_selections = {}
+
+        # Return to production phase
+        if 'phase1' in game_state.phase:
+            game_state.phase = 'phase1_production'
+        elif 'phase2' in game_state.phase:
+            game_state.phase = 'phase2_production'
+
+        # Check if there are more conflicts
+        self.start_next_bidding_war(uncontested_cards)
+
+    # ============================================================================
+    # PACKAGING & RELEASES
+    # ============================================================================
+
+    def greenlight_film(self, player_id, role_indices, title, teaser=''):
+        game_state = self.game_state
+        player = game_state.players[player_id]
+        title = title.strip()
+        teaser = teaser.strip()
+
+        if not title:
+            raise GameError('package_error', 'Film title is required!')
+
+        # Extract roles (handle both regular and no-name talent)
+        roles = []
+        no_name_talent = game_state.no_name_talent
+
+        for idx in role_indices:
+            if idx < 0:
+                # No-name talent (negative index)
+                no_name_array = list(no_name_talent.values())
+                role_idx = abs(idx) - 1
+                if role_idx < len(no_name_array):
+                    roles.append(no_name_array[role_idx])
+            else:
+                # Regular purchased role
+                if player.get('roles') and idx < len(player['roles']):
+                    roles.append(player['roles'][idx])
+
+        # Validate package
+        if not game_logic.validate_film_package(roles):
+            raise GameError('package_error', 'Invalid package! Need Producer, Screenwriter, Director, and Star')
+
+        # Calculate film stats
+        stats = game_logic.calculate_film_stats(roles)
+
+        film = game_state.cards.intern_film({
+            'title': title,
+            'teaser': teaser if teaser else f"A {stats['genre']} film for {stats['audience']}",
+            'roles': tuple(roles),
+            'studio': player['name'],
+            'player_id': player_id,
+            **stats
+        })
+
+        if 'films' not in player:
+            player['films'] = []
+        player['films'].append(film)
+        game_state.touch('films')
+
+        # Remove ONLY purchased roles (not no-name talent)
+        purchased_indices = [idx for idx in role_indices if idx >= 0]
+        for idx in sorted(purchased_indices, reverse=True):
+            if idx < len(player['roles']):
+                player['roles'].pop(idx)
+
+        print(f"{player['name']} greenlit '{title}' (Heat: {stats['heat']}, Prestige: {stats['prestige']})")
+        return True
+
+    def suggest_packages(self, player_id, objective='heat', top_k=3):
+        """
+        Best ways to package the player's current roles (see package_optimizer).
+        Read-only: returns the suggestions instead of changing the state.
+        """
+        game_state = self.game_state
+        if game_logic.PHASE_GATES.get(game_state.phase) not in ('spring_packaging', 'holiday_packaging'):
+            raise GameError('package_error', 'Suggestions are only available while packaging!')
+
+        if objective not in ('heat', 'prestige'):
+            raise GameError('package_error', f'Unknown objective: {objective}')
+
+        roles = game_state.players[player_id].get('roles', [])
+        return package_optimizer.suggest_packages(
+            roles, game_state.no_name_talent, objective=objective, top_k=max(1, min(top_k, 10))
+        )
+
+    def finish_packaging(self, player_id):
+        gate = game_logic.PHASE_GATES.get(self.game_state.phase)
+        if gate not in ('spring_packaging', 'holiday_packaging'):
+            return True
+
+        return self.advance_player(gate, player_id)
+
+    def release_unused_roles(self, player):
+        """Refund half the salary of any roles a player didn't package"""
+        if player.get('roles'):
+            refund = sum(r['salary'] for r in player['roles']) // 2
+            player['money'] += refund
+            print(f"{player['name']} released {len(player['roles'])} roles for ${refund}M")
+            player['roles'] = []
+
+    @traced('releases')
+    def start_releases(self, season_name, phase_name):
+        """Generic function to handle any release phase"""
+        game_state = self.game_state
+        game_state.phase = phase_name
+        game_logic.process_film_releases(game_state.players, game_state.release_results, season_name)
+        game_state.touch('films')
+        self.open_ready_gate(game_logic.PHASE_GATES[phase_name])
+
+    def continue_to_summer(self, player_id):
+        """Start Phase 2: Summer Production - wait for all players"""
+        return self.mark_ready('spring_releases', player_id)
+
+    def start_summer_production(self):
+        game_state = self.game_state
+        print("\n=== Starting Phase 2: Summer Production ===\n")
+        game_state.selected_roles_this_phase = set()
+        game_state.phase = 'phase2_production'
+        game_state.turn = 1
+        self.start_new_turn()
+
+    # ============================================================================
+    # PAGINATED COLLECTIONS
+    # ============================================================================
+
+    def query_talent_pool(self, role=None, bucket=None, cursor=None, limit=None):
+        """
+        A page of the talent pool, optionally filtered by role and by heat or
+        prestige bucket. Read-only.
+        """
+        talent = [
+            t for t in self.game_state.talent_pool
+            if (role is None or t['role'] == role)
+            and (bucket is None or bucket in (t['heat_bucket'], t['prestige_bucket']))
+        ]
+        return self.page('talent_pool', talent, cursor, limit)
+
+    def query_films(self, studio=None, season=None, genre=None, cursor=None, limit=None):
+        """
+        A page of every greenlit film (with box office once released),
+        optionally filtered by studio (player ID), release season and genre.
+        Read-only.
+        """
+        results = self.game_state.release_results
+        films = [
+            film for film in self.game_state.all_films()
+            if (studio is None or film['player_id'] == studio)
+            and (season is None or results.get(film['id'], {}).get('season') == season)
+            and (genre is None or film['genre'] == genre)
+        ]
+        page = self.page('films', films, cursor, limit)
+        page['items'] = [{**film, **results.get(film['id'], {})} for film in page['items']]
+        return page
+
+    def page(self, collection, items, cursor, limit):
+        """
+        Slice `items` for a cursor. Cursors are '<version>:<offset>' and go
+        stale when the collection changes, so a client never stitches pages
+        from two different versions together.
+        """
+        version = self.game_state.collection_versions[collection]
+        try:
+            limit = max(1, min(int(limit or game_logic.PAGE_SIZE), game_logic.MAX_PAGE_SIZE))
+        except (TypeError, ValueError):
+            raise GameError('query_error', 'Invalid page size')
+
+        offset = 0
+        if cursor:
+            try:
+                cursor_version, offset = (int(part) for part in cursor.split(':'))
+            except ValueError:
+                raise GameError('query_error', 'Invalid cursor')
+            if cursor_version != version:
+                raise GameError('query_error', 'Collection changed, start again from the first page')
+
+        end = offset + limit
+        return {
+            'items': items[offset:end],
+            'next_cursor': f'{version}:{end}' if end < len(items) else None,
+            'version': version,
+            'total': len(items)
+        }
+
+    # ============================================================================
+    # AWARD SEASON
+    # ============================================================================
+
+    def start_awards(self, player_id):
+        """Start Award Season - wait for all players"""
+        return self.mark_ready('holiday_releases', player_id)
+
+    def start_award_season(self):
+        game_state = self.game_state
+        print("\n=== Starting Award Season ===\n")
+
+        # Set up awards (just Best Picture for now)
+        awards_data = game_logic.setup_awards(game_state.players, active_categories=['best_picture'])
+
+        if not awards_data:
+            print("Not enough films for awards! Skipping to final results.")
+            self.finish_game()
+            return
+
+        game_state.phase = 'awards_voting'
+        game_state.awards = awards_data
+        game_state.tallies = {
+            key: {'players': VoteTally(len(category['nominees'])), 'audience': VoteTally(len(category['nominees']))}
+            for key, category in awards_data['categories'].items()
+        }
+
+        print(f"Award Season initialized with categories: {awards_data['active_categories']}")
+        print(f"Nominees: {len(awards_data['categories']['best_picture']['nominees'])} films")
+
+    def eligible_voters(self, category):
+        """Players who have at least one nominee they're allowed to vote for"""
+        studios = {film.get('studio') for film in category['nominees']}
+        return [
+            player_id for player_id, player in self.game_state.players.items()
+            if studios - {player['name']}
+        ]
+
+    def vote(self, player_id, nominee_index):
+        """Player votes for a nominee"""
+        game_state = self.game_state
+        if game_state.phase != 'awards_voting' or not game_state.awards:
+            return False
+
+        current_cat_key = game_state.awards['current_category']
+        category = game_state.awards['categories'][current_cat_key]
+        nominees = category['nominees']
+
+        # Validate vote
+        if player_id in category['votes']:
+            raise GameError('vote_error', 'You have already voted!')
+        if not isinstance(nominee_index, int) or not 0 <= nominee_index < len(nominees):
+            raise GameError('vote_error', 'Invalid nominee selection!')
+
+        # Check if voting for own film
+        selected_film = nominees[nominee_index]
+        voter_studio = game_state.players[player_id]['name']
+
+        if selected_film.get('studio') == voter_studio:
+            raise GameError('vote_error', 'Cannot vote for your own film!')
+
+        # Record vote
+        category['votes'][player_id] = nominee_index
+        game_state.tallies[current_cat_key]['players'].cast(player_id, nominee_index)
+        player_name = game_state.players[player_id]['name']
+        print(f"{player_name} voted for nominee {nominee_index}: {selected_film['title']}")
+
+        # Check if all players who can vote have voted
+        if len(category['votes']) >= len(self.eligible_voters(category)):
+            self.calculate_award_winner(current_cat_key)
+
+        return True
+
+    def audience_vote(self, voter_id, nominee_index):
+        """
+        An audience member votes in the current category. Safe to call without
+        the engine lock: the tally's shards do their own locking, and a vote
+        arriving after the category closed is simply not counted.
+
+        Returns:
+            True if the tally changed (False for a repeat vote)
+        """
+        awards = self.game_state.awards
+        if self.game_state.phase != 'awards_voting' or not awards:
+            raise GameError('vote_error', 'Voting is closed')
+        category_key = awards['current_category']
+        if not isinstance(nominee_index, int) or not 0 <= nominee_index < len(awards['categories'][category_key]['nominees']):
+            raise GameError('vote_error', 'Invalid nominee selection!')
+        return self.game_state.tallies[category_key]['audience'].cast(voter_id, nominee_index)
+
+    def award_vote_counts(self, category_key):
+        """Players' votes per nominee plus the audience bloc for its favourite"""
+        tallies = self.game_state.tallies[category_key]
+        nominees = self.game_state.awards['categories'][category_key]['nominees']
+        counts = tallies['players'].counts()
+        favourite = tallies['audience'].leader(nominees, game_logic.AWARD_CATEGORIES[category_key].scoring_attribute)
+        if favourite is not None:
+            counts[favourite] += game_logic.AUDIENCE_BLOC_VOTES
+        return counts
+
+    @traced('tally awards')
+    def calculate_award_winner(self, category_key):
+        """Calculate the winner for a category"""
+        game_state = self.game_state
+        category_data = game_state.awards['categories'][category_key]
+        category = game_logic.AWARD_CATEGORIES[category_key]
+
+        for tally in game_state.tallies[category_key].values():
+            tally.close()
+        winner = category.calculate_winner(
+            self.award_vote_counts(category_key),
+            category_data['nominees']
+        )
+
+        if winner:
+            category_data['winner'] = winner
+
+            # Award points to the studio
+            winner_studio = winner.get('studio')
+            for player_id, player in game_state.players.items():
+                if player['name'] == winner_studio:
+                    player['score'] += category.points_value
+                    print(f"\n🏆 {category.name} WINNER: {winner['title']} ({winner_studio})")
+                    print(f"   +{category.points_value} points awarded!")
+                    break
+
+        # Move to results phase
+        game_state.phase = 'awards_results'
+        self.open_ready_gate('awards_results')
+
+    def continue_from_awards(self, player_id):
+        """Handle continuing from awards results to game complete"""
+        return self.mark_ready('awards_results', player_id)
+
+    def finish_game(self):
+        print("\n=== GAME COMPLETE ===\n")
+        self.game_state.phase = 'game_complete'
+        if self.on_game_complete:
+            self.on_game_complete()
+
+    # What runs once everyone is through each ready gate
+    gate_transitions = {
+        'bidding_results': continue_after_bidding_results,
+        'spring_packaging': lambda self: self.start_releases('Spring', 'phase1_releases'),
+        'holiday_packaging': lambda self: self.start_releases('Holiday', 'phase2_releases'),
+        'spring_releases': start_summer_production,
+        'holiday_releases': start_award_season,
+        'awards_results': finish_game
+    }
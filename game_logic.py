@@ -1,7 +1,19 @@
 """
 Game logic and state management for Hollywood Moguls
 """
+import json
 import random
+import secrets
+import time
+from collections import deque
+
+try:
+    import numpy
+except ImportError:  # Optional: bulk talent generation falls back to the random module
+    numpy = None
+
+from barriers import ReadyBarrier
+from cards import CardStore, Record
 
 # Constants
 GENRES = ['Action', 'Comedy', 'Drama', 'Horror', 'Romance', 'Sci-Fi', 'Thriller', 'Western']
@@ -25,6 +37,75 @@ DEFAULT_NAMES = {
     ]
 }
 
+# How many recent state versions each game keeps for reconnect replay
+UPDATE_LOG_SIZE = 64
+
+# Seconds before a ready gate auto-advances players who haven't continued
+# (None = wait for everyone, however long it takes)
+READY_TIMEOUTS = {
+    'bidding_results': 45,
+    'spring_packaging': 300,
+    'holiday_packaging': 300,
+    'spring_releases': 90,
+    'holiday_releases': 90,
+    'awards_results': 90
+}
+
+# Which ready gate is open during each phase
+PHASE_GATES = {
+    'phase1_bidding_results': 'bidding_results',
+    'phase2_bidding_results': 'bidding_results',
+    'phase1_packaging': 'spring_packaging',
+    'phase2_packaging': 'holiday_packaging',
+    'phase1_releases': 'spring_releases',
+    'phase2_releases': 'holiday_releases',
+    'awards_results': 'awards_results'
+}
+
+# Large collections are fetched page by page (get_talent_pool / get_films)
+# instead of riding along with every game_update
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Talent each player names in phase 0, filled in this order
+NAMING_QUOTAS = {'screenwriter': 3, 'director': 3, 'star': 5}
+
+# Suffixes for the 2nd, 3rd, ... talent given the same name
+DUPLICATE_SUFFIXES = ['Jr.', 'II', 'III', 'IV', 'V']
+
+# Seconds a disconnected player gets to come back before being auto-advanced
+DISCONNECT_GRACE = 60
+
+# How contested cards are fought over each turn:
+#   'concurrent' - every bidding war with distinct participants runs at once
+#   'sequential' - one bidding war at a time, each with its own results screen
+#   'auction'    - like 'concurrent', but each war is a live English auction:
+#                  participants raise as often as they like until its closing
+#                  window runs out
+BIDDING_MODES = ('concurrent', 'sequential', 'auction')
+DEFAULT_BIDDING_MODE = 'concurrent'
+
+# Live auctions: seconds a war is open for, the least time left after each
+# new high bid, and the smallest raise over the current high bid ($M)
+AUCTION_WINDOW = 15
+AUCTION_EXTENSION = 5
+MIN_RAISE = 1
+
+# Matchmade tables: seconds the matched players have to take their seats
+# before the game starts without the missing ones (given at least
+# MIN_MATCH_PLAYERS), and the table sizes players can ask for
+MATCH_JOIN_WINDOW = 45
+MIN_MATCH_PLAYERS = 2
+MATCH_SEATS = range(2, 9)
+
+# Extra join windows a matchmade table short of MIN_MATCH_PLAYERS is held
+# open for before it is closed
+MATCH_EXTENSIONS = 2
+
+# Seconds matchmade players have to name their talent; whatever is still
+# unnamed then is named for them
+MATCH_NAMING_WINDOW = 120
+
 class GameState:
     """Manages the game state"""
     
@@ -36,41 +117,242 @@ class GameState:
         self.phase = 'lobby'
         self.players = {}
         self.talent_pool = []
+        self.talent_name_counts = {}      # {submitted name: times used}, for deduping as names arrive
         self.naming_progress = {'submissions': {}}
         self.year = 0
         self.turn = 0
         self.current_turn_cards = []
         self.player_selections = {}
+        self.bidding_mode = DEFAULT_BIDDING_MODE
+        self.match = None                 # Matchmade table: {'seats', 'start_by', 'name_by', 'closed'}; the server plays host
         self.bidding_war = {
             'active': False,
-            'card_index': None,           # Which card is being fought over
-            'card_data': {},              # Copy of the card itself
-            'participants': [],           # List of player SIDs competing
-            'bids': {},                   # {sid: bid_amount}
-            'conflicts_queue': []         # List of (card_index, [sids]) to resolve
+            'wars': [],                   # Running wars: {card_index, card_data, participants, bids, ...}
+            'conflicts_queue': []         # List of (card_index, [player_ids]) still to start
         }
         self.no_name_talent = {}
+        self.cards = CardStore()          # Interned talent cards and films, by ID
+        self.release_results = {}         # {film_id: {'box_office', 'multiplier', 'season'}}
+        self.bid_log = []                 # Resolved bidding wars, kept for the archive
+        
+        # Bumped whenever a paginated collection changes, so clients know
+        # when their cached pages are stale
+        self.collection_versions = {'talent_pool': 0, 'films': 0}
         self.awards = None
-        self.selected_roles_this_phase = []
+        self.tallies = {}                 # {category_key: {'players': VoteTally, 'audience': VoteTally}}
+        self.selected_roles_this_phase = set()   # Names taken this phase (O(1) membership)
+        self.barriers = {gate: ReadyBarrier(gate) for gate in READY_TIMEOUTS}
+        
+        # Sessions: players are keyed by a stable player ID, never by socket ID
+        self.sessions = {}        # {resume_token: player_id}
+        self.player_names = {}    # {name: player_id}
+        self.player_sids = {}     # {player_id: sid} for connected players
+        self.sid_players = {}     # {sid: player_id}
+        
+        # Immutable snapshot of every recent version, for broadcasting and
+        # for replaying missed updates on reconnect. Consecutive versions
+        # share whatever didn't change between them.
+        self.version = 0
+        self.snapshot = freeze(self.to_dict())
+        self.snapshots = deque([self.snapshot], maxlen=UPDATE_LOG_SIZE + 1)
+    
+    def add_player(self, sid, name):
+        """
+        Seat a new player and bind them to a socket.
+        
+        Returns:
+            (player_id, resume_token)
+        """
+        player_id = secrets.token_hex(4)
+        while player_id in self.players:
+            player_id = secrets.token_hex(4)
+        token = secrets.token_urlsafe(16)
+        
+        self.players[player_id] = {
+            'name': name,
+            'money': 100,
+            'score': 0,
+            'roles': [],
+            'films': []
+        }
+        self.sessions[token] = player_id
+        self.player_names[name] = player_id
+        self.bind_sid(player_id, sid)
+        return player_id, token
+    
+    def bind_sid(self, player_id, sid):
+        """Attach a (new) socket to a player, dropping any stale socket"""
+        old_sid = self.player_sids.get(player_id)
+        if old_sid is not None:
+            self.sid_players.pop(old_sid, None)
+        self.player_sids[player_id] = sid
+        self.sid_players[sid] = player_id
+    
+    def unbind_sid(self, sid):
+        """Detach a socket; returns the player ID it belonged to, if any"""
+        player_id = self.sid_players.pop(sid, None)
+        if player_id is not None and self.player_sids.get(player_id) == sid:
+            del self.player_sids[player_id]
+        return player_id
+    
+    def unbind_all(self):
+        """Detach every socket (they belong to the worker the game left)"""
+        self.player_sids = {}
+        self.sid_players = {}
+    
+    def is_connected(self, player_id):
+        return player_id in self.player_sids
+    
+    def tally_snapshot(self):
+        """Current award vote counts per category (players and audience)"""
+        return {
+            key: {
+                'players': tallies['players'].counts(),
+                'audience': tallies['audience'].counts(),
+                'audience_voters': tallies['audience'].voters()
+            }
+            for key, tallies in self.tallies.items()
+        }
+    
+    def auction_snapshot(self):
+        """The leading bid of each live auction, streamed between full updates"""
+        wars = self.bidding_war['wars'] if self.bidding_mode == 'auction' else []
+        return {
+            'wars': [
+                {
+                    'card_index': war['card_index'],
+                    'bids': war['bids'],
+                    'closes_at': war.get('closes_at')
+                }
+                for war in wars
+            ],
+            'server_time': time.time()
+        }
+    
+    def touch(self, collection):
+        """Mark a paginated collection ('talent_pool' or 'films') as changed"""
+        self.collection_versions[collection] += 1
+    
+    def all_films(self):
+        return [film for player in self.players.values() for film in player.get('films', [])]
+    
+    def record_update(self):
+        """
+        Bump the state version and freeze the new state, sharing every part
+        that didn't change with the previous version.
+        
+        Returns:
+            The new version's snapshot (an immutable dict, safe to hand to
+            other threads without the engine lock)
+        """
+        state = self.to_dict()
+        self.version += 1
+        state['version'] = self.version
+        self.snapshot = freeze(state, self.snapshot)
+        self.snapshots.append(self.snapshot)
+        return self.snapshot
+    
+    def updates_since(self, version):
+        """
+        Get the updates a client missed after `version`.
+        
+        Returns:
+            List of {'version', 'changes'} dicts (oldest first), or None if
+            the kept snapshots no longer reach back that far and a full state
+            is needed
+        """
+        if version == self.version:
+            return []
+        oldest = self.snapshots[0]['version']
+        if version > self.version or version < oldest:
+            return None
+        
+        snapshots = list(self.snapshots)[version - oldest:]
+        return [
+            {'version': new['version'], 'changes': diff_snapshots(old, new)}
+            for old, new in zip(snapshots, snapshots[1:])
+        ]
     
     def to_dict(self):
-        """Convert state to dictionary for broadcasting"""
+        """
+        Convert state to dictionary for broadcasting.
+        The talent pool and films are left out (clients page through them
+        with get_talent_pool / get_films); only their sizes and versions
+        are included.
+        """
         return {
             'phase': self.phase,
-            'players': self.players,
-            'talent_pool': self.talent_pool,
+            'players': {
+                player_id: {
+                    **{k: v for k, v in player.items() if k != 'films'},
+                    'film_count': len(player.get('films', []))
+                }
+                for player_id, player in self.players.items()
+            },
+            'collections': {
+                'talent_pool': {'version': self.collection_versions['talent_pool'], 'count': len(self.talent_pool)},
+                'films': {'version': self.collection_versions['films'], 'count': sum(
+                    len(player.get('films', [])) for player in self.players.values()
+                )}
+            },
             'naming_progress': self.naming_progress,
             'year': self.year,
             'turn': self.turn,
             'current_turn_cards': self.current_turn_cards,
             'player_selections': self.player_selections,
             'bidding_war': self.bidding_war,
+            'bidding_mode': self.bidding_mode,
+            'match': self.match,
             'no_name_talent': self.no_name_talent,
-            'awards': self.awards
+            'release_results': self.release_results,
+            'awards': self.awards,
+            'award_tallies': self.tally_snapshot(),
+            'ready': {
+                gate: barrier.progress(len(self.players))
+                for gate, barrier in self.barriers.items()
+            },
+            'version': self.version
         }
 
 # Utility functions
 
+def freeze(value, previous=None):
+    """
+    Immutable copy of a JSON-like value: dicts become Records, lists tuples
+    and sets frozensets. Any part equal to the same part of `previous` (an
+    earlier freeze of it) is that part itself, so versions share unchanged
+    subtrees and `is` tells whether a part changed.
+    """
+    if isinstance(value, Record):
+        return value  # Interned cards and films are frozen already
+    if isinstance(value, dict):
+        prior = previous if isinstance(previous, Record) else {}
+        frozen = {key: freeze(item, prior.get(key)) for key, item in value.items()}
+        if prior is previous and len(frozen) == len(prior) and all(
+                prior.get(key, prior) is item for key, item in frozen.items()):
+            return previous
+        return Record(frozen)
+    if isinstance(value, (list, tuple)):
+        prior = previous if isinstance(previous, tuple) and len(previous) == len(value) else None
+        frozen = tuple(freeze(item, prior and prior[i]) for i, item in enumerate(value))
+        if prior is not None and all(a is b for a, b in zip(frozen, prior)):
+            return previous
+        return frozen
+    if isinstance(value, (set, frozenset)):
+        value = frozenset(value)
+    if type(value) is type(previous) and value == previous:
+        return previous
+    return value
+
+
+def diff_snapshots(old, new):
+    """Top-level fields of snapshot `new` that changed since `old` (O(fields))"""
+    return {
+        key: value for key, value in new.items()
+        if key != 'version' and old.get(key, old) is not value
+    }
+
+
 def get_heat_bucket(heat):
     """Convert heat value to bucket"""
     if heat < 64:
@@ -147,20 +429,89 @@ def generate_talent_stats(role_type, name, is_producer=False):
     
     return result
 
+# Bucket of every heat (1-255) and prestige (0-110) a talent can have, so a
+# batch looks them up instead of branching per card
+HEAT_BUCKETS = [get_heat_bucket(heat) for heat in range(256)]
+PRESTIGE_BUCKETS = [get_prestige_bucket(prestige) for prestige in range(111)]
+
+def _talent_columns(role_type, count):
+    """Heat, prestige and salary of `count` talent, drawn a column at a time"""
+    if numpy is not None:
+        generator = numpy.random.default_rng(random.getrandbits(64))
+        heat = generator.integers(1, 256, size=count)
+        prestige = generator.integers(1, 101, size=count)
+        if role_type == 'screenwriter':
+            salary = prestige // 10 + generator.integers(1, 4, size=count)
+        else:
+            salary = heat // 10 + generator.integers(1, 6, size=count)
+        if role_type == 'director':
+            prestige = numpy.maximum(1, 100 - heat // 3 + generator.integers(-10, 11, size=count))
+        return heat.tolist(), prestige.tolist(), salary.tolist()
+    
+    heat = random.choices(range(1, 256), k=count)
+    prestige = random.choices(range(1, 101), k=count)
+    if role_type == 'screenwriter':
+        salary = [p // 10 + extra for p, extra in zip(prestige, random.choices(range(1, 4), k=count))]
+    else:
+        salary = [h // 10 + extra for h, extra in zip(heat, random.choices(range(1, 6), k=count))]
+    if role_type == 'director':
+        prestige = [max(1, 100 - h // 3 + jitter) for h, jitter in zip(heat, random.choices(range(-10, 11), k=count))]
+    return heat, prestige, salary
+
+def generate_talent_batch(role_type, names):
+    """
+    generate_talent_stats for many talent of one role at once (not
+    producers), with the same distributions. Uses numpy when installed.
+    """
+    heat, prestige, salary = _talent_columns(role_type, len(names))
+    talent = [
+        {
+            'name': name,
+            'role': role_type,
+            'heat': h,
+            'heat_bucket': HEAT_BUCKETS[h],
+            'prestige': p,
+            'prestige_bucket': PRESTIGE_BUCKETS[p],
+            'salary': s
+        }
+        for name, h, p, s in zip(names, heat, prestige, salary)
+    ]
+    if role_type == 'screenwriter':
+        for card, audience in zip(talent, random.choices(AUDIENCES, k=len(talent))):
+            card['audience'] = audience
+    return talent
+
+def load_name_corpus(path):
+    """
+    A talent name corpus from a JSON file shaped like DEFAULT_NAMES
+    ({role: [names]}, one list per named role)
+    """
+    with open(path, encoding='utf-8') as f:
+        corpus = json.load(f)
+    for role_type in NAMING_QUOTAS:
+        names = corpus.get(role_type)
+        if not isinstance(names, list) or not names or not all(isinstance(n, str) and n.strip() for n in names):
+            raise ValueError(f'Name corpus {path} needs a list of {role_type} names')
+    return {role_type: [name.strip() for name in corpus[role_type]] for role_type in NAMING_QUOTAS}
+
+def dedupe_name(base_name, name_counts):
+    """
+    `base_name`, or if it was used before, with the next suffix (Jr., II,
+    III, ...). Counts the use in `name_counts`.
+    """
+    count = name_counts.get(base_name, 0) + 1
+    name_counts[base_name] = count
+    if count == 1:
+        return base_name
+    if count - 2 < len(DUPLICATE_SUFFIXES):
+        return f"{base_name} {DUPLICATE_SUFFIXES[count - 2]}"
+    return f"{base_name} {count}"
+
 def handle_duplicate_names(talent_list):
     """Append Jr., II, III, etc. to duplicate names"""
     name_counts = {}
     for talent in talent_list:
-        base_name = talent['name']
-        if base_name in name_counts:
-            name_counts[base_name] += 1
-            if name_counts[base_name] == 2:
-                talent['name'] = f"{base_name} Jr."
-            else:
-                suffixes = ['II', 'III', 'IV', 'V']
-                talent['name'] = f"{base_name} {suffixes[name_counts[base_name]-2]}"
-        else:
-            name_counts[base_name] = 1
+        talent['name'] = dedupe_name(talent['name'], name_counts)
 
 def generate_turn_cards(game_state):
     """Generate cards for the current turn"""
@@ -169,9 +520,9 @@ def generate_turn_cards(game_state):
     
     cards = []
     
-    # Add existing talent
+    # Add existing talent (shared records - cards are never copied)
     available_talent = [
-        t.copy() for t in game_state.talent_pool
+        t for t in game_state.talent_pool
         if t['name'] not in game_state.selected_roles_this_phase
     ]
     if len(available_talent) >= num_cards - 1:
@@ -183,7 +534,7 @@ def generate_turn_cards(game_state):
     producer_names = ['Avi Goldstein', 'Rachel Chen', 'Marcus Thompson', 'Sofia Rodriguez',
                       'David Kim', 'Emma Watson', 'James O\'Brien', 'Priya Patel']
     producer = generate_talent_stats('producer', random.choice(producer_names), is_producer=True)
-    cards.append(producer)
+    cards.append(game_state.cards.intern(producer))
     
     random.shuffle(cards)
     return cards
@@ -225,46 +576,43 @@ def calculate_box_office(film):
         'multiplier': round(multiplier, 2)
     }
 
-def process_film_releases(players, season_name='Spring'):
+def process_film_releases(players, release_results, season_name='Spring'):
     """
     Process all film releases for a season and calculate box office.
     This is the single source of truth for release calculations.
     
     Args:
         players: Dictionary of player objects
+        release_results: Dict of {film_id: results}; films released this
+            season get their box office added here (films are immutable)
         season_name: String name of the season (for logging)
     
     Returns:
-        List of all films with box office results
+        List of (film, results) pairs for every film released so far
     """
-    import random
-    
     print(f"\n=== {season_name.upper()} RELEASES ===\n")
     
     all_films = []
     
-    for sid, player in players.items():
+    for player_id, player in players.items():
         if player.get('films'):
             for film in player['films']:
                 # Only calculate box office if not already calculated
-                if 'box_office' not in film:
+                if film['id'] not in release_results:
                     # Calculate box office using our single formula
                     results = calculate_box_office(film)
-                    film.update(results)
+                    results['season'] = season_name
+                    release_results[film['id']] = results
                     
                     # Add earnings to player
-                    player['money'] += film['box_office']
-                    player['score'] += film['box_office']
+                    player['money'] += results['box_office']
+                    player['score'] += results['box_office']
                     
                     print(f"{player['name']}: '{film['title']}'")
-                    print(f"  Heat: {film['heat']} x {film['multiplier']:.2f} = ${film['box_office']}M")
+                    print(f"  Heat: {film['heat']} x {results['multiplier']:.2f} = ${results['box_office']}M")
                     print(f"  New balance: ${player['money']}M")
                     
-                all_films.append({
-                    **film,
-                    'studio': player['name'],
-                    'season': season_name
-                })
+                all_films.append((film, release_results[film['id']]))
         
         # IMPORTANT: Clear any leftover roles after releases
         # Players should never carry roles between production phases
@@ -304,40 +652,30 @@ class AwardCategory:
         # Return top N, or all films if there aren't enough
         return sorted_films[:min(self.nominees_count, len(sorted_films))]
     
-    def calculate_winner(self, votes, nominees):
+    def calculate_winner(self, vote_counts, nominees):
         """
-        Calculate the winner based on votes.
+        Calculate the winner from the vote counters (no recount of ballots).
         
         Args:
-            votes: Dict of {player_sid: film_index}
+            vote_counts: Votes per nominee, in nominee order
             nominees: List of nominated films
         
         Returns:
             Winning film or None if no votes
         """
-        if not votes:
+        if not any(vote_counts):
             return None
         
-        # Count votes for each film
-        vote_counts = {}
-        for film_index in votes.values():
-            vote_counts[film_index] = vote_counts.get(film_index, 0) + 1
-        
-        # Find max votes
-        max_votes = max(vote_counts.values())
-        
-        # Get all films with max votes (for tie-breaking)
-        tied_films = [idx for idx, count in vote_counts.items() if count == max_votes]
-        
-        if len(tied_films) == 1:
-            return nominees[tied_films[0]]
-        else:
-            # Tie-breaker: highest prestige
-            winner_idx = max(
-                tied_films, 
-                key=lambda idx: nominees[idx].get(self.scoring_attribute, 0)
-            )
-            return nominees[winner_idx]
+        # Most votes wins; tie-breaker: highest prestige
+        winner_idx = max(
+            range(len(nominees)),
+            key=lambda idx: (vote_counts[idx], nominees[idx].get(self.scoring_attribute, 0))
+        )
+        return nominees[winner_idx]
+
+# The audience votes as one bloc: its favourite nominee gets this many votes
+# on top of the seated players' ballots
+AUDIENCE_BLOC_VOTES = 1
 
 # Define available award categories
 AWARD_CATEGORIES = {
@@ -365,16 +703,10 @@ AWARD_CATEGORIES = {
 }
 
 def get_all_films_from_players(players):
-    """Collect all films from all players"""
+    """Collect all films from all players (films already carry their studio)"""
     all_films = []
-    for sid, player in players.items():
-        if player.get('films'):
-            for film in player['films']:
-                all_films.append({
-                    **film,
-                    'studio': player['name'],
-                    'player_sid': sid
-                })
+    for player in players.values():
+        all_films.extend(player.get('films', []))
     return all_films
 
 def generate_no_name_talent():
@@ -460,7 +792,7 @@ def setup_awards(players, active_categories=['best_picture']):
         awards_data['categories'][cat_key] = {
             'name': category.name,
             'nominees': nominees,
-            'votes': {},  # {player_sid: nominee_index}
+            'votes': {},  # {player_id: nominee_index}
             'winner': None,
             'points_value': category.points_value
         }
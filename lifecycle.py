@@ -0,0 +1,176 @@
+"""
+Room lifecycle for Hollywood Moguls: idle and finished rooms leave memory
+
+Every room is in one of three states:
+
+    active    it has connected sockets, or saw an event in the last IDLE_AFTER
+    idle      nobody has been around for IDLE_AFTER seconds
+    finished  the game reached game_complete (it is already archived)
+
+A sweep every SWEEP_INTERVAL seconds spills idle rooms to compact on-disk
+snapshots (zlib-compressed pickles, one file per room) and, least recently
+used first, any further socket-less rooms while the worker holds more than
+MAX_ROOMS rooms or more than ROOM_MEMORY_MB of state. A spilled room is
+reloaded transparently by the next event or page that asks for it, with its
+timers re-armed. Finished rooms are dropped FINISHED_TTL after their last
+player leaves, and snapshots nobody came back for expire after SNAPSHOT_TTL,
+so memory and disk both stay flat however long the server runs. Rooms
+frozen for a move to another worker are left alone: the move decides where
+they live.
+"""
+import os
+import time
+import zlib
+from collections import Counter
+
+from scheduler import scheduler
+
+SWEEP_INTERVAL = 30
+
+# Seconds without sockets or events before a room counts as idle and spills
+IDLE_AFTER = 10 * 60
+
+# Seconds a finished game stays loaded once its last player has left
+FINISHED_TTL = 5 * 60
+
+# Seconds a spilled snapshot is kept before the game is abandoned for good
+SNAPSHOT_TTL = 7 * 24 * 60 * 60
+
+SNAPSHOT_SUFFIX = '.snap'
+
+
+class SnapshotStore:
+    """Compressed room snapshots on disk, one file per room"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, room_id):
+        return os.path.join(self.path, room_id + SNAPSHOT_SUFFIX)
+
+    def save(self, room_id, snapshot):
+        """Write atomically, so a crash never leaves half a snapshot"""
+        tmp = self._file(room_id) + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(zlib.compress(snapshot))
+        os.replace(tmp, self._file(room_id))
+
+    def load(self, room_id):
+        """The room's snapshot, or None if it was never spilled"""
+        try:
+            with open(self._file(room_id), 'rb') as f:
+                return zlib.decompress(f.read())
+        except FileNotFoundError:
+            return None
+
+    def delete(self, room_id):
+        try:
+            os.remove(self._file(room_id))
+        except FileNotFoundError:
+            pass
+
+    def expire(self, max_age):
+        """Delete snapshots older than `max_age` seconds; returns their room IDs"""
+        cutoff = time.time() - max_age
+        expired = []
+        for name in os.listdir(self.path):
+            if not name.endswith(SNAPSHOT_SUFFIX):
+                continue
+            path = os.path.join(self.path, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    expired.append(name[:-len(SNAPSHOT_SUFFIX)])
+            except FileNotFoundError:
+                pass
+        return expired
+
+
+def room_state(room, sockets, now):
+    if room.game_state.phase == 'game_complete':
+        return 'finished'
+    if sockets or now - room.last_active < IDLE_AFTER:
+        return 'active'
+    return 'idle'
+
+
+class RoomLifecycle:
+    """Periodically spills, evicts and expires a RoomRegistry's rooms"""
+
+    def __init__(self, rooms, max_rooms=1000, max_memory_mb=256):
+        """
+        Args:
+            rooms: The RoomRegistry to manage (its store holds spilled rooms;
+                without one, rooms that would spill are dropped instead)
+            max_rooms: Most rooms kept in memory
+            max_memory_mb: Budget for all rooms' state, estimated from the
+                size of their snapshots (see Room.footprint)
+        """
+        self.rooms = rooms
+        self.max_rooms = max_rooms
+        self.max_memory = max_memory_mb * 1024 * 1024
+        self.stats = Counter()   # {'spilled', 'expired', 'snapshots_expired'}
+
+    def sweep(self, now=None):
+        """One pass over the rooms; returns {room_id: action} for what it did"""
+        now = time.time() if now is None else now
+        rooms = self.rooms
+        sockets = Counter(rooms.sid_rooms.values())
+        actions = {}
+
+        for room in list(rooms.rooms.values()):
+            if room.engine.frozen:
+                continue  # Being moved to another worker, which will host it
+            state = room_state(room, sockets[room.room_id], now)
+            if state == 'finished':
+                if room.finished_at is None or sockets[room.room_id]:
+                    room.finished_at = now
+                elif now - room.finished_at > FINISHED_TTL:
+                    rooms.expire(room.room_id)
+                    self.stats['expired'] += 1
+                    actions[room.room_id] = 'expired'
+            elif state == 'idle':
+                actions[room.room_id] = self.spill(room.room_id)
+
+        # Least recently used first, until back under both limits
+        footprint = sum(room.footprint() for room in rooms.rooms.values())
+        for room in list(rooms.rooms.values()):
+            if len(rooms.rooms) <= self.max_rooms and footprint <= self.max_memory:
+                break
+            if sockets[room.room_id] or room.engine.frozen:
+                continue
+            footprint -= room.footprint()
+            actions[room.room_id] = self.spill(room.room_id)
+
+        if rooms.store is not None:
+            for room_id in rooms.store.expire(SNAPSHOT_TTL):
+                rooms.directory.release(room_id)
+                self.stats['snapshots_expired'] += 1
+                actions[room_id] = 'snapshot expired'
+
+        if actions:
+            print(f'🧹 Room sweep on worker {rooms.worker_index}: ' +
+                  ', '.join(f'{room_id} {action}' for room_id, action in actions.items()) +
+                  f' ({len(rooms.rooms)} room(s) in memory)')
+        return actions
+
+    def spill(self, room_id):
+        if self.rooms.store is None:
+            self.rooms.expire(room_id)
+            self.stats['expired'] += 1
+            return 'dropped'
+        if not self.rooms.spill(room_id):
+            return 'kept'
+        self.stats['spilled'] += 1
+        return 'spilled'
+
+    def start(self):
+        """Sweep every SWEEP_INTERVAL seconds on the shared scheduler"""
+        def run():
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f'❌ Room sweep failed: {e}')
+            scheduler.call_later(SWEEP_INTERVAL, run)
+        scheduler.call_later(SWEEP_INTERVAL, run)
@@ -0,0 +1,314 @@
+"""
+Matchmaking for public play: waiting players are grouped into new rooms
+
+Instead of everyone piling into one room, a player can ask to be matched:
+
+    POST   /api/matchmaking             {"seats": 4, "bidding_mode": "concurrent"}
+    GET    /api/matchmaking/<ticket>    status (?wait=<seconds> to long-poll)
+    DELETE /api/matchmaking/<ticket>    leave the queue
+    GET    /api/matchmaking             queue depth and time-to-match
+
+Tickets wait in a FIFO bucket per preference (table size and bidding mode),
+so queueing, matching and leaving are O(1) whatever the queue's length
+(leaving just marks the ticket; it's skipped when its turn comes). A bucket
+holding a full table is matched at once, into a brand-new room reserved in
+the RoomDirectory: whichever worker hosts that room sets it up as a
+matchmade table when the first player connects, and it starts on its own
+once everyone is seated. A bucket whose oldest ticket has waited
+FILL_TARGET seconds starts a smaller table with the players it has, so
+nobody waits much longer than that for a game while anyone else is
+waiting for the same kind of table.
+
+Every worker redirects matchmaking requests to the worker MATCHMAKING_KEY
+hashes to (plainly, ignoring draining and room assignments, so it never
+moves), so there is one queue however many workers there are. That worker
+starts its matching sweep when it boots, or at the latest with the first
+matchmaking request it serves.
+"""
+import secrets
+import threading
+import time
+from collections import Counter, deque
+
+from flask import abort, jsonify, request
+
+import game_logic
+from scheduler import scheduler
+
+# Hashed like a room ID (see rooms.worker_for_room) to pick the worker that runs the queue
+MATCHMAKING_KEY = 'matchmaking'
+
+DEFAULT_SEATS = 4
+
+# Seconds a bucket's oldest ticket waits before a smaller table is started
+FILL_TARGET = 20
+
+# Seconds between sweeps for buckets past FILL_TARGET
+MATCH_INTERVAL = 1.0
+
+# Waiting tickets not polled for this long are dropped (the page was closed)
+ABANDON_AFTER = 45
+
+# Seconds matched tickets stay readable, and reservations stay claimable
+TICKET_TTL = 5 * 60
+
+# Longest a long-poll request may be held open, in seconds
+MAX_WAIT = 30
+
+# Recent times-to-match kept for the percentiles
+MATCH_SAMPLES = 500
+
+
+class Ticket:
+    """One player waiting for (or matched to) a table"""
+
+    def __init__(self, ticket_id, bucket, now):
+        self.ticket_id = ticket_id
+        self.bucket = bucket          # (seats, bidding_mode)
+        self.enqueued_at = now
+        self.last_seen = now          # Last time the player polled
+        self.room_id = None
+        self.matched_at = None
+        self.cancelled = False
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Matchmaker:
+    """Bucketed matchmaking queue that opens rooms on demand"""
+
+    def __init__(self, rooms, fill_target=FILL_TARGET):
+        self.rooms = rooms
+        self.fill_target = fill_target
+        self.buckets = {}       # {(seats, bidding_mode): deque of Tickets, oldest first}
+        self.waiting = Counter()  # {(seats, bidding_mode): live tickets in the bucket}
+        self.tickets = {}       # {ticket_id: Ticket}
+        self.match_times = deque(maxlen=MATCH_SAMPLES)
+        self.counts = Counter()   # {'queued', 'matched', 'abandoned', 'cancelled', 'rooms', 'short_tables'}
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self.running = False      # The matching sweep is scheduled
+        self.sweeps = 0
+
+    def enqueue(self, seats=DEFAULT_SEATS, bidding_mode=game_logic.DEFAULT_BIDDING_MODE):
+        """
+        Queue a player for a table of `seats`. Returns the ticket ID.
+        Raises ValueError for preferences no table can meet.
+        """
+        if seats not in game_logic.MATCH_SEATS:
+            raise ValueError(f'Tables seat {game_logic.MATCH_SEATS.start}-{game_logic.MATCH_SEATS.stop - 1}')
+        if bidding_mode not in game_logic.BIDDING_MODES:
+            raise ValueError(f'Unknown bidding mode: {bidding_mode}')
+
+        now = time.monotonic()
+        bucket = (seats, bidding_mode)
+        with self.lock:
+            ticket = Ticket(secrets.token_urlsafe(12), bucket, now)
+            self.tickets[ticket.ticket_id] = ticket
+            self.buckets.setdefault(bucket, deque()).append(ticket)
+            self.waiting[bucket] += 1
+            self.counts['queued'] += 1
+            if self.waiting[bucket] >= seats:
+                self._open_table(bucket, seats, now)
+        return ticket.ticket_id
+
+    def cancel(self, ticket_id):
+        """Leave the queue; False if the ticket was already matched or unknown"""
+        with self.lock:
+            ticket = self.tickets.get(ticket_id)
+            if ticket is None or ticket.room_id is not None or ticket.cancelled:
+                return False
+            self._drop(ticket)
+            self.counts['cancelled'] += 1
+            return True
+
+    def _drop(self, ticket):
+        ticket.cancelled = True
+        self.waiting[ticket.bucket] -= 1
+        del self.tickets[ticket.ticket_id]
+
+    def status(self, ticket_id, wait=0):
+        """
+        A ticket's status, waiting up to `wait` seconds for it to be matched.
+        None if the ticket is unknown (never issued, cancelled or expired).
+        """
+        deadline = time.monotonic() + wait
+        with self.changed:
+            while True:
+                ticket = self.tickets.get(ticket_id)
+                if ticket is None:
+                    return None
+                now = time.monotonic()
+                ticket.last_seen = now
+                if ticket.room_id is not None or now >= deadline:
+                    break
+                self.changed.wait(deadline - now)
+
+            seats, bidding_mode = ticket.bucket
+            if ticket.room_id is not None:
+                return {'status': 'matched', 'room': ticket.room_id, 'seats': seats,
+                        'bidding_mode': bidding_mode}
+            return {'status': 'waiting', 'seats': seats, 'bidding_mode': bidding_mode,
+                    'waiting': self.waiting[ticket.bucket], 'waited': round(now - ticket.enqueued_at, 1)}
+
+    # ============================================================================
+    # MATCHING
+    # ============================================================================
+
+    def _take(self, bucket, count, now):
+        """Up to `count` live tickets from the front of a bucket"""
+        queue = self.buckets[bucket]
+        taken = []
+        while queue and len(taken) < count:
+            ticket = queue.popleft()
+            if ticket.cancelled:
+                continue
+            if now - ticket.last_seen > ABANDON_AFTER:
+                self._drop(ticket)
+                self.counts['abandoned'] += 1
+                continue
+            taken.append(ticket)
+        self.waiting[bucket] -= len(taken)
+        return taken
+
+    def _open_table(self, bucket, seats, now):
+        """Seat up to `seats` tickets of a bucket at a new room (caller holds the lock)"""
+        tickets = self._take(bucket, seats, now)
+        if len(tickets) < game_logic.MIN_MATCH_PLAYERS:
+            # Only abandoned tickets ahead of these: put them back in front
+            self.buckets[bucket].extendleft(reversed(tickets))
+            self.waiting[bucket] += len(tickets)
+            return None
+
+        room_id = f'm-{secrets.token_hex(5)}'
+        seats_taken, bidding_mode = len(tickets), bucket[1]
+        self.rooms.directory.reserve(room_id, {'seats': seats_taken, 'bidding_mode': bidding_mode,
+                                               'at': time.time()})
+        for ticket in tickets:
+            ticket.room_id = room_id
+            ticket.matched_at = now
+            self.match_times.append(now - ticket.enqueued_at)
+        self.counts['matched'] += len(tickets)
+        self.counts['rooms'] += 1
+        if seats_taken < seats:
+            self.counts['short_tables'] += 1
+        self.changed.notify_all()
+        print(f'🤝 Matched {seats_taken} player(s) into room {room_id} ({bidding_mode} bidding, '
+              f'longest wait {now - tickets[0].enqueued_at:.1f}s)')
+        return room_id
+
+    def match(self):
+        """
+        Start a table for every bucket whose oldest ticket has waited
+        FILL_TARGET seconds, and forget old tickets and reservations
+        """
+        now = time.monotonic()
+        with self.lock:
+            for bucket, queue in self.buckets.items():
+                while queue and queue[0].cancelled:
+                    queue.popleft()
+                if queue and now - queue[0].enqueued_at >= self.fill_target:
+                    self._open_table(bucket, bucket[0], now)
+            for bucket in [bucket for bucket, queue in self.buckets.items() if not queue]:
+                del self.buckets[bucket]
+                del self.waiting[bucket]
+            for ticket in [t for t in self.tickets.values() if t.matched_at and now - t.matched_at > TICKET_TTL]:
+                del self.tickets[ticket.ticket_id]
+
+        # Reserved rooms nobody ever connected to
+        cutoff = time.time() - TICKET_TTL
+        reservations = self.rooms.directory.reservations
+        for room_id, table in list(reservations.items()):
+            if table['at'] < cutoff:
+                reservations.pop(room_id, None)
+
+    def start(self):
+        """Match every MATCH_INTERVAL seconds on the shared scheduler (once started, later calls do nothing)"""
+        with self.lock:
+            if self.running:
+                return
+            self.running = True
+
+        def run():
+            try:
+                self.match()
+            except Exception as e:
+                print(f'❌ Matchmaking failed: {e}')
+            self.sweeps += 1
+            scheduler.call_later(MATCH_INTERVAL, run)
+        scheduler.call_later(MATCH_INTERVAL, run)
+        print('🤝 Matchmaking queue running on this worker')
+
+    def stats(self):
+        """Queue depth per bucket and recent time-to-match (seconds)"""
+        now = time.monotonic()
+        with self.lock:
+            oldest = [
+                now - queue[0].enqueued_at for queue in self.buckets.values()
+                if queue and not queue[0].cancelled
+            ]
+            times = list(self.match_times)
+            return dict(
+                self.counts,
+                waiting=sum(self.waiting.values()),
+                buckets={f'{seats}/{mode}': count for (seats, mode), count in self.waiting.items() if count},
+                longest_wait=round(max(oldest), 1) if oldest else 0,
+                time_to_match={'p50': percentile(times, 0.5), 'p90': percentile(times, 0.9),
+                               'max': max(times) if times else None}
+            )
+
+
+def register_matchmaking(app, matchmaker, queue_redirect):
+    """
+    Add the matchmaking routes.
+
+    Args:
+        matchmaker: This worker's Matchmaker
+        queue_redirect: Callable() returning a redirect to the worker that
+            runs the queue, or None if it is this one
+    """
+    def serve_here():
+        """None if this worker runs the queue (its sweep started), else the redirect"""
+        redirect = queue_redirect()
+        if redirect is None:
+            matchmaker.start()
+        return redirect
+
+    @app.route('/api/matchmaking', methods=['GET', 'POST'])
+    def matchmaking():
+        """Join the queue (POST), or see how it's doing (GET)"""
+        redirect = serve_here()
+        if redirect is not None:
+            return redirect
+        if request.method == 'GET':
+            return jsonify(matchmaker.stats())
+
+        prefs = request.get_json(silent=True) or {}
+        try:
+            ticket_id = matchmaker.enqueue(int(prefs.get('seats', DEFAULT_SEATS)),
+                                           prefs.get('bidding_mode', game_logic.DEFAULT_BIDDING_MODE))
+        except (TypeError, ValueError) as e:
+            return jsonify(error=str(e)), 400
+        return jsonify(ticket=ticket_id, **matchmaker.status(ticket_id)), 201
+
+    @app.route('/api/matchmaking/<ticket_id>', methods=['GET', 'DELETE'])
+    def matchmaking_ticket(ticket_id):
+        """A ticket's status (long-poll with ?wait=<seconds>), or leave the queue"""
+        redirect = serve_here()
+        if redirect is not None:
+            return redirect
+        if request.method == 'DELETE':
+            if not matchmaker.cancel(ticket_id):
+                abort(404)
+            return jsonify(status='cancelled')
+
+        wait = min(max(request.args.get('wait', 0, type=float), 0), MAX_WAIT)
+        status = matchmaker.status(ticket_id, wait)
+        if status is None:
+            abort(404)
+        return jsonify(ticket=ticket_id, **status)
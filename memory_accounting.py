@@ -0,0 +1,281 @@
+"""
+Opt-in memory accounting and leak detection for Hollywood Moguls
+
+With MEMORY_ACCOUNTING=1 a worker starts tracemalloc and, every
+SAMPLE_INTERVAL seconds, records:
+
+    per room     bytes retained by each room's GameState, split by subsystem
+                 (players, talent pool, card store, awards, ...). Found by
+                 walking the objects each subsystem reaches; an object
+                 shared between subsystems (interned cards) counts once, in
+                 the first one that reaches it.
+    per module   live allocations traced by tracemalloc, grouped by the
+                 source file that made them (engine, game_logic, ...)
+
+The last HISTORY samples are kept, so /admin/memory shows bytes per room
+over time. Allocations no live room accounts for are watched for steady
+growth, which points at leaks outside the rooms (caches, sockets, ...).
+
+The soak CLI plays game after game on a single GameState, reset() between
+games, and flags anything that keeps growing from one game to the next:
+the reset state itself, or traced allocations, with the source lines that
+grew the most.
+
+Usage:
+    python memory_accounting.py --games 50 --players 6
+"""
+import argparse
+import contextlib
+import os
+import sys
+import time
+import tracemalloc
+import types
+from collections import deque
+
+from scheduler import scheduler
+
+SAMPLE_INTERVAL = 60
+HISTORY = 120
+
+# Stack frames kept per traced allocation
+TRACE_FRAMES = 1
+
+# Growth is flagged when a measurement rose at every one of the last
+# GROWTH_WINDOW points and by more than MIN_GROWTH bytes overall
+GROWTH_WINDOW = 5
+MIN_GROWTH = 64 * 1024
+
+# GameState attributes by subsystem, in the order they're measured
+SUBSYSTEMS = {
+    'cards': ['cards'],
+    'players': ['players', 'sessions', 'player_names', 'player_sids', 'sid_players'],
+    'talent_pool': ['talent_pool', 'talent_name_counts', 'selected_roles_this_phase', 'no_name_talent'],
+    'turn': ['current_turn_cards', 'player_selections', 'bidding_war', 'naming_progress'],
+    'releases': ['release_results', 'bid_log', 'collection_versions'],
+    'awards': ['awards', 'tallies'],
+    'sync': ['snapshot', 'snapshots', 'barriers'],
+}
+
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Never walked into: they belong to the program, not to a game
+OPAQUE_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+                types.MethodType, types.CodeType)
+
+
+def retained_size(obj, seen):
+    """Bytes of `obj` and everything it reaches that isn't in `seen` yet"""
+    total = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, OPAQUE_TYPES):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            stack.extend(obj)
+        else:
+            if hasattr(obj, '__dict__'):
+                stack.append(vars(obj))
+            for slot in getattr(type(obj), '__slots__', ()):
+                if hasattr(obj, slot):
+                    stack.append(getattr(obj, slot))
+    return total
+
+
+def state_memory(game_state):
+    """{subsystem: bytes} retained by a GameState, plus 'total'"""
+    seen = set()
+    usage = {}
+    attributes = dict(vars(game_state))
+    for subsystem, names in SUBSYSTEMS.items():
+        usage[subsystem] = sum(retained_size(attributes.pop(name), seen)
+                               for name in names if name in attributes)
+    usage['other'] = sum(retained_size(value, seen) for value in attributes.values())
+    usage['total'] = sum(usage.values())
+    return usage
+
+
+def take_snapshot():
+    """A tracemalloc snapshot without tracemalloc's own bookkeeping"""
+    return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+
+
+def module_memory(snapshot):
+    """{module: bytes} of traced allocations, by the source file that made them"""
+    usage = {}
+    for stat in snapshot.statistics('filename'):
+        filename = stat.traceback[0].filename
+        if filename.startswith(SOURCE_DIR):
+            module = os.path.splitext(os.path.relpath(filename, SOURCE_DIR))[0]
+        else:
+            module = '(libraries)'
+        usage[module] = usage.get(module, 0) + stat.size
+    return dict(sorted(usage.items(), key=lambda item: -item[1]))
+
+
+class GrowthDetector:
+    """Flags measurements that keep growing, point after point"""
+
+    def __init__(self, window=GROWTH_WINDOW, min_growth=MIN_GROWTH):
+        self.window = window
+        self.min_growth = min_growth
+        self.points = {}   # {key: deque of values}
+
+    def record(self, key, value):
+        points = self.points.setdefault(key, deque(maxlen=self.window + 1))
+        points.append(value)
+
+    def growing(self):
+        """{key: bytes grown over the window} for everything growing steadily"""
+        flagged = {}
+        for key, points in self.points.items():
+            if len(points) <= self.window:
+                continue
+            values = list(points)
+            if all(b > a for a, b in zip(values, values[1:])) and values[-1] - values[0] > self.min_growth:
+                flagged[key] = values[-1] - values[0]
+        return flagged
+
+
+class MemoryAccountant:
+    """Samples a RoomRegistry's memory by room and by module"""
+
+    def __init__(self, rooms):
+        self.rooms = rooms
+        self.history = deque(maxlen=HISTORY)
+        self.growth = GrowthDetector()
+
+    def start(self):
+        """Start tracemalloc and sample every SAMPLE_INTERVAL seconds"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+        print(f'🧮 Memory accounting on (sampling every {SAMPLE_INTERVAL}s)')
+
+        def run():
+            try:
+                self.sample()
+            except Exception as e:
+                print(f'❌ Memory sample failed: {e}')
+            scheduler.call_later(SAMPLE_INTERVAL, run)
+        scheduler.call_later(SAMPLE_INTERVAL, run)
+
+    def sample(self):
+        rooms = {}
+        for room in list(self.rooms.rooms.values()):
+            with room.engine.lock:
+                rooms[room.room_id] = state_memory(room.game_state)
+        traced, peak = tracemalloc.get_traced_memory()
+        in_rooms = sum(usage['total'] for usage in rooms.values())
+        sample = {
+            'at': time.time(),
+            'traced': traced,
+            'peak': peak,
+            'in_rooms': in_rooms,
+            'modules': module_memory(take_snapshot()),
+            'rooms': rooms
+        }
+        self.history.append(sample)
+        self.growth.record('unattributed', traced - in_rooms)
+        return sample
+
+    def report(self):
+        """Latest sample, bytes per room over time, and steadily growing memory"""
+        latest = self.history[-1] if self.history else self.sample()
+        series = {}
+        for sample in self.history:
+            for room_id, usage in sample['rooms'].items():
+                series.setdefault(room_id, []).append([round(sample['at']), usage['total']])
+        return {
+            'worker': self.rooms.worker_index,
+            'latest': latest,
+            'rooms_over_time': series,
+            'growing': self.growth.growing()
+        }
+
+
+# ============================================================================
+# SOAK TEST
+# ============================================================================
+
+def soak(games, players, strategies, bidding_mode, top=10):
+    """
+    Play `games` games on one GameState and report memory after each reset()
+
+    Returns:
+        Dict of per-game measurements and whatever grew steadily
+    """
+    import game_logic
+    import tournament
+
+    tracemalloc.start(TRACE_FRAMES)
+    game_state = game_logic.GameState()
+    growth = GrowthDetector()
+    first = None
+    measurements = []
+
+    for game in range(games):
+        lineup = [strategies[(game + seat) % len(strategies)] for seat in range(players)]
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            tournament.play_game(lineup, game, bidding_mode, game_state=game_state)
+            game_state.reset()
+
+        usage = state_memory(game_state)
+        traced, _ = tracemalloc.get_traced_memory()
+        snapshot = take_snapshot()
+        if first is None:
+            first = snapshot
+        growth.record('reset_state', usage['total'])
+        growth.record('traced', traced)
+        measurements.append({'game': game + 1, 'reset_state': usage['total'], 'traced': traced})
+        print(f"  game {game + 1:>4}  reset state {usage['total'] / 1024:8.1f} KB   "
+              f"traced {traced / 1024:10.1f} KB")
+
+    grown_lines = [
+        (str(stat.traceback[0]), stat.size_diff)
+        for stat in snapshot.compare_to(first, 'lineno')[:top]
+        if stat.size_diff > 0
+    ]
+    tracemalloc.stop()
+    return {'games': measurements, 'growing': growth.growing(), 'grown_lines': grown_lines}
+
+
+def main():
+    import game_logic
+    from bots import STRATEGIES
+
+    parser = argparse.ArgumentParser(description='Soak-test game memory across reset() for leaks')
+    parser.add_argument('--games', type=int, default=30)
+    parser.add_argument('--players', type=int, default=4)
+    parser.add_argument('--strategies', default=','.join(STRATEGIES),
+                        help=f'comma-separated, from: {", ".join(STRATEGIES)}')
+    parser.add_argument('--bidding-mode', choices=game_logic.BIDDING_MODES, default=game_logic.DEFAULT_BIDDING_MODE)
+    parser.add_argument('--top', type=int, default=10, help='source lines to show that grew the most')
+    args = parser.parse_args()
+
+    print("\n" + "="*50)
+    print(f"🧮 MEMORY SOAK: {args.games} games, {args.players} players")
+    print("="*50)
+    result = soak(args.games, args.players, args.strategies.split(','), args.bidding_mode, args.top)
+
+    print("\nGrew the most since the first game:")
+    for line, size_diff in result['grown_lines']:
+        print(f"  {size_diff / 1024:+10.1f} KB  {line}")
+
+    print("="*50)
+    if result['growing']:
+        print("❌ STEADY GROWTH ACROSS GAMES")
+        for key, grown in result['growing'].items():
+            print(f"  {key}: +{grown / 1024:.1f} KB over the last {GROWTH_WINDOW} games")
+        return 1
+    print("✓ No steady growth across games")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""
+Live room migration between worker processes
+
+A room can be moved to another worker without ending its game:
+
+1. Freeze: under the engine lock the engine stops (pending timers become
+   no-ops and socket events are refused).
+2. Serialize: the whole GameState (bidding wars, ready barriers and their
+   deadlines, update log, ...) is pickled and signed with SECRET_KEY.
+3. Hand off: the payload is POSTed to the target worker's own port, which
+   adopts the room and re-arms its timers from the state.
+4. Redirect: the room directory now points at the target, and the room's
+   sockets are told 'room_moved' so they reconnect there and resume with
+   their tokens, replaying only the updates they missed.
+
+If the hand-off fails the room is thawed where it was. On top of this, each
+worker's rebalancer moves rooms off it when its event loop lags or it hosts
+far more rooms than its peers, and drain() empties a worker before a restart
+(server.py does a rolling restart of every worker on SIGHUP).
+"""
+import hashlib
+import hmac
+import json
+import time
+import urllib.request
+
+from flask import abort, jsonify, request
+
+from rooms import audience_room, snapshot_room
+
+SIGNATURE_HEADER = 'X-Moguls-Signature'
+
+# Seconds between load reports (and rebalancing decisions)
+REBALANCE_INTERVAL = 5.0
+
+# Event-loop lag, in seconds, above which a worker sheds a room
+LAG_THRESHOLD = 0.25
+
+# A worker sheds a room when it hosts more than this many times the average
+ROOM_IMBALANCE = 1.5
+
+# Load reports older than this are from a dead or restarting worker
+STALE_REPORT = 3 * REBALANCE_INTERVAL
+
+HANDOFF_TIMEOUT = 10
+
+
+def sign(body, secret):
+    return hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+
+
+def verify(body, signature, secret):
+    return bool(signature) and hmac.compare_digest(sign(body, secret), signature)
+
+
+def internal_host(host):
+    """Address to reach a sibling worker bound to `host`"""
+    if host in ('', '0.0.0.0'):
+        return '127.0.0.1'
+    if host == '::':
+        return '[::1]'
+    return f'[{host}]' if ':' in host else host
+
+
+class Migrator:
+    """Moves this worker's rooms to other workers"""
+
+    def __init__(self, rooms, socketio, config):
+        self.rooms = rooms
+        self.socketio = socketio
+        self.config = config
+        self.moved_out = 0
+        self.moved_in = 0
+
+    def worker_url(self, worker_index, path):
+        host = internal_host(self.config['HOST'])
+        return f'http://{host}:{self.config["WORKER_PORT_BASE"] + worker_index}{path}'
+
+    def post(self, worker_index, path, body):
+        """Signed POST to a sibling worker; returns its JSON reply"""
+        req = urllib.request.Request(
+            self.worker_url(worker_index, path), data=body, method='POST',
+            headers={SIGNATURE_HEADER: sign(body, self.config['SECRET_KEY']),
+                     'Content-Type': 'application/octet-stream'}
+        )
+        with urllib.request.urlopen(req, timeout=HANDOFF_TIMEOUT) as response:
+            return json.loads(response.read())
+
+    # ============================================================================
+    # MOVING ROOMS
+    # ============================================================================
+
+    def migrate(self, room_id, target):
+        """
+        Move a room to worker `target`. Returns True once the room is hosted
+        there and its sockets have been redirected.
+        """
+        room = self.rooms.get(room_id)
+        if room is None or target == self.rooms.worker_index:
+            return False
+
+        started = time.perf_counter()
+        with room.engine.lock:
+            if room.engine.frozen:
+                return False  # Already on its way somewhere
+            room.engine.freeze()
+            payload = snapshot_room(room)
+
+        try:
+            self.post(target, '/internal/rooms', payload)
+        except (OSError, ValueError) as e:
+            print(f'❌ Moving room {room_id} to worker {target} failed, keeping it here: {e}')
+            with room.engine.lock:
+                room.engine.thaw()
+            return False
+
+        self.rooms.directory.assign(room_id, target)
+        self.rooms.remove(room_id)
+        port = self.config['WORKER_PORT_BASE'] + target
+        # Players and the audience (a Socket.IO room of its own) all follow it
+        for sockets in (room_id, audience_room(room_id)):
+            self.socketio.emit('room_moved', {'room': room_id, 'port': port}, to=sockets)
+            self.socketio.close_room(sockets)
+        self.moved_out += 1
+        print(f'🚚 Room {room_id} moved to worker {target} '
+              f'({len(payload) / 1024:.1f} KB, frozen {(time.perf_counter() - started) * 1000:.0f}ms)')
+        return True
+
+    def adopt(self, payload):
+        """Host a room serialized by another worker's migrate()"""
+        with self.rooms.lock:
+            room = self.rooms.adopt(payload)
+        self.moved_in += 1
+        return room
+
+    def drain(self):
+        """Move every room to other workers (e.g. before a restart)"""
+        self.rooms.directory.draining[self.rooms.worker_index] = True
+        moved = 0
+        with self.rooms.lock:
+            hosted = list(self.rooms.rooms)
+        for room_id in hosted:
+            target = self.least_loaded()
+            if target is not None and self.migrate(room_id, target):
+                moved += 1
+        print(f'🚰 Worker {self.rooms.worker_index} drained: {moved} room(s) moved, '
+              f'{len(self.rooms.rooms)} left')
+        return moved
+
+    # ============================================================================
+    # REBALANCING
+    # ============================================================================
+
+    def report_load(self, lag):
+        self.rooms.directory.loads[self.rooms.worker_index] = {
+            'rooms': len(self.rooms.rooms),
+            'sockets': len(self.rooms.sid_rooms),
+            'lag': lag,
+            'at': time.time()
+        }
+
+    def live_loads(self):
+        """Fresh load reports of the other workers that accept rooms"""
+        directory = self.rooms.directory
+        now = time.time()
+        return {
+            index: load for index, load in directory.loads.items()
+            if index != self.rooms.worker_index and index not in directory.draining
+            and now - load['at'] < STALE_REPORT
+        }
+
+    def least_loaded(self):
+        loads = self.live_loads()
+        if not loads:
+            return None
+        return min(loads, key=lambda index: (loads[index]['lag'] > LAG_THRESHOLD, loads[index]['rooms']))
+
+    def rebalance(self, lag):
+        """Shed one room if this worker lags or hosts far more rooms than average"""
+        loads = self.live_loads()
+        # Sockets connect and rooms come and go on other threads: work from a copy
+        with self.rooms.lock:
+            hosted = list(self.rooms.rooms)
+            socket_rooms = list(self.rooms.sid_rooms.values())
+        if not loads or not hosted or self.rooms.worker_index in self.rooms.directory.draining:
+            return
+        ours = len(hosted)
+        average = (ours + sum(load['rooms'] for load in loads.values())) / (len(loads) + 1)
+        target = self.least_loaded()
+
+        lagging = lag > LAG_THRESHOLD and loads[target]['lag'] <= LAG_THRESHOLD
+        crowded = ours > ROOM_IMBALANCE * average and loads[target]['rooms'] + 1 < ours
+        if not (lagging or crowded):
+            return
+
+        # The room with the fewest connected sockets is the cheapest to move
+        sockets = {}
+        for room_id in socket_rooms:
+            sockets[room_id] = sockets.get(room_id, 0) + 1
+        room_id = min(hosted, key=lambda rid: sockets.get(rid, 0))
+        reason = f'event-loop lag {lag * 1000:.0f}ms' if lagging else f'{ours} rooms vs {average:.1f} average'
+        print(f'⚖️ Rebalancing ({reason}): moving room {room_id} to worker {target}')
+        self.migrate(room_id, target)
+
+    def run_rebalancer(self):
+        """Background task: measure event-loop lag, report load and rebalance"""
+        while True:
+            started = time.monotonic()
+            self.socketio.sleep(REBALANCE_INTERVAL)
+            lag = max(0.0, time.monotonic() - started - REBALANCE_INTERVAL)
+            try:
+                self.report_load(lag)
+                self.rebalance(lag)
+            except Exception as e:
+                print(f'❌ Rebalancer error: {e}')
+
+    def start(self):
+        """Announce this worker as accepting rooms and start rebalancing"""
+        self.rooms.directory.draining.pop(self.rooms.worker_index, None)
+        self.report_load(0.0)
+        self.socketio.start_background_task(self.run_rebalancer)
+
+
+def register_internal(app, migrator):
+    """
+    Add the worker-to-worker routes. Every request must be signed with the
+    shared SECRET_KEY, so only sibling workers (and server.py) can call them.
+    """
+    def signed_body():
+        body = request.get_data()
+        if not verify(body, request.headers.get(SIGNATURE_HEADER), migrator.config['SECRET_KEY']):
+            abort(403)
+        return body
+
+    @app.route('/internal/rooms', methods=['POST'])
+    def internal_adopt_room():
+        """Take over a room frozen and serialized by another worker"""
+        room = migrator.adopt(signed_body())
+        return jsonify(room=room.room_id, worker=migrator.rooms.worker_index)
+
+    @app.route('/internal/rooms/<room_id>/migrate', methods=['POST'])
+    def internal_migrate_room(room_id):
+        """Move one of this worker's rooms (body: {"to": worker index})"""
+        target = json.loads(signed_body() or b'{}').get('to')
+        if not isinstance(target, int) or not 0 <= target < migrator.rooms.workers:
+            abort(400)
+        return jsonify(moved=migrator.migrate(room_id, target))
+
+    @app.route('/internal/drain', methods=['POST'])
+    def internal_drain():
+        """Move every room off this worker"""
+        signed_body()
+        moved = migrator.drain()
+        return jsonify(moved=moved, left=len(migrator.rooms.rooms))
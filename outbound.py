@@ -0,0 +1,235 @@
+"""
+Outbound backpressure for Hollywood Moguls: conflated game updates
+
+Only a client's newest game state matters, so a connection that can't keep
+up shouldn't have every version queued for it. Clients acknowledge each
+game_update they apply (update_ack). Once a connection's unacknowledged
+updates add up to OUTBOUND_BUDGET bytes, room broadcasts skip it and it
+holds just the newest snapshot, sent as soon as acks free its budget.
+Stale versions are conflated away, so a slow phone costs the server one
+pending snapshot at most (the same immutable one every other held-back
+connection in the room points at), and never delays writes to the rest.
+
+A connection whose acks keep arriving more than SLOW_ACK seconds late is
+moved to snapshot-only mode: at most one update every SLOW_INTERVAL
+seconds, always the newest. RECOVER_ACKS prompt acks in a row bring it
+back to live updates. Updates unacknowledged after ACK_TIMEOUT count as
+lost, so a dropped ack can't stall a connection for good.
+"""
+import threading
+import time
+from collections import Counter
+
+from scheduler import scheduler
+
+# Bytes of unacknowledged game updates a connection may have in flight
+OUTBOUND_BUDGET = 256 * 1024
+
+# Seconds after which an unacknowledged update counts as lost
+ACK_TIMEOUT = 10
+
+# Acks slower than this (seconds), SLOW_STRIKES times in a row, put a
+# connection in snapshot-only mode; RECOVER_ACKS faster ones take it out
+SLOW_ACK = 1.5
+SLOW_STRIKES = 3
+RECOVER_ACKS = 10
+
+# Seconds between updates to a connection in snapshot-only mode
+SLOW_INTERVAL = 2.0
+
+# Seconds between checks for held updates that can go out
+PUMP_INTERVAL = 0.5
+
+
+class Connection:
+    """One socket's unacknowledged updates and the newest one held back"""
+
+    def __init__(self, sid, room_id, codec):
+        self.sid = sid
+        self.room_id = room_id
+        self.codec = codec        # How its game updates are encoded (see wire.py)
+        self.in_flight = {}       # {version: (sent_at, bytes)}
+        self.pending = None       # Newest snapshot not sent yet
+        self.pending_size = 0
+        self.slow = False
+        self.strikes = 0          # Slow acks in a row
+        self.prompt = 0           # Prompt acks in a row
+        self.last_sent = 0.0
+
+    def can_send(self, size, now):
+        if self.slow and now - self.last_sent < SLOW_INTERVAL:
+            return False
+        # A single update bigger than the budget still goes out on its own
+        return not self.in_flight or sum(b for _, b in self.in_flight.values()) + size <= OUTBOUND_BUDGET
+
+    def sent(self, version, size, now):
+        self.in_flight[version] = (now, size)
+        self.pending = None
+        self.last_sent = now
+
+
+class Outbox:
+    """Per-connection outbound state for a worker's game_update broadcasts"""
+
+    def __init__(self):
+        self.connections = {}   # {sid: Connection}
+        self.rooms = {}         # {room_id: {sid, ...}}
+        self.send = None        # send(sid, snapshot), set by start()
+        self.pumping = False
+        self.counts = Counter()  # {'sent', 'held', 'conflated', 'slowed', 'recovered'}
+        self.lock = threading.Lock()
+
+    def add(self, sid, room_id, codec):
+        with self.lock:
+            self.connections[sid] = Connection(sid, room_id, codec)
+            self.rooms.setdefault(room_id, set()).add(sid)
+
+    def drop(self, sid):
+        with self.lock:
+            connection = self.connections.pop(sid, None)
+            if connection is not None:
+                members = self.rooms.get(connection.room_id)
+                members.discard(sid)
+                if not members:
+                    del self.rooms[connection.room_id]
+
+    def codec(self, sid):
+        connection = self.connections.get(sid)
+        return connection.codec if connection is not None else None
+
+    def codecs(self, room_id):
+        """Codecs the room's connections use"""
+        with self.lock:
+            return {self.connections[sid].codec for sid in self.rooms.get(room_id, ())}
+
+    def route(self, room_id, snapshot, size):
+        """
+        Account a room broadcast of `snapshot` (size(codec) bytes encoded)
+        to each of the room's connections, or hold it for the ones that are
+        over budget or in snapshot-only mode.
+
+        Returns:
+            List of sids the broadcast must skip
+        """
+        now = time.monotonic()
+        version = snapshot['version']
+        skip = []
+        with self.lock:
+            for sid in self.rooms.get(room_id, ()):
+                connection = self.connections[sid]
+                self._expire(connection, now)
+                encoded = size(connection.codec)
+                if connection.can_send(encoded, now):
+                    connection.sent(version, encoded, now)
+                    self.counts['sent'] += 1
+                    continue
+                if connection.pending is not None:
+                    self.counts['conflated'] += 1
+                else:
+                    self.counts['held'] += 1
+                connection.pending, connection.pending_size = snapshot, encoded
+                skip.append(sid)
+            if skip:
+                self._start_pump()
+        return skip
+
+    def sent(self, sid, snapshot, size):
+        """Account an update emitted straight to one socket"""
+        with self.lock:
+            connection = self.connections.get(sid)
+            if connection is not None:
+                connection.sent(snapshot['version'], size, time.monotonic())
+
+    def ack(self, sid, version):
+        """
+        The client applied `version`. Returns the held snapshot if it can
+        go out now (the caller sends it), else None.
+        """
+        now = time.monotonic()
+        with self.lock:
+            connection = self.connections.get(sid)
+            if connection is None or not isinstance(version, int):
+                return None
+            sent = connection.in_flight.get(version)
+            for acked in [v for v in connection.in_flight if v <= version]:
+                del connection.in_flight[acked]
+            if sent is not None:
+                self._measure(connection, now - sent[0])
+            return self._release(connection, now)
+
+    def _expire(self, connection, now):
+        """Forget updates whose ack is overdue (each one counts as a slow ack)"""
+        for version, (sent_at, _) in list(connection.in_flight.items()):
+            if now - sent_at > ACK_TIMEOUT:
+                del connection.in_flight[version]
+                self._measure(connection, now - sent_at)
+
+    def _measure(self, connection, latency):
+        if latency > SLOW_ACK:
+            connection.strikes += 1
+            connection.prompt = 0
+        else:
+            connection.prompt += 1
+            connection.strikes = 0
+        if not connection.slow and connection.strikes >= SLOW_STRIKES:
+            connection.slow = True
+            self.counts['slowed'] += 1
+            print(f'🐢 Socket {connection.sid} is slow (acks take {latency:.1f}s), '
+                  f'sending it snapshots every {SLOW_INTERVAL}s')
+        elif connection.slow and connection.prompt >= RECOVER_ACKS:
+            connection.slow = False
+            self.counts['recovered'] += 1
+            print(f'🐇 Socket {connection.sid} caught up, back to live updates')
+
+    def _release(self, connection, now):
+        """The held snapshot, marked sent, if the connection can take it now"""
+        self._expire(connection, now)
+        if connection.pending is None or not connection.can_send(connection.pending_size, now):
+            return None
+        snapshot = connection.pending
+        connection.sent(snapshot['version'], connection.pending_size, now)
+        self.counts['sent'] += 1
+        return snapshot
+
+    # ============================================================================
+    # HELD UPDATES
+    # ============================================================================
+
+    def start(self, send):
+        """Deliver held snapshots through send(sid, snapshot) as connections free up"""
+        self.send = send
+
+    def _start_pump(self):
+        if not self.pumping and self.send is not None:
+            self.pumping = True
+            scheduler.call_later(PUMP_INTERVAL, self.pump)
+
+    def pump(self):
+        """Send every held snapshot that can go out now (runs on the scheduler)"""
+        now = time.monotonic()
+        due = []
+        with self.lock:
+            holding = False
+            for connection in self.connections.values():
+                snapshot = self._release(connection, now)
+                if snapshot is not None:
+                    due.append((connection.sid, snapshot))
+                holding = holding or connection.pending is not None
+            if holding:
+                scheduler.call_later(PUMP_INTERVAL, self.pump)
+            else:
+                self.pumping = False
+        for sid, snapshot in due:
+            try:
+                self.send(sid, snapshot)
+            except Exception as e:
+                print(f'❌ Sending a held update failed: {e}')
+
+    def stats(self):
+        with self.lock:
+            return dict(
+                self.counts,
+                connections=len(self.connections),
+                slow=sum(c.slow for c in self.connections.values()),
+                holding=sum(c.pending is not None for c in self.connections.values())
+            )
@@ -0,0 +1,202 @@
+"""
+Film package optimizer for Hollywood Moguls
+
+Suggests how to split a player's purchased roles into films during packaging.
+Every film gets at least one purchased role; missing role types are filled
+with no-name talent, exactly like greenlight_film allows. Films are scored with
+calculate_film_stats, so suggestions always match what greenlighting produces.
+
+The search enumerates partitions of the roles, memoizing per-film stats and
+skipping partial partitions equivalent to one already expanded, and stops at a
+latency budget, returning the best partitions found so far.
+"""
+import heapq
+import threading
+import time
+from collections import OrderedDict
+
+import game_logic
+
+ROLE_TYPES = ['producer', 'screenwriter', 'director', 'star']
+
+# Default latency budget for one optimization, in milliseconds
+DEFAULT_BUDGET_MS = 50
+
+# Number of recent results kept (keyed by the roles they were computed for);
+# searches cut short by the budget aren't kept, so a retry can do better
+CACHE_SIZE = 256
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()   # Rooms search on their own threads
+
+
+def roles_version(roles, no_name_talent):
+    """Hashable signature of everything a suggestion depends on"""
+    def card_key(r):
+        return (r['name'], r['role'], r['heat'], r['prestige'], r.get('genre'), r.get('audience'))
+    return (
+        tuple(card_key(r) for r in roles),
+        tuple(card_key(r) for r in no_name_talent.values())
+    )
+
+
+def suggest_packages(roles, no_name_talent, objective='heat', top_k=3, budget_ms=DEFAULT_BUDGET_MS):
+    """
+    Find the best ways to package `roles` into films.
+
+    Args:
+        roles: The player's purchased roles
+        no_name_talent: Dict of no-name talent by role type
+        objective: 'heat' (total box-office heat first) or 'prestige'
+            (most prestigious single film first)
+        top_k: Number of partitions to return
+        budget_ms: Stop searching after this many milliseconds
+
+    Returns:
+        Dict with 'suggestions' (best first) and 'complete' (False if the
+        budget ran out before the search space was exhausted)
+    """
+    if objective not in ('heat', 'prestige'):
+        raise ValueError(f'Unknown objective: {objective}')
+
+    key = (roles_version(roles, no_name_talent), objective, top_k)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    result = PackageSearch(roles, no_name_talent, objective, top_k, budget_ms).run()
+
+    if result['complete']:
+        with _cache_lock:
+            _cache[key] = result
+            if len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+    return result
+
+
+class PackageSearch:
+    """Depth-first search over partitions of a player's roles"""
+
+    def __init__(self, roles, no_name_talent, objective, top_k, budget_ms):
+        self.roles = roles
+        self.objective = objective
+        self.top_k = top_k
+        self.deadline = time.perf_counter() + budget_ms / 1000
+
+        # No-name talent as greenlight_film indexes it: -1, -2, ...
+        self.no_name = {
+            talent['role']: (-(i + 1), talent)
+            for i, talent in enumerate(no_name_talent.values())
+        }
+
+        # Hottest roles first so good partitions are found early
+        self.order = sorted(range(len(roles)), key=lambda i: -roles[i]['heat'])
+
+        self.film_cache = {}     # {frozenset(role indices): film dict}
+        self.visited = set()     # (position, film states) already expanded
+        self.best = []           # min-heap of (score, seq, films)
+        self.seq = 0
+        self.nodes = 0
+        self.timed_out = False
+
+    def run(self):
+        if self.roles and self.no_name_complete():
+            self.search(0, [], [])
+
+        suggestions = [
+            {'score': list(score), 'films': films}
+            for score, _, films in sorted(self.best, reverse=True)
+        ]
+        return {
+            'objective': self.objective,
+            'suggestions': suggestions,
+            'complete': not self.timed_out
+        }
+
+    def no_name_complete(self):
+        return all(role_type in self.no_name for role_type in ROLE_TYPES)
+
+    def film(self, group):
+        """Stats for a film made of the given role indices plus no-name fillers"""
+        key = frozenset(group)
+        if key not in self.film_cache:
+            members = [self.roles[i] for i in sorted(group)]
+            indices = sorted(group)
+            present = {r['role'] for r in members}
+            for role_type in ROLE_TYPES:
+                if role_type not in present:
+                    index, talent = self.no_name[role_type]
+                    members.append(talent)
+                    indices.append(index)
+            stats = game_logic.calculate_film_stats(members)
+            self.film_cache[key] = {'role_indices': indices, **stats}
+        return self.film_cache[key]
+
+    def group_state(self, group):
+        """Everything about a partial film that affects its final stats"""
+        members = [self.roles[i] for i in sorted(group)]
+        genre = next((r['genre'] for r in members if r['role'] == 'producer'), None)
+        audience = next((r['audience'] for r in members if r['role'] == 'screenwriter'), None)
+        return (
+            sum(r['heat'] for r in members),
+            sum(r['prestige'] for r in members),
+            len(members),
+            tuple(sorted({r['role'] for r in members})),
+            genre or '',
+            audience or ''
+        )
+
+    def score(self, films):
+        total_heat = sum(f['heat'] for f in films)
+        best_prestige = max((f['prestige'] for f in films), default=0)
+        if self.objective == 'heat':
+            return (total_heat, best_prestige, len(films))
+        return (best_prestige, total_heat, len(films))
+
+    def record(self, groups):
+        films = [self.film(g) for g in groups]
+        if not films:
+            return
+
+        self.seq += 1
+        entry = (self.score(films), self.seq, films)
+        if len(self.best) < self.top_k:
+            heapq.heappush(self.best, entry)
+        elif entry[0] > self.best[0][0]:
+            heapq.heapreplace(self.best, entry)
+
+    def search(self, pos, groups, unused):
+        self.nodes += 1
+        if self.nodes % 256 == 0 and time.perf_counter() > self.deadline:
+            self.timed_out = True
+        if self.timed_out:
+            return
+
+        if pos == len(self.order):
+            self.record(groups)
+            return
+
+        # Films with the same totals, role types, genre and audience finish
+        # identically, so each combination only needs expanding once
+        state = (pos, tuple(sorted(self.group_state(g) for g in groups)))
+        if state in self.visited:
+            return
+        self.visited.add(state)
+
+        role_index = self.order[pos]
+
+        # Join an existing film, or start a new one
+        for group in groups:
+            group.append(role_index)
+            self.search(pos + 1, groups, unused)
+            group.pop()
+        groups.append([role_index])
+        self.search(pos + 1, groups, unused)
+        groups.pop()
+
+        # Leaving a role out never adds heat, but can protect a film's prestige
+        if self.objective == 'prestige':
+            unused.append(role_index)
+            self.search(pos + 1, groups, unused)
+            unused.pop()
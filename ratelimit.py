@@ -0,0 +1,215 @@
+"""
+Inbound rate limiting and backpressure for Hollywood Moguls
+
+Every socket gets a token bucket per event type, so one phone looping
+request_update (or anything else) only throttles itself. Each room also
+admits a bounded number of in-flight events: once that many are waiting on
+the room's engine lock, further events are shed, and repeats of idempotent
+events (request_update, heartbeat, ...) from a socket that already has one
+pending are merged into it rather than queued.
+
+Joining and resuming a seat are admitted worker-wide at a steady pace, so a
+venue-wide Wi-Fi drop that reconnects every phone at once is worked through
+in order instead of all at once; beyond what can wait, sockets are told to
+retry after a jittered delay.
+"""
+import random
+import threading
+import time
+from collections import Counter, deque
+
+from scheduler import scheduler
+
+# {event: (tokens per second, burst)}; anything not listed gets DEFAULT_LIMIT
+EVENT_LIMITS = {
+    'request_update': (1, 3),
+    'heartbeat': (0.5, 3),
+    'update_ack': (20, 40),
+    'submit_talent_name': (4, 8),
+    'submit_talent_names': (1, 3),
+    'submit_bid': (4, 8),
+    'raise_bid': (10, 20),
+    'select_card': (4, 8),
+    'suggest_packages': (1, 3),
+    'get_talent_pool': (20, 40),
+    'get_films': (20, 40),
+    'audience_vote': (2, 5),
+}
+DEFAULT_LIMIT = (5, 10)
+
+# Events whose answer doesn't depend on how many times they were sent
+MERGEABLE_EVENTS = {'request_update', 'heartbeat', 'suggest_packages'}
+
+# Events allowed to wait on a room's engine lock at once
+ROOM_QUEUE_SIZE = 64
+
+# Joins and resumes admitted per second by a worker (with this much burst),
+# and how many may queue for admission before sockets are told to retry
+ADMIT_RATE = 50
+ADMIT_BURST = 25
+ADMIT_QUEUE_SIZE = 500
+
+# Longest retry delay handed out to sockets that couldn't queue (seconds)
+MAX_RETRY_AFTER = 30
+
+# Reconnect backoff advertised to clients: first delay and cap (ms), and how
+# much of each delay is randomized so phones don't retry in lockstep
+RECONNECT_POLICY = {'delay': 1000, 'delay_max': 10000, 'randomization': 0.5}
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens a second, holding at most `burst`"""
+
+    __slots__ = ('rate', 'burst', 'tokens', 'updated')
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, now=None):
+        """Spend one token if there is one"""
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class RateLimiter:
+    """Token buckets per socket and event type, plus throttle counters"""
+
+    def __init__(self, limits=None, default=DEFAULT_LIMIT):
+        self.limits = dict(EVENT_LIMITS if limits is None else limits)
+        self.default = default
+        self.buckets = {}            # {sid: {event: TokenBucket}}
+        self.throttled = Counter()   # {event: events refused}
+        self.lock = threading.Lock()
+
+    def allow(self, sid, event):
+        """Should this socket's event be handled right now?"""
+        with self.lock:
+            buckets = self.buckets.setdefault(sid, {})
+            bucket = buckets.get(event)
+            if bucket is None:
+                bucket = buckets[event] = TokenBucket(*self.limits.get(event, self.default))
+            if bucket.take():
+                return True
+            self.throttled[event] += 1
+            if self.throttled[event] == 1 or self.throttled[event] % 100 == 0:
+                print(f'🚦 Throttled {event} ({self.throttled[event]} so far, latest from {sid})')
+            return False
+
+    def forget(self, sid):
+        """Drop a disconnected socket's buckets"""
+        with self.lock:
+            self.buckets.pop(sid, None)
+
+
+class InboundQueue:
+    """Bounded admission of inbound events for one room"""
+
+    def __init__(self, size=ROOM_QUEUE_SIZE):
+        self.size = size
+        self.pending = 0
+        self.pending_keys = set()    # {(sid, event)} for mergeable events in flight
+        self.shed = Counter()        # {event: dropped because the room was full}
+        self.merged = Counter()      # {event: folded into an identical pending event}
+        self.lock = threading.Lock()
+
+    def admit(self, sid, event):
+        """
+        Reserve a slot for an event. Returns a release callable, or None if
+        the event was shed or merged and should be dropped.
+        """
+        key = (sid, event) if event in MERGEABLE_EVENTS else None
+        with self.lock:
+            if key is not None and key in self.pending_keys:
+                self.merged[event] += 1
+                return None
+            if self.pending >= self.size:
+                self.shed[event] += 1
+                if self.shed[event] == 1 or self.shed[event] % 100 == 0:
+                    print(f'⚠️ Room inbound queue full, shed {event} ({self.shed[event]} so far)')
+                return None
+            self.pending += 1
+            if key is not None:
+                self.pending_keys.add(key)
+
+        def release():
+            with self.lock:
+                self.pending -= 1
+                self.pending_keys.discard(key)
+        return release
+
+
+class AdmissionQueue:
+    """Paces joins and resumes across a worker during reconnection storms"""
+
+    def __init__(self, rate=ADMIT_RATE, burst=ADMIT_BURST, size=ADMIT_QUEUE_SIZE):
+        self.rate = rate
+        self.size = size
+        self.bucket = TokenBucket(rate, burst)
+        self.waiting = deque()       # Callables queued for admission, oldest first
+        self.pumping = False
+        self.counts = Counter()      # {'immediate', 'queued', 'deferred'}
+        self.lock = threading.Lock()
+
+    def submit(self, job):
+        """
+        Run `job` now if the pace allows, else queue it behind the others.
+
+        Returns:
+            None once the job ran or is queued, or seconds the caller should
+            wait before trying again (the queue is full)
+        """
+        with self.lock:
+            if not self.waiting and self.bucket.take():
+                self.counts['immediate'] += 1
+                run_now = True
+            elif len(self.waiting) < self.size:
+                self.waiting.append(job)
+                self.counts['queued'] += 1
+                run_now = False
+                if not self.pumping:
+                    self.pumping = True
+                    scheduler.call_later(1 / self.rate, self.pump)
+            else:
+                self.counts['deferred'] += 1
+                # Long enough for the queue to drain, spread out at random
+                drain = len(self.waiting) / self.rate
+                return min(MAX_RETRY_AFTER, drain * random.uniform(1, 2))
+        if run_now:
+            job()
+        return None
+
+    def pump(self):
+        """Admit queued jobs as tokens allow (runs on the scheduler)"""
+        jobs = []
+        with self.lock:
+            while self.waiting and self.bucket.take():
+                jobs.append(self.waiting.popleft())
+            if self.waiting:
+                scheduler.call_later(1 / self.rate, self.pump)
+            else:
+                self.pumping = False
+        for job in jobs:
+            try:
+                job()
+            except Exception as e:
+                print(f'❌ Admitting a session failed: {e}')
+
+
+def stats(limiter, rooms, admission=None):
+    """Throttle, shed, merge and admission counters across a limiter and its rooms"""
+    shed, merged = Counter(), Counter()
+    for room in list(rooms.rooms.values()):
+        shed.update(room.inbound.shed)
+        merged.update(room.inbound.merged)
+    result = {'throttled': dict(limiter.throttled), 'shed': dict(shed), 'merged': dict(merged)}
+    if admission is not None:
+        result['admission'] = dict(admission.counts, waiting=len(admission.waiting))
+    return result
@@ -0,0 +1,290 @@
+"""
+Game rooms for Hollywood Moguls
+
+Each room is an independent game (its own GameState and GameEngine). Players
+pick a room with ?room=<id> in the page URL; without one they land in the
+default room. When several worker processes share the public port, every
+room belongs to exactly one worker: the one recorded in the RoomDirectory
+(rooms can move, see migration.py), or for a new room a stable hash of its
+ID, skipping workers that are draining.
+"""
+import pickle
+import re
+import secrets
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from archive import snapshot_game
+from engine import GameEngine
+from game_logic import GameState
+from ratelimit import InboundQueue
+from scheduler import scheduler
+from tracing import tracer
+
+DEFAULT_ROOM = 'main'
+
+ROOM_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,32}$')
+
+# Snapshot bytes of an empty room, and per player, talent card, film and
+# bid it holds (fitted on bot games), for estimating a room's size cheaply
+FOOTPRINT_BASE = 1800
+FOOTPRINT_PLAYER = 100
+FOOTPRINT_TALENT = 85
+FOOTPRINT_FILM = 280
+FOOTPRINT_BID = 70
+
+
+def valid_room_id(room_id):
+    return bool(room_id) and ROOM_ID_PATTERN.match(room_id) is not None
+
+
+def audience_room(room_id):
+    """Socket.IO room of a game room's audience members"""
+    return f'{room_id}:audience'
+
+
+def worker_for_room(room_id, workers):
+    """Index of the worker process that hosts `room_id`"""
+    return zlib.crc32(room_id.encode('utf-8')) % workers
+
+
+class RoomDirectory:
+    """
+    Which worker hosts each room, and which workers are draining or how
+    loaded they are. The mappings are plain dicts in a single process and
+    multiprocessing.Manager dicts shared by all workers under server.py.
+    """
+
+    def __init__(self, workers=1, assignments=None, draining=None, loads=None, reservations=None):
+        self.workers = workers
+        self.assignments = {} if assignments is None else assignments   # {room_id: worker index}
+        self.draining = {} if draining is None else draining            # {worker index: True}
+        self.loads = {} if loads is None else loads                      # {worker index: load report}
+        self.reservations = {} if reservations is None else reservations  # {room_id: matchmade table}
+
+    def owner_of(self, room_id):
+        owner = self.assignments.get(room_id)
+        if owner is not None:
+            return owner
+        owner = worker_for_room(room_id, self.workers)
+        for step in range(self.workers):
+            candidate = (owner + step) % self.workers
+            if candidate not in self.draining:
+                return candidate
+        return owner
+
+    def assign(self, room_id, worker_index):
+        self.assignments[room_id] = worker_index
+
+    def release(self, room_id):
+        self.assignments.pop(room_id, None)
+
+    def reserve(self, room_id, table):
+        """Set up `room_id` as a matchmade table when its worker creates it"""
+        self.reservations[room_id] = table
+
+    def claim(self, room_id):
+        """The matchmade table reserved for a new room, if any (only once)"""
+        return self.reservations.pop(room_id, None)
+
+
+def snapshot_room(room):
+    """
+    Pickle everything needed to rebuild a (frozen) room, on another worker
+    or from disk
+    """
+    return pickle.dumps({
+        'room_id': room.room_id,
+        'game_id': room.game_id,
+        'created_at': room.created_at,
+        'game_state': room.game_state
+    }, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class Room:
+    """One game: its state, its engine, its inbound queue and its lifecycle times"""
+
+    def __init__(self, room_id, on_change=None, archive=None, game_state=None, game_id=None, created_at=None):
+        self.room_id = room_id
+        self.game_id = game_id or f'{room_id}-{secrets.token_hex(6)}'
+        self.game_state = game_state or GameState()
+        self.engine = GameEngine(self.game_state, scheduler=scheduler, on_change=on_change,
+                                 on_game_complete=self.archive_game if archive else None, name=room_id)
+        self.archive = archive
+        self.inbound = InboundQueue()
+        self.updated = threading.Condition()
+        self.audience_key = None      # (phase, award category) last sent to the audience
+        self.tally_pending = False    # A vote count update is already scheduled
+        self.auction_pending = False  # A leading-bid update is already scheduled
+        self.broadcast_pending = False  # A batched game_update is already scheduled
+        self.created_at = created_at or time.time()
+        self.last_active = time.time()    # Last event or connection
+        self.finished_at = None           # When the sweep first saw it finished
+
+    def footprint(self):
+        """
+        Approximate size of the room's snapshot, from how much it holds.
+        Counting is cheap and needs no lock, so every room can be sized on
+        every sweep, however busy.
+        """
+        game_state = self.game_state
+        players = list(game_state.players.values())
+        films = sum(len(player.get('films', ())) for player in players)
+        return (FOOTPRINT_BASE + FOOTPRINT_PLAYER * len(players) + FOOTPRINT_TALENT * len(game_state.talent_pool)
+                + FOOTPRINT_FILM * films + FOOTPRINT_BID * len(game_state.bid_log))
+
+    def notify_update(self):
+        """Wake long-poll readers after a new state version was broadcast"""
+        with self.updated:
+            self.updated.notify_all()
+
+    def wait_for_update(self, version, timeout):
+        """Wait up to `timeout` seconds for the state to move past `version`"""
+        with self.updated:
+            return self.updated.wait_for(lambda: self.game_state.version > version, timeout)
+
+    def archive_game(self):
+        """Queue the finished game for the archive (written in the background)"""
+        self.archive.submit(snapshot_game(self.game_state, self.game_id, room_id=self.room_id))
+        print(f'🗄️ Game {self.game_id} queued for the archive')
+
+
+class RoomRegistry:
+    """The rooms hosted by this worker, and which room each socket is in"""
+
+    def __init__(self, worker_index=0, workers=1, on_change=None, archive=None, directory=None, store=None):
+        """
+        Args:
+            worker_index: This worker's index among `workers`
+            workers: Number of worker processes sharing the public port
+            on_change: Called with a Room when a timer changed its state
+            archive: GameArchive that finished games are saved to (optional)
+            directory: RoomDirectory shared with the other workers
+            store: lifecycle.SnapshotStore idle rooms are spilled to (optional)
+        """
+        self.worker_index = worker_index
+        self.workers = workers
+        self.directory = directory or RoomDirectory(workers)
+        self.on_change = on_change
+        self.archive = archive
+        self.store = store
+        self.rooms = OrderedDict()   # {room_id: Room}, least recently used first
+        self.sid_rooms = {}   # {sid: room_id}
+        self.lock = threading.RLock()
+
+    def owns(self, room_id):
+        """Is `room_id` hosted by this worker?"""
+        return self.owner_of(room_id) == self.worker_index
+
+    def owner_of(self, room_id):
+        """Index of the worker hosting `room_id`"""
+        if self.workers == 1:
+            return 0
+        return self.directory.owner_of(room_id)
+
+    def get(self, room_id):
+        """A hosted room, reloaded from disk if it was spilled"""
+        room = self.rooms.get(room_id)
+        if room is None and self.store is not None:
+            with self.lock:
+                room = self.rooms.get(room_id) or self._reload(room_id)
+        return room
+
+    def get_or_create(self, room_id):
+        with self.lock:
+            room = self.rooms.get(room_id) or self._reload(room_id)
+            if room is None:
+                room = self._add(Room(room_id, archive=self.archive))
+                print(f'🏠 Room {room_id} created ({len(self.rooms)} room(s) on worker {self.worker_index})')
+                table = self.directory.claim(room_id)
+                if table is not None:
+                    with room.engine.lock:
+                        room.engine.setup_match(table['seats'], table['bidding_mode'])
+            return room
+
+    def adopt(self, snapshot, how='moved in'):
+        """Host a room from snapshot_room() (moved here, or reloaded), re-arming its timers"""
+        data = pickle.loads(snapshot)
+        if self.store is not None:
+            # Any snapshot left from an earlier spill is older than this one
+            self.store.delete(data['room_id'])
+        game_state = data['game_state']
+        game_state.unbind_all()
+        room = self._add(Room(data['room_id'], archive=self.archive, game_state=game_state,
+                              game_id=data['game_id'], created_at=data['created_at']))
+        with room.engine.lock:
+            room.engine.resume_timers()
+        print(f'🏠 Room {room.room_id} {how} ({len(self.rooms)} room(s) on worker {self.worker_index})')
+        return room
+
+    def _reload(self, room_id):
+        """Bring a spilled room back into memory (caller holds self.lock)"""
+        snapshot = self.store.load(room_id) if self.store is not None else None
+        if snapshot is None:
+            return None
+        return self.adopt(snapshot, how='reloaded from disk')
+
+    def touch(self, room):
+        """Note activity in a room (it becomes the most recently used)"""
+        room.last_active = time.time()
+        if room.room_id in self.rooms:
+            self.rooms.move_to_end(room.room_id)
+
+    def spill(self, room_id):
+        """
+        Write an unused room to disk and free it. Returns False if the room
+        isn't here, or is frozen on its way to another worker.
+        """
+        with self.lock:
+            room = self.rooms.get(room_id)
+            if room is None:
+                return False
+            with room.engine.lock:
+                if room.engine.frozen:
+                    return False
+                room.engine.freeze()
+                self.store.save(room_id, snapshot_room(room))
+            self.remove(room_id)
+            return True
+
+    def expire(self, room_id):
+        """Forget a room for good"""
+        room = self.remove(room_id)
+        if room is not None:
+            with room.engine.lock:
+                room.engine.freeze()
+        if self.store is not None:
+            self.store.delete(room_id)
+        self.directory.release(room_id)
+
+    def remove(self, room_id):
+        """Stop hosting a room (its sockets are left to reconnect elsewhere)"""
+        with self.lock:
+            room = self.rooms.pop(room_id, None)
+            for sid in [sid for sid, rid in self.sid_rooms.items() if rid == room_id]:
+                del self.sid_rooms[sid]
+        if room is not None:
+            tracer.drop(room_id)
+        return room
+
+    def _add(self, room):
+        if self.on_change:
+            room.engine.on_change = lambda: self.on_change(room)
+        self.rooms[room.room_id] = room
+        if self.workers > 1:
+            self.directory.assign(room.room_id, self.worker_index)
+        return room
+
+    def bind_sid(self, sid, room_id):
+        with self.lock:
+            self.sid_rooms[sid] = room_id
+
+    def unbind_sid(self, sid):
+        with self.lock:
+            return self.sid_rooms.pop(sid, None)
+
+    def room_for_sid(self, sid):
+        room_id = self.sid_rooms.get(sid)
+        return self.rooms.get(room_id) if room_id is not None else None
@@ -0,0 +1,72 @@
+"""
+Shared timer scheduler for Hollywood Moguls
+
+One background thread runs every delayed callback (ready-gate deadlines,
+auto-bids for disconnected players, ...) instead of a sleeping thread per timer.
+"""
+import heapq
+import itertools
+import threading
+import time
+
+
+class ScheduledCall:
+    """Handle for a pending callback; cancel() stops it from running"""
+
+    def __init__(self, when, fn, args):
+        self.when = when
+        self.fn = fn
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    """Runs callbacks at (roughly) their due time on a single daemon thread"""
+
+    def __init__(self):
+        self._queue = []                  # heap of (when, seq, ScheduledCall)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def call_later(self, delay, fn, *args):
+        """Run fn(*args) after `delay` seconds; returns a ScheduledCall handle"""
+        call = ScheduledCall(time.monotonic() + delay, fn, args)
+        with self._cond:
+            heapq.heappush(self._queue, (call.when, next(self._seq), call))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return call
+
+    def pending(self):
+        """Number of callbacks still waiting to run"""
+        with self._cond:
+            return sum(1 for _, _, call in self._queue if not call.cancelled)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                when, _, call = self._queue[0]
+                delay = when - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                heapq.heappop(self._queue)
+
+            if call.cancelled:
+                continue
+            try:
+                call.fn(*call.args)
+            except Exception as e:
+                print(f'⚠️ Scheduled callback {getattr(call.fn, "__name__", call.fn)} failed: {e}')
+
+
+# Process-wide scheduler shared by every game
+scheduler = Scheduler()
@@ -0,0 +1,253 @@
+"""
+Production launcher for Hollywood Moguls
+
+Starts WORKERS processes that all accept connections on PORT (SO_REUSEPORT
+lets the kernel spread new connections across them). Each room lives on one
+worker, and each worker also listens on its own port, WORKER_PORT_BASE + index.
+A page request for a room is redirected to the worker hosting it, so the
+room's sockets all reach the same process. The debugger and reloader are
+never enabled here. Configuration comes from the environment (see config.py).
+
+Rooms can move between workers (migration.py), so the room directory lives
+in a multiprocessing Manager shared by all of them. Sending the launcher
+SIGHUP does a zero-downtime rolling restart: each worker in turn is drained
+(its rooms move to the others, games and all), then replaced by a fresh
+process running the code currently on disk.
+
+Usage:
+    WORKERS=4 PORT=8080 SECRET_KEY=... python server.py
+    kill -HUP <launcher pid>    # rolling restart
+
+Only stdlib and config are imported at module level: eventlet/gevent must
+monkey-patch before Flask and the game modules are imported in each worker.
+"""
+import json
+import multiprocessing
+import os
+import queue
+import signal
+import socket
+import sys
+import threading
+import time
+
+from config import load_config, select_async_mode
+
+LISTEN_BACKLOG = 1024
+
+# Seconds a worker gets to move its rooms away during a rolling restart
+DRAIN_TIMEOUT = 120
+
+
+def listen_socket(host, port, reuse_port=False):
+    """Bound, listening TCP socket; SO_REUSEPORT lets several workers share it"""
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(LISTEN_BACKLOG)
+    return sock
+
+
+def run_worker(index, config, async_mode, launched_at, ready_queue=None, shared=None):
+    """
+    Worker process entry point: patch for the async mode, build the app,
+    bind the public and per-worker sockets, report ready, then serve.
+    `shared` holds the Manager dicts behind the workers' RoomDirectory.
+    """
+    if async_mode == 'eventlet':
+        import eventlet
+        eventlet.monkey_patch()
+    elif async_mode == 'gevent':
+        from gevent import monkey
+        monkey.patch_all()
+
+    from app import create_app
+    from rooms import RoomDirectory
+    directory = RoomDirectory(config['WORKERS'], **shared) if shared else None
+    app, _ = create_app(config, async_mode=async_mode, worker_index=index, directory=directory)
+
+    multi = config['WORKERS'] > 1
+    sockets = [listen_socket(config['HOST'], config['PORT'], reuse_port=multi)]
+    if multi:
+        sockets.append(listen_socket(config['HOST'], config['WORKER_PORT_BASE'] + index))
+
+    servers = [make_server(async_mode, sock, app, config) for sock in sockets]
+
+    ready = {
+        'index': index,
+        'pid': os.getpid(),
+        'seconds': time.time() - launched_at,
+        'ports': [sock.getsockname()[1] for sock in sockets]
+    }
+    if ready_queue is not None:
+        ready_queue.put(ready)
+    else:
+        report_ready([ready], async_mode, launched_at)
+
+    # Serve the per-worker port in the background and the public port here
+    for serve in servers[1:]:
+        spawn_background(async_mode, serve)
+    servers[0]()
+
+
+def make_server(async_mode, sock, app, config):
+    """A zero-argument callable that serves `app` on `sock` forever"""
+    if async_mode == 'eventlet':
+        import eventlet.wsgi
+        return lambda: eventlet.wsgi.server(sock, app, log_output=config['DEBUG'])
+
+    if async_mode == 'gevent':
+        from gevent.pywsgi import WSGIServer
+        try:
+            from geventwebsocket.handler import WebSocketHandler
+        except ImportError:
+            WebSocketHandler = None
+        kwargs = {'handler_class': WebSocketHandler} if WebSocketHandler else {}
+        if not config['DEBUG']:
+            kwargs['log'] = None
+        server = WSGIServer(sock, app, **kwargs)
+        return server.serve_forever
+
+    from werkzeug.serving import make_server as werkzeug_server
+    host, port = sock.getsockname()[:2]
+    server = werkzeug_server(host, port, app, threaded=True, fd=sock.fileno())
+    return server.serve_forever
+
+
+def spawn_background(async_mode, serve):
+    if async_mode == 'eventlet':
+        import eventlet
+        eventlet.spawn(serve)
+    elif async_mode == 'gevent':
+        import gevent
+        gevent.spawn(serve)
+    else:
+        threading.Thread(target=serve, daemon=True).start()
+
+
+def report_ready(workers, async_mode, launched_at):
+    total = time.time() - launched_at
+    print("\n" + "="*50)
+    print("🎬 HOLLYWOOD MOGULS SERVER")
+    print("="*50)
+    for w in sorted(workers, key=lambda w: w['index']):
+        ports = ', '.join(str(p) for p in w['ports'])
+        print(f"  Worker {w['index']} (pid {w['pid']}): ready in {w['seconds'] * 1000:.0f}ms on port(s) {ports}")
+    print(f"\n  {len(workers)} worker(s), {async_mode} mode, ready in {total * 1000:.0f}ms")
+    print("="*50 + "\n")
+    sys.stdout.flush()
+
+
+def wait_until_ready(processes, ready_queue):
+    """Collect every worker's ready report (None if one dies first)"""
+    ready = []
+    while len(ready) < len(processes):
+        try:
+            ready.append(ready_queue.get(timeout=1))
+        except queue.Empty:
+            if not all(process.is_alive() for process in processes):
+                return None
+    return ready
+
+
+def drain_worker(index, config):
+    """Ask a worker to move all its rooms to the others; True if it emptied"""
+    import urllib.request
+    from migration import SIGNATURE_HEADER, internal_host, sign
+
+    body = b'{}'
+    url = f"http://{internal_host(config['HOST'])}:{config['WORKER_PORT_BASE'] + index}/internal/drain"
+    req = urllib.request.Request(url, data=body, method='POST',
+                                 headers={SIGNATURE_HEADER: sign(body, config['SECRET_KEY'])})
+    try:
+        with urllib.request.urlopen(req, timeout=DRAIN_TIMEOUT) as response:
+            result = json.loads(response.read())
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Draining worker {index} failed: {e}")
+        return False
+    print(f"🚰 Worker {index} drained: {result['moved']} room(s) moved, {result['left']} left")
+    return result['left'] == 0
+
+
+def main():
+    launched_at = time.time()
+    config = load_config()
+    async_mode = select_async_mode(config['ASYNC_MODE'])
+    if async_mode == 'threading' and config['ASYNC_MODE'] == 'auto':
+        # Werkzeug's threaded dev server is no production server: only run it when asked to
+        print("❌ Neither eventlet nor gevent is installed (pip install -r requirements.txt). "
+              "Set ASYNC_MODE=threading to run on Werkzeug's threaded server anyway.")
+        sys.exit(1)
+
+    if config['WORKERS'] > 1 and not hasattr(socket, 'SO_REUSEPORT'):
+        print("⚠️ SO_REUSEPORT is not available on this platform, running a single worker")
+        config['WORKERS'] = 1
+
+    if config['WORKERS'] == 1:
+        run_worker(0, config, async_mode, launched_at)
+        return
+
+    # Spawn (not fork) so each worker can monkey-patch before importing anything
+    ctx = multiprocessing.get_context('spawn')
+    ready_queue = ctx.Queue()
+    manager = ctx.Manager()
+    shared = {'assignments': manager.dict(), 'draining': manager.dict(), 'loads': manager.dict(),
+              'reservations': manager.dict()}
+
+    def start_worker(index):
+        process = ctx.Process(target=run_worker,
+                              args=(index, config, async_mode, launched_at, ready_queue, shared),
+                              name=f'moguls-worker-{index}')
+        process.start()
+        return process
+
+    processes = [start_worker(index) for index in range(config['WORKERS'])]
+
+    restart = []
+    signal.signal(signal.SIGHUP, lambda signum, frame: restart.append(True))
+
+    try:
+        ready = wait_until_ready(processes, ready_queue)
+        if ready is None:
+            print("❌ A worker failed to start, shutting down")
+            return
+        report_ready(ready, async_mode, launched_at)
+
+        while True:
+            # A dead worker takes its rooms with it: stop everything rather than
+            # keep serving redirects to a port nobody listens on
+            if not all(process.is_alive() for process in processes):
+                print("❌ A worker exited, shutting down")
+                return
+            if restart:
+                restart.clear()
+                print("\n🔄 Rolling restart")
+                for index in range(len(processes)):
+                    if not drain_worker(index, config):
+                        print(f"⚠️ Worker {index} still hosts rooms, skipping its restart")
+                        continue
+                    processes[index].terminate()
+                    processes[index].join()
+                    restarted_at = time.time()
+                    processes[index] = start_worker(index)
+                    if wait_until_ready([processes[index]], ready_queue) is None:
+                        print(f"❌ Worker {index} failed to restart, shutting down")
+                        return
+                    print(f"  Worker {index} restarted in {(time.time() - restarted_at) * 1000:.0f}ms")
+                print("🔄 Rolling restart complete\n")
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+        manager.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,841 +1,509 @@
 """
 Socket.IO event handlers for Hollywood Moguls
 """
+import functools
+import re
+
 from flask import request
-from flask_socketio import emit
-import game_logic
-
-def register_handlers(socketio, game_state):
-    """Register all socket event handlers"""
-    
-    def broadcast_game_state():
-        """Broadcast current game state to all clients"""
-        socketio.emit('game_update', game_state.to_dict())
-    
-    @socketio.on('connect')
-    def handle_connect():
-        print(f'Client connected: {request.sid}')
-    
-    @socketio.on('join_game')
-    def handle_join(data):
-        player_name = data['name']
-    
-        # Check if a player with this name already exists (RECONNECTION)
-        existing_sid = None
-        for sid, player in game_state.players.items():
-            if player['name'] == player_name:
-                existing_sid = sid
-                break
-        
-        if existing_sid:
-            # RECONNECTION - transfer player data to new socket.id
-            print(f'🔄 {player_name} reconnecting (old: {existing_sid[:8]}, new: {request.sid[:8]})')
-            player_data = game_state.players[existing_sid]
-            
-            # Remove old socket.id entry
-            del game_state.players[existing_sid]
-            
-            # Add player with NEW socket.id but PRESERVE their data
-            game_state.players[request.sid] = player_data
-            
-            # Update naming progress if in Phase 0
-            if game_state.phase.startswith('phase0') and existing_sid in game_state.naming_progress.get('submissions', {}):
-                prog_data = game_state.naming_progress['submissions'][existing_sid]
-                del game_state.naming_progress['submissions'][existing_sid]
-                game_state.naming_progress['submissions'][request.sid] = prog_data
-
-            # Update bidding war references if active
-            if game_state.bidding_war.get('active'):
-                # Update participants list
-                if existing_sid in game_state.bidding_war['participants']:
-                    participants = game_state.bidding_war['participants']
-                    idx = participants.index(existing_sid)
-                    participants[idx] = request.sid
-                    print(f'  🎲 Updated bidding war participant: {existing_sid[:8]} → {request.sid[:8]}')
-
-                # Transfer any submitted bid to new socket ID
-                if existing_sid in game_state.bidding_war['bids']:
-                    bid_amount = game_state.bidding_war['bids'][existing_sid]
-                    del game_state.bidding_war['bids'][existing_sid]
-                    game_state.bidding_war['bids'][request.sid] = bid_amount
-                    print(f'  💰 Transferred bid: ${bid_amount}M to new socket')
-
-                # Clear disconnect timer if they reconnected during bidding
-                if 'disconnect_times' in game_state.bidding_war:
-                    if existing_sid in game_state.bidding_war['disconnect_times']:
-                        del game_state.bidding_war['disconnect_times'][existing_sid]
-                        print(f'  ⏱️ Cancelled auto-bid timeout for {player_name}')
-
-            # Update player_selections if they had selected something
-            if existing_sid in game_state.player_selections:
-                selection = game_state.player_selections[existing_sid]
-                del game_state.player_selections[existing_sid]
-                game_state.player_selections[request.sid] = selection
-                print(f'  ✅ Transferred card selection to new socket')
-
-            print(f'  ✅ Restored: ${player_data["money"]}M, {player_data["score"]} pts, {len(player_data.get("roles", []))} roles, {len(player_data.get("films", []))} films')
-        else:
-            # NEW PLAYER
-            game_state.players[request.sid] = {
-                'name': player_name,
-                'money': 100,
-                'score': 0,
-                'roles': [],
-                'films': []
-            }
-            print(f'{player_name} joined the game')
-        
-        emit('joined')
-        broadcast_game_state()
+from flask_socketio import emit, join_room
+from engine import GameError
+from outbound import Outbox
+from ratelimit import RECONNECT_POLICY, AdmissionQueue, RateLimiter
+from rooms import DEFAULT_ROOM, audience_room, valid_room_id
+from scheduler import scheduler
+from tracing import tracer
+import wire
 
-    @socketio.on('heartbeat')
-    def handle_heartbeat(data):
-        """Keep connection alive - mobile browsers kill idle connections"""
-        pass  # Just acknowledge - the connection staying alive is the point
-    
-    @socketio.on('start_phase0')
-    def handle_start_phase0():
-        print("Starting Phase 0: Talent Naming")
-        game_state.phase = 'phase0_naming'
-        game_state.naming_progress = {
-            'submissions': {
-                sid: {'screenwriter': [], 'director': [], 'star': [], 'complete': False}
-                for sid in game_state.players.keys()
+THROTTLED = {'error': 'Too many requests, slow down'}
+
+# Award vote counts are streamed to the room at most this often (seconds)
+TALLY_INTERVAL = 0.5
+
+# Leading bids in live auctions are streamed to the room at most this often
+# (seconds), however fast the raises come in
+AUCTION_INTERVAL = 0.25
+
+# Joins, resumes and disconnects arriving within this many seconds of each
+# other are announced to the room in a single game_update
+BROADCAST_BATCH = 0.2
+
+# Audience members identify themselves with a random token kept by their browser
+VOTER_PATTERN = re.compile(r'^[A-Za-z0-9_-]{8,64}$')
+
+# All an audience socket (?role=audience) may send; anything else is ignored
+AUDIENCE_EVENTS = {'audience_vote'}
+
+def register_handlers(socketio, rooms, name_corpus=None):
+    """
+    Register all socket event handlers.
+
+    Args:
+        name_corpus: {role: [names]} quick-started games name talent from
+            (default game_logic.DEFAULT_NAMES)
+
+    Returns:
+        (limiter, admission, outbox): the RateLimiter guarding inbound
+        events, the AdmissionQueue pacing joins and the Outbox conflating
+        game updates to slow sockets (for their counters)
+    """
+    limiter = RateLimiter()
+    admission = AdmissionQueue()
+    outbox = Outbox()
+    audience_sids = set()   # Sockets that connected as audience members
+
+    def broadcast_game_state(room):
+        """
+        Broadcast current game state to everyone in the room, except sockets
+        too far behind: they get the newest state once they catch up
+        """
+        with tracer.span('broadcast', 'broadcast', room=room.room_id, version=room.game_state.version + 1):
+            snapshot = room.game_state.record_update()
+            payloads = wire.Payloads(snapshot)
+            skip = outbox.route(room.room_id, snapshot, payloads.size)
+            for codec in outbox.codecs(room.room_id):
+                socketio.emit('game_update', payloads.payload(codec), to=codec_room(room.room_id, codec),
+                              skip_sid=skip or None)
+        room.notify_update()
+
+        # The audience only hears about awards, and only when the ballot changes
+        awards = room.game_state.awards
+        audience_key = (room.game_state.phase, awards and awards['current_category'])
+        if audience_key != room.audience_key:
+            room.audience_key = audience_key
+            socketio.emit('audience_state', audience_state(room), to=audience_room(room.room_id))
+
+    def codec_room(room_id, codec):
+        """The room's sockets that take game updates encoded with `codec`"""
+        return f'{room_id}:wire:{codec}'
+
+    def send_update(sid, snapshot):
+        """Send one socket a game state (in its codec) it will acknowledge"""
+        payload, size = wire.Payloads(snapshot).get(outbox.codec(sid) or wire.DEFAULT_CODEC)
+        outbox.sent(sid, snapshot, size)
+        socketio.emit('game_update', payload, to=sid)
+
+    outbox.start(send_update)
+
+    def audience_state(room):
+        """What the audience page shows: the open category and its nominees"""
+        game_state = room.game_state
+        if game_state.phase != 'awards_voting' or not game_state.awards:
+            return {'phase': game_state.phase, 'category': None}
+        key = game_state.awards['current_category']
+        category = game_state.awards['categories'][key]
+        return {
+            'phase': game_state.phase,
+            'category': {
+                'key': key,
+                'name': category['name'],
+                'nominees': [
+                    {'title': film['title'], 'studio': film['studio'], 'teaser': film.get('teaser', '')}
+                    for film in category['nominees']
+                ]
             }
         }
-        broadcast_game_state()
-    
-    @socketio.on('submit_talent_name')
-    def handle_talent_name(data):
-        name = data['name']
-        prog = game_state.naming_progress
-        
-        if request.sid not in prog['submissions']:
-            return
-        
-        player_prog = prog['submissions'][request.sid]
-        
-        if player_prog['complete']:
+
+    def schedule_tally(room):
+        """Stream the vote counts to the room, at most every TALLY_INTERVAL seconds"""
+        if room.tally_pending:
             return
-        
-        # Determine which role type to add to
-        if len(player_prog['screenwriter']) < 3:
-            role_type = 'screenwriter'
-            player_prog['screenwriter'].append(name)
-        elif len(player_prog['director']) < 3:
-            role_type = 'director'
-            player_prog['director'].append(name)
-        elif len(player_prog['star']) < 5:
-            role_type = 'star'
-            player_prog['star'].append(name)
-        else:
+        room.tally_pending = True
+        scheduler.call_later(TALLY_INTERVAL, flush_tally, room)
+
+    def flush_tally(room):
+        room.tally_pending = False
+        socketio.emit('tally_update', room.game_state.tally_snapshot(), to=room.room_id)
+
+    def schedule_auction_update(room):
+        """Stream the leading bids to the room, at most every AUCTION_INTERVAL seconds"""
+        if room.auction_pending:
             return
-        
-        print(f"{game_state.players[request.sid]['name']} submitted {role_type}: {name}")
-        
-        # Generate stats
-        talent = game_logic.generate_talent_stats(role_type, name)
-        game_state.talent_pool.append(talent)
-        
-        # Check if this player is done
-        if (len(player_prog['screenwriter']) == 3 and
-            len(player_prog['director']) == 3 and
-            len(player_prog['star']) == 5):
-            player_prog['complete'] = True
-            print(f"{game_state.players[request.sid]['name']} completed Phase 0!")
-            
-            # Check if ALL players are done
-            if all(p['complete'] for p in prog['submissions'].values()):
-                game_logic.handle_duplicate_names(game_state.talent_pool)
-                game_state.phase = 'phase0_complete'
-                print("Phase 0 complete! All talent generated.")
-        
-        broadcast_game_state()
-    
-    @socketio.on('start_phase1')
-    def handle_start_phase1():
-        print("Starting Phase 1: Winter Production")
-        game_state.selected_roles_this_phase = []
-        game_state.phase = 'phase1_production'
-        game_state.year = 1
-        game_state.turn = 1
-        start_new_turn()
-        broadcast_game_state()
-    
-    def start_new_turn():
-        """Generate cards for the current turn"""
-        game_state.player_selections = {}
-        
-        # Reset bidding war state
-        game_state.bidding_war = {
-            'active': False,
-            'card_index': None,
-            'card_data': {},
-            'participants': [],
-            'bids': {},
-            'conflicts_queue': []
-        }
-        
-        cards = game_logic.generate_turn_cards(game_state)
-        game_state.current_turn_cards = cards
-        
-        print(f"\n=== Turn {game_state.turn} ===")
-        print(f"Generated {len(cards)} cards:")
-        for i, card in enumerate(cards):
-            print(f"  Card {i}: {card['name']} ({card['role']})")
-    
-    @socketio.on('select_card')
-    def handle_select_card(data):
-        # Prevent re-selection during same turn
-        if request.sid in game_state.player_selections:
-            emit('selection_error', {'message': 'You have already made your selection for this turn!'})
+        room.auction_pending = True
+        scheduler.call_later(AUCTION_INTERVAL, flush_auction_update, room)
+
+    def flush_auction_update(room):
+        room.auction_pending = False
+        with room.engine.lock:
+            snapshot = room.game_state.auction_snapshot()
+        socketio.emit('auction_update', snapshot, to=room.room_id)
+
+    def schedule_broadcast(room):
+        """
+        Broadcast the room's state once BROADCAST_BATCH seconds from now, so
+        a burst of players (re)joining costs one game_update, not one each
+        """
+        if room.broadcast_pending:
             return
-        
-        selection = data['index']
-        player = game_state.players[request.sid]
-        player_name = player['name']
-        
-        # Check affordability
-        if selection != 'pass':
-            if selection >= len(game_state.current_turn_cards):
-                emit('selection_error', {'message': 'Invalid card selection!'})
-                return
-            
-            card = game_state.current_turn_cards[selection]
-            print(f"{player_name} selecting card {selection}: {card['name']} (${card['salary']}M)")
-            
-            if player['money'] < card['salary']:
-                print(f"  -> BLOCKED: Cannot afford!")
-                emit('selection_error', {'message': f"Can't afford {card['name']}!"})
+        room.broadcast_pending = True
+        scheduler.call_later(BROADCAST_BATCH, flush_broadcast, room)
+
+    def flush_broadcast(room):
+        with room.engine.lock:
+            room.broadcast_pending = False
+            if not room.engine.frozen:
+                broadcast_game_state(room)
+
+    rooms.on_change = broadcast_game_state
+
+    def current_room():
+        """Room the requesting socket joined (None if it never connected properly)"""
+        return rooms.room_for_sid(request.sid)
+
+    def current_player_id(room):
+        """Player ID bound to the requesting socket (None for hosts/unjoined)"""
+        return room.game_state.sid_players.get(request.sid)
+
+    def run(room, command, *args):
+        """Run an engine command, reporting rule errors back to the sender"""
+        with room.engine.lock:
+            if room.engine.frozen:
+                return  # Moving to another worker; the client will retry there
+            try:
+                changed = getattr(room.engine, command)(*args)
+            except GameError as e:
+                emit(e.event, {'message': e.message})
                 return
-        
-        game_state.player_selections[request.sid] = selection
-        
-        if selection == 'pass':
-            print(f"{player_name} passed")
-        else:
-            print(f"{player_name} selected {card['name']}")
-        
-        # Check if all players have selected
-        if len(game_state.player_selections) == len(game_state.players):
-            resolve_selections()
-        else:
-            broadcast_game_state()
-    
-    def resolve_selections():
-        """Check for bidding wars and award cards"""
-        selections = game_state.player_selections
-        
-        print(f"\n=== Resolving Turn {game_state.turn} ===")
-        for sid, sel in selections.items():
-            player_name = game_state.players[sid]['name']
-            if sel == 'pass':
-                print(f"  {player_name}: PASS")
-            else:
-                card = game_state.current_turn_cards[sel]
-                print(f"  {player_name}: {card['name']}")
-        
-        # Group players by selection
-        selection_groups = {}
-        for sid, selection in selections.items():
-            if selection != 'pass':
-                if selection not in selection_groups:
-                    selection_groups[selection] = []
-                selection_groups[selection].append(sid)
-        
-        # Separate contested cards from uncontested ones
-        contested_cards = {}    # {card_index: [sids]}
-        uncontested_cards = {}  # {card_index: [sid]}
-        
-        for card_index, player_list in selection_groups.items():
-            if len(player_list) > 1:
-                contested_cards[card_index] = player_list
-            else:
-                uncontested_cards[card_index] = player_list
-        
-        # Check if we have any bidding wars
-        if contested_cards:
-            # Build the conflicts queue
-            game_state.bidding_war['conflicts_queue'] = [
-                (card_idx, players) for card_idx, players in contested_cards.items()
-            ]
-            
-            print(f"\n💥 {len(contested_cards)} BIDDING WAR(S) DETECTED!")
-            for card_idx, players in contested_cards.items():
-                card = game_state.current_turn_cards[card_idx]
-                player_names = [game_state.players[sid]['name'] for sid in players]
-                print(f"  Card {card_idx} ({card['name']}): {', '.join(player_names)}")
-            
-            # Start processing the first conflict
-            start_next_bidding_war(uncontested_cards)
-        else:
-            # No conflicts - award all cards directly
-            print("\nNo conflicts, awarding cards...")
-            for card_index, player_list in uncontested_cards.items():
-                award_card_to_player(player_list[0], card_index)
-            
-            advance_turn()
-    
-    # ============================================================================
-    # BIDDING WAR SYSTEM
-    # ============================================================================
-    
-    def start_next_bidding_war(uncontested_cards):
+            if changed:
+                broadcast_game_state(room)
+
+    def room_command(command, *args):
+        """Run an engine command in the requesting socket's room"""
+        room = current_room()
+        if room is None or request.sid in audience_sids:
+            return
+        run(room, command, *args)
+
+    def player_command(command, *args):
+        """Run an engine command on behalf of the requesting player"""
+        room = current_room()
+        if room is None:
+            return
+        player_id = current_player_id(room)
+        if player_id is None:
+            return
+        run(room, command, player_id, *args)
+
+    def on(event):
         """
-        Start the next bidding war from the conflicts queue.
-        If queue is empty, award uncontested cards and advance turn.
-        
-        Args:
-            uncontested_cards: Dict of {card_index: [sid]} for cards with single bidders
+        Like socketio.on, but each socket is rate limited per event and the
+        room's inbound queue sheds (or merges) events once it is full
         """
-        if not game_state.bidding_war['conflicts_queue']:
-            # No more conflicts - award uncontested cards and move on
-            print("\n✓ All bidding wars resolved!")
-            for card_index, player_list in uncontested_cards.items():
-                award_card_to_player(player_list[0], card_index)
-            advance_turn()
+        def decorator(handler):
+            @functools.wraps(handler)
+            def guarded(*args):
+                if request.sid in audience_sids and event not in AUDIENCE_EVENTS:
+                    return
+                if not limiter.allow(request.sid, event):
+                    return THROTTLED
+                room = current_room()
+                if room is None:
+                    return handler(*args)
+                release = room.inbound.admit(request.sid, event)
+                if release is None:
+                    return THROTTLED
+                rooms.touch(room)
+                try:
+                    with tracer.span(event, 'handler', room=room.room_id,
+                                     player=current_player_id(room), phase=room.game_state.phase):
+                        return handler(*args)
+                finally:
+                    release()
+            return socketio.on(event)(guarded)
+        return decorator
+
+    @socketio.on('connect')
+    def handle_connect():
+        room_id = request.args.get('room') or DEFAULT_ROOM
+        if not valid_room_id(room_id) or not rooms.owns(room_id):
+            # Wrong worker (or a bad room name): the page should have been
+            # redirected to the worker hosting this room
+            return False
+
+        room = rooms.get_or_create(room_id)
+        rooms.bind_sid(request.sid, room.room_id)
+        rooms.touch(room)
+        if request.args.get('role') == 'audience':
+            # Audience members don't get game updates, only the award ballot
+            audience_sids.add(request.sid)
+            join_room(audience_room(room.room_id))
+            emit('audience_state', audience_state(room))
             return
-        
-        # Get the next conflict from the queue
-        card_index, participants = game_state.bidding_war['conflicts_queue'].pop(0)
-        card_data = game_state.current_turn_cards[card_index].copy()
-        
-        # Set up the bidding war state
-        game_state.bidding_war['active'] = True
-        game_state.bidding_war['card_index'] = card_index
-        game_state.bidding_war['card_data'] = card_data
-        game_state.bidding_war['participants'] = participants
-        game_state.bidding_war['bids'] = {}  # Reset bids
-        
-        # Determine which phase we're in for UI
-        if game_state.phase == 'phase1_production':
-            game_state.phase = 'phase1_bidding'
-        elif game_state.phase == 'phase2_production':
-            game_state.phase = 'phase2_bidding'
-        
-        player_names = [game_state.players[sid]['name'] for sid in participants]
-        print(f"\n🎬 STARTING BIDDING WAR for {card_data['name']}")
-        print(f"   Participants: {', '.join(player_names)}")
-        
-        # Store uncontested_cards for later use
-        game_state.bidding_war['uncontested_cards'] = uncontested_cards
-        
-        broadcast_game_state()
-    
-    def resolve_bidding_war():
+        join_room(room.room_id)
+        codec = wire.negotiate(request.args.get('codecs'))
+        join_room(codec_room(room.room_id, codec))
+        outbox.add(request.sid, room.room_id, codec)
+        emit('codec', wire.handshake(codec))
+        # How to back off if the connection drops, so a whole venue
+        # reconnecting doesn't arrive at the same instant
+        emit('reconnect_policy', RECONNECT_POLICY)
+        print(f'Client connected: {request.sid} (room {room.room_id})')
+
+    def admit(event, job, *args):
         """
-        Determine the winner of a bidding war and award the card.
-        Called after all participants have submitted bids.
+        Run a join/resume through the worker's admission queue. Queued jobs
+        run later on the scheduler, so they reply with socketio.emit(to=sid).
         """
-        bids = game_state.bidding_war['bids']
-        participants = game_state.bidding_war['participants']
-        card_data = game_state.bidding_war['card_data']
-        card_index = game_state.bidding_war['card_index']
-        
-        print(f"\n🎬 RESOLVING BIDDING WAR for {card_data['name']}")
-        
-        # Show all bids
-        for sid in participants:
-            player_name = game_state.players[sid]['name']
-            bid = bids.get(sid, 0)
-            print(f"   {player_name}: ${bid}M")
-        
-        # Find the highest bid
-        max_bid = max(bids.values())
-        winners = [sid for sid, bid in bids.items() if bid == max_bid]
-        
-        if len(winners) > 1:
-            # TIE - Nobody gets the card!
-            print(f"\n💔 TIE at ${max_bid}M!")
-            print(f"   {card_data['name']} is disgusted by studio politicking!")
-            print(f"   Nobody gets the role, bids refunded.")
-        else:
-            # We have a winner!
-            winner_sid = winners[0]
-            winner_name = game_state.players[winner_sid]['name']
-            print(f"\n🏆 WINNER: {winner_name} with bid of ${max_bid}M!")
-            
-            # Award the card with the extra bid
-            award_card_to_player(winner_sid, card_index, extra_bid=max_bid)
-        
-        # Move to results phase
-        if game_state.phase == 'phase1_bidding':
-            game_state.phase = 'phase1_bidding_results'
-        elif game_state.phase == 'phase2_bidding':
-            game_state.phase = 'phase2_bidding_results'
-        
-        broadcast_game_state()
-    
-    def continue_after_bidding_results():
+        sid = request.sid
+        retry_after = admission.submit(lambda: job(sid, *args))
+        if retry_after is not None:
+            emit('retry_later', {'event': event, 'after_ms': int(retry_after * 1000)})
+
+    def join_game(sid, name):
+        room = rooms.room_for_sid(sid)
+        if room is None:
+            return  # Disconnected while waiting for admission
+        with room.engine.lock:
+            if room.engine.frozen:
+                return
+            try:
+                player_id, token = room.engine.join(sid, name)
+            except GameError as e:
+                socketio.emit(e.event, {'message': e.message}, to=sid)
+                return
+            socketio.emit('joined', {'player_id': player_id, 'token': token,
+                                     'name': room.game_state.players[player_id]['name']}, to=sid)
+        schedule_broadcast(room)
+
+    def resume_session(sid, token, last_version):
+        room = rooms.room_for_sid(sid)
+        if room is None:
+            return  # Disconnected while waiting for admission
+        game_state = room.game_state
+        with room.engine.lock:
+            if room.engine.frozen:
+                return
+            player_id = room.engine.resume(sid, token)
+            if player_id is None:
+                socketio.emit('resume_failed', {'message': 'Session expired, please join again'}, to=sid)
+                return
+
+            socketio.emit('joined', {'player_id': player_id, 'token': token,
+                                     'name': game_state.players[player_id]['name']}, to=sid)
+            missed = game_state.updates_since(last_version)
+            if missed is None:
+                send_update(sid, game_state.snapshot)
+            else:
+                socketio.emit('game_replay', {'updates': missed, 'version': game_state.version}, to=sid)
+        # The others see this player back once the rest of the burst is in
+        schedule_broadcast(room)
+
+    @on('join_game')
+    def handle_join(data):
+        if current_room() is None:
+            return
+        admit('join_game', join_game, data['name'])
+
+    @on('resume_session')
+    def handle_resume(data):
         """
-        Called after showing bidding results.
-        Either starts the next bidding war or continues the turn.
+        Reattach a reconnecting phone to its seat using its resume token.
+        Only the updates it missed since `last_version` are sent back.
         """
-        uncontested_cards = game_state.bidding_war.get('uncontested_cards', {})
-        
-        # Reset active bidding war
-        game_state.bidding_war['active'] = False
-
-        # CRITICAL FIX: Clear player selections BEFORE returning to production phase
-        # This prevents the UI from showing stale "selected" status
-        game_state.player_selections = {}
-
-        # Return to production phase
-        if 'phase1' in game_state.phase:
-            game_state.phase = 'phase1_production'
-        elif 'phase2' in game_state.phase:
-            game_state.phase = 'phase2_production'
-        
-        # Check if there are more conflicts
-        start_next_bidding_war(uncontested_cards)
-    
-    # ============================================================================
-    # BIDDING WAR - BID SUBMISSION
-    # ============================================================================
-    
-    @socketio.on('submit_bid')
+        if current_room() is None:
+            return
+        last_version = data.get('last_version', -1)
+        if not isinstance(last_version, int) or isinstance(last_version, bool):
+            last_version = -1   # Unknown: send the whole state
+        admit('resume_session', resume_session, data.get('token'), last_version)
+
+    @on('heartbeat')
+    def handle_heartbeat(data):
+        """Keep connection alive - mobile browsers kill idle connections"""
+        pass  # Just acknowledge - the connection staying alive is the point
+
+    @on('start_phase0')
+    def handle_start_phase0(data=None):
+        room_command('start_phase0', (data or {}).get('bidding_mode'))
+
+    @on('quick_start')
+    def handle_quick_start(data=None):
+        """Start with every talent named from the corpus instead of by the players"""
+        room_command('quick_start', (data or {}).get('bidding_mode'), name_corpus)
+
+    @on('submit_talent_name')
+    def handle_talent_name(data):
+        player_command('submit_talent_name', data['name'])
+
+    @on('submit_talent_names')
+    def handle_talent_names(data):
+        """Several talent names in one message (up to all of a player's 11)"""
+        player_command('submit_talent_names', data.get('names'))
+
+    @on('start_phase1')
+    def handle_start_phase1():
+        room_command('start_phase1')
+
+    @on('select_card')
+    def handle_select_card(data):
+        player_command('select_card', data['index'])
+
+    @on('submit_bid')
     def handle_submit_bid(data):
         """
         Handle a player's bid submission during a bidding war.
         Validates affordability and automatically resolves when all bids are in.
         """
-        bid_amount = data.get('bid_amount', 0)
-        
-        # Validation checks
-        if not game_state.bidding_war.get('active'):
-            emit('bid_error', {'message': 'No active bidding war!'})
-            return
-        
-        if request.sid not in game_state.bidding_war['participants']:
-            emit('bid_error', {'message': 'You are not a participant in this bidding war!'})
-            return
-        
-        if request.sid in game_state.bidding_war['bids']:
-            emit('bid_error', {'message': 'You have already submitted your bid!'})
-            return
-        
-        # Validate bid amount
-        if bid_amount < 0:
-            emit('bid_error', {'message': 'Bid cannot be negative!'})
-            return
-        
-        # Check affordability: player must be able to pay base salary + bid
-        player = game_state.players[request.sid]
-        card_data = game_state.bidding_war['card_data']
-        base_salary = card_data['salary']
-        total_cost = base_salary + bid_amount
-        
-        if player['money'] < total_cost:
-            emit('bid_error', {'message': f'Cannot afford! Total cost: ${total_cost}M, Your budget: ${player["money"]}M'})
-            return
-        
-        # Bid is valid - record it
-        game_state.bidding_war['bids'][request.sid] = bid_amount
-        player_name = player['name']
-        
-        print(f"  💰 {player_name} bid ${bid_amount}M (Total: ${total_cost}M)")
-        
-        # Check if all participants have bid
-        num_bids = len(game_state.bidding_war['bids'])
-        num_participants = len(game_state.bidding_war['participants'])
-        
-        if num_bids == num_participants:
-            print(f"\n✓ All {num_participants} participants have submitted bids!")
-            resolve_bidding_war()
-        else:
-            print(f"  Waiting for {num_participants - num_bids} more bid(s)...")
-            broadcast_game_state()
-
-    def schedule_auto_bid(disconnected_sid, player_name):
+        player_command('submit_bid', data.get('bid_amount', 0))
+
+    @on('raise_bid')
+    def handle_raise_bid(data):
         """
-        Schedule an automatic $0 bid for a disconnected participant.
-        If they reconnect before the timeout, this will be cancelled.
+        Raise the high bid in a live auction. Raises aren't broadcast one by
+        one: the leading bid is streamed to the room at a capped rate.
         """
-        import threading
-        import time
-
-        def auto_submit_bid():
-            # Wait 60 seconds for reconnection
-            time.sleep(60)
-
-            # Check if still needed (player might have reconnected and bid)
-            if not game_state.bidding_war.get('active'):
-                print(f'  ⏭️ Auto-bid cancelled: bidding war already resolved')
+        room = current_room()
+        if room is None:
+            return
+        player_id = current_player_id(room)
+        if player_id is None:
+            return
+        with room.engine.lock:
+            if room.engine.frozen:
                 return
-
-            if disconnected_sid not in game_state.bidding_war['participants']:
-                print(f'  ⏭️ Auto-bid cancelled: participant reconnected with new ID')
+            try:
+                room.engine.raise_bid(player_id, data.get('bid_amount'))
+            except GameError as e:
+                emit(e.event, {'message': e.message})
                 return
+        schedule_auction_update(room)
 
-            if disconnected_sid in game_state.bidding_war['bids']:
-                print(f'  ⏭️ Auto-bid cancelled: {player_name} already submitted bid')
-                return
-
-            # Still disconnected after timeout - auto-submit $0 bid
-            print(f'\n⏰ TIMEOUT: Auto-submitting $0 bid for disconnected player {player_name}')
-            game_state.bidding_war['bids'][disconnected_sid] = 0
-
-            # Check if this completes the bidding
-            num_bids = len(game_state.bidding_war['bids'])
-            num_participants = len(game_state.bidding_war['participants'])
-
-            if num_bids == num_participants:
-                print(f"✓ All {num_participants} participants have now submitted bids (including auto-bids)!")
-                resolve_bidding_war()
-            else:
-                print(f"  Waiting for {num_participants - num_bids} more bid(s)...")
-                broadcast_game_state()
-
-        # Start timeout thread
-        timeout_thread = threading.Thread(target=auto_submit_bid, daemon=True)
-        timeout_thread.start()
-
-    def award_card_to_player(player_sid, card_index, extra_bid=0):
-        """Give a card to a player and deduct cost"""
-        card = game_state.current_turn_cards[card_index]
-        player = game_state.players[player_sid]
-        
-        total_cost = card['salary'] + extra_bid
-        
-        print(f"  â†’ Awarding {card['name']} to {player['name']} for ${total_cost}M")
-        print(f"     Money: ${player['money']}M â†’ ${player['money'] - total_cost}M")
-        
-        player['money'] -= total_cost
-        player['roles'].append(card.copy())
-
-        if card['name'] not in game_state.selected_roles_this_phase:
-            game_state.selected_roles_this_phase.append(card['name'])
-    
-    def advance_turn():
-        """Move to next turn or phase"""
-        game_state.turn += 1
-        
-        # Determine which phase we're in
-        current_phase = game_state.phase
-        
-        if game_state.turn <= 5:
-            # Continue current production phase
-            if current_phase == 'phase1_production':
-                game_state.phase = 'phase1_production'
-                print(f"\n=== Starting Turn {game_state.turn} ===\n")
-            elif current_phase == 'phase2_production':
-                game_state.phase = 'phase2_production'
-                print(f"\n=== Starting Turn {game_state.turn} ===\n")
-            start_new_turn()
-        else:
-            # Move to packaging phase and provide no-name talent
-            if current_phase == 'phase1_production':
-                game_state.phase = 'phase1_packaging'
-                print("\n=== Winter production complete! Packaging phase ===\n")
-            elif current_phase == 'phase2_production':
-                game_state.phase = 'phase2_packaging'
-                print("\n=== Summer production complete! Packaging phase ===\n")
-            
-            # Give each player access to no-name talent
-            no_name_talent = game_logic.generate_no_name_talent()
-            game_state.no_name_talent = no_name_talent
-            
-            for sid, player in game_state.players.items():
-                role_count = len(player.get('roles', []))
-                print(f"  {player['name']} has {role_count} roles + no-name talent available")
-        
-        broadcast_game_state()
-    
-    @socketio.on('continue_after_bidding')
+    @on('continue_after_bidding')
     def handle_continue_after_bidding():
         """
         Socket handler for when players/host continue after viewing bidding results.
         Proceeds to next conflict or continues turn.
         """
-        player = game_state.players[request.sid]
-        player['bidding_results_ready'] = True
-        
-        player_name = player['name']
-        ready_count = sum(1 for p in game_state.players.values() if p.get('bidding_results_ready', False))
-        total_count = len(game_state.players)
-        print(f"  {player_name} ready to continue ({ready_count}/{total_count})")
-        
-        # Check if all players ready
-        if all(p.get('bidding_results_ready', False) for p in game_state.players.values()):
-            # Reset ready flags
-            for p in game_state.players.values():
-                p['bidding_results_ready'] = False
-            
-            continue_after_bidding_results()
-        else:
-            broadcast_game_state()
-    
-    @socketio.on('request_update')
+        player_command('continue_after_bidding')
+
+    @on('request_update')
     def handle_request_update():
-        broadcast_game_state()
-    
-    @socketio.on('greenlight_film')
+        """Send the current state to the asking socket only"""
+        room = current_room()
+        if room is not None:
+            with room.engine.lock:
+                if room.engine.frozen:
+                    return
+                state = room.game_state.snapshot
+            send_update(request.sid, state)
+
+    @on('update_ack')
+    def handle_update_ack(data):
+        """The client applied a game_update; send it anything held back meanwhile"""
+        snapshot = outbox.ack(request.sid, (data or {}).get('version'))
+        if snapshot is not None:
+            send_update(request.sid, snapshot)
+
+    @on('greenlight_film')
     def handle_greenlight_film(data):
-        player = game_state.players[request.sid]
-        role_indices = data['roleIndices']
-        title = data['title'].strip()
-        teaser = data.get('teaser', '').strip()
-        
-        if not title:
-            emit('package_error', {'message': 'Film title is required!'})
+        player_command('greenlight_film', data['roleIndices'], data['title'], data.get('teaser', ''))
+
+    @on('suggest_packages')
+    def handle_suggest_packages(data):
+        """Send the player the best film packages for their current roles"""
+        room = current_room()
+        if room is None:
             return
-        
-        # Extract roles (handle both regular and no-name talent)
-        roles = []
-        no_name_talent = game_state.no_name_talent
-        
-        for idx in role_indices:
-            if idx < 0:
-                # No-name talent (negative index)
-                no_name_array = list(no_name_talent.values())
-                role_idx = abs(idx) - 1
-                if role_idx < len(no_name_array):
-                    roles.append(no_name_array[role_idx].copy())
-            else:
-                # Regular purchased role
-                if player.get('roles') and idx < len(player['roles']):
-                    roles.append(player['roles'][idx])
-        
-        # Validate package
-        if not game_logic.validate_film_package(roles):
-            emit('package_error', {'message': 'Invalid package! Need Producer, Screenwriter, Director, and Star'})
+        player_id = current_player_id(room)
+        if player_id is None:
             return
-        
-        # Calculate film stats
-        stats = game_logic.calculate_film_stats(roles)
-        
-        film = {
-            'title': title,
-            'teaser': teaser if teaser else f"A {stats['genre']} film for {stats['audience']}",
-            'roles': roles,
-            **stats
-        }
-        
-        if 'films' not in player:
-            player['films'] = []
-        player['films'].append(film)
-        
-        # Remove ONLY purchased roles (not no-name talent)
-        purchased_indices = [idx for idx in role_indices if idx >= 0]
-        for idx in sorted(purchased_indices, reverse=True):
-            if idx < len(player['roles']):
-                player['roles'].pop(idx)
-        
-        print(f"{player['name']} greenlit '{title}' (Heat: {stats['heat']}, Prestige: {stats['prestige']})")
-        broadcast_game_state()
-    
-    @socketio.on('finish_packaging')
+
+        with room.engine.lock:
+            if room.engine.frozen:
+                return
+            try:
+                result = room.engine.suggest_packages(player_id, data.get('objective', 'heat'), data.get('top_k', 3))
+            except GameError as e:
+                emit(e.event, {'message': e.message})
+                return
+        emit('package_suggestions', result)
+
+    def query(command, data, filters):
+        """
+        Answer a paginated read through the Socket.IO acknowledgement, with
+        only the allowed filters passed through
+        """
+        room = current_room()
+        if room is None:
+            return {'error': 'Not in a room'}
+
+        data = data or {}
+        kwargs = {key: data[key] for key in filters + ('cursor', 'limit') if data.get(key) is not None}
+        with room.engine.lock:
+            if room.engine.frozen:
+                return {'error': 'Room is moving, try again'}
+            try:
+                return getattr(room.engine, command)(**kwargs)
+            except GameError as e:
+                return {'error': e.message}
+
+    @on('get_talent_pool')
+    def handle_get_talent_pool(data=None):
+        """Page through the talent pool (filters: role, bucket)"""
+        return query('query_talent_pool', data, ('role', 'bucket'))
+
+    @on('get_films')
+    def handle_get_films(data=None):
+        """Page through greenlit films (filters: studio, season, genre)"""
+        return query('query_films', data, ('studio', 'season', 'genre'))
+
+    @on('finish_packaging')
     def handle_finish_packaging():
-        player = game_state.players[request.sid]
-        
-        # Refund remaining roles
-        if player.get('roles'):
-            refund = sum(r['salary'] for r in player['roles']) // 2
-            player['money'] += refund
-            print(f"{player['name']} released {len(player['roles'])} roles for ${refund}M")
-            player['roles'] = []
-        
-        # Determine which phase we're in
-        if game_state.phase == 'phase1_packaging':
-            player['spring_ready'] = True
-            # Check if all players ready
-            if all(p.get('spring_ready', False) for p in game_state.players.values()):
-                start_releases('Spring', 'phase1_releases')
-        elif game_state.phase == 'phase2_packaging':
-            player['holiday_ready'] = True
-            # Check if all players ready
-            if all(p.get('holiday_ready', False) for p in game_state.players.values()):
-                start_releases('Holiday', 'phase2_releases')
-        
-        broadcast_game_state()
-    
-    def start_releases(season_name, phase_name):
-        """Generic function to handle any release phase"""
-        game_state.phase = phase_name
-        game_logic.process_film_releases(game_state.players, season_name)
-        broadcast_game_state()
-    
-    @socketio.on('continue_to_summer')
+        player_command('finish_packaging')
+
+    @on('continue_to_summer')
     def handle_continue_to_summer():
         """Start Phase 2: Summer Production - wait for all players"""
-        game_state.selected_roles_this_phase = []
-        player = game_state.players[request.sid]
-        player['spring_releases_ready'] = True
-        
-        player_name = player['name']
-        ready_count = sum(1 for p in game_state.players.values() if p.get('spring_releases_ready', False))
-        total_count = len(game_state.players)
-        print(f"  {player_name} ready for Summer ({ready_count}/{total_count})")
-        
-        # Check if all players ready
-        if all(p.get('spring_releases_ready', False) for p in game_state.players.values()):
-            print("\n=== Starting Phase 2: Summer Production ===\n")
-            game_state.phase = 'phase2_production'
-            game_state.turn = 1
-            
-            # Reset ready flags
-            for p in game_state.players.values():
-                p['spring_ready'] = False
-                p['holiday_ready'] = False
-                p['spring_releases_ready'] = False
-            
-            start_new_turn()
-            broadcast_game_state()
-        else:
-            broadcast_game_state()
-    
-    @socketio.on('start_awards')
+        player_command('continue_to_summer')
+
+    @on('start_awards')
     def handle_start_awards():
         """Start Award Season - wait for all players"""
-        player = game_state.players[request.sid]
-        player['holiday_releases_ready'] = True
-        
-        player_name = player['name']
-        ready_count = sum(1 for p in game_state.players.values() if p.get('holiday_releases_ready', False))
-        total_count = len(game_state.players)
-        print(f"  {player_name} ready for Awards ({ready_count}/{total_count})")
-        
-        # Check if all players ready
-        if all(p.get('holiday_releases_ready', False) for p in game_state.players.values()):
-            print("\n=== Starting Award Season ===\n")
-            
-            # Reset ready flag
-            for p in game_state.players.values():
-                p['holiday_releases_ready'] = False
-            
-            # Set up awards (just Best Picture for now)
-            awards_data = game_logic.setup_awards(game_state.players, active_categories=['best_picture'])
-            
-            if not awards_data:
-                print("Not enough films for awards! Skipping to final results.")
-                game_state.phase = 'game_complete'
-                broadcast_game_state()
-                return
-            
-            game_state.phase = 'awards_voting'
-            game_state.awards = awards_data
-            
-            print(f"Award Season initialized with categories: {awards_data['active_categories']}")
-            print(f"Nominees: {len(awards_data['categories']['best_picture']['nominees'])} films")
-            
-            broadcast_game_state()
-        else:
-            broadcast_game_state()
-    
-    @socketio.on('vote_for_nominee')
+        player_command('start_awards')
+
+    @on('vote_for_nominee')
     def handle_vote(data):
         """Player votes for a nominee"""
-        nominee_index = data['nominee_index']
-        
-        if not hasattr(game_state, 'awards') or not game_state.awards:
-            return
-        
-        current_cat_key = game_state.awards['current_category']
-        category = game_state.awards['categories'][current_cat_key]
-        nominees = category['nominees']
-        
-        # Validate vote
-        if nominee_index >= len(nominees):
-            emit('vote_error', {'message': 'Invalid nominee selection!'})
-            return
-        
-        # Check if voting for own film
-        selected_film = nominees[nominee_index]
-        voter_studio = game_state.players[request.sid]['name']
-        
-        if selected_film.get('studio') == voter_studio:
-            emit('vote_error', {'message': 'Cannot vote for your own film!'})
-            return
-        
-        # Record vote
-        category['votes'][request.sid] = nominee_index
-        player_name = game_state.players[request.sid]['name']
-        print(f"{player_name} voted for nominee {nominee_index}: {selected_film['title']}")
-        
-        # Check if all players have voted
-        if len(category['votes']) == len(game_state.players):
-            calculate_award_winner(current_cat_key)
-        
-        broadcast_game_state()
-    
-    def calculate_award_winner(category_key):
-        """Calculate the winner for a category"""
-        category_data = game_state.awards['categories'][category_key]
-        category = game_logic.AWARD_CATEGORIES[category_key]
-        
-        winner = category.calculate_winner(
-            category_data['votes'], 
-            category_data['nominees']
-        )
-        
-        if winner:
-            category_data['winner'] = winner
-            
-            # Award points to the studio
-            winner_studio = winner.get('studio')
-            for sid, player in game_state.players.items():
-                if player['name'] == winner_studio:
-                    player['score'] += category.points_value
-                    print(f"\nðŸ† {category.name} WINNER: {winner['title']} ({winner_studio})")
-                    print(f"   +{category.points_value} points awarded!")
-                    break
-        
-        # Move to results phase
-        game_state.phase = 'awards_results'
-        broadcast_game_state()
-    
-    @socketio.on('continue_from_awards')
-    def handle_continue_from_awards():
-        """Handle continuing from awards results to game complete"""
-        player = game_state.players[request.sid]
-        player['awards_results_ready'] = True
-        
-        player_name = player['name']
-        ready_count = sum(1 for p in game_state.players.values() if p.get('awards_results_ready', False))
-        total_count = len(game_state.players)
-        print(f"  {player_name} ready to end game ({ready_count}/{total_count})")
-        
-        # Check if all players ready
-        if all(p.get('awards_results_ready', False) for p in game_state.players.values()):
-            print("\n=== GAME COMPLETE ===\n")
-            
-            # Reset ready flags
-            for p in game_state.players.values():
-                p['awards_results_ready'] = False
-            
-            game_state.phase = 'game_complete'
-            broadcast_game_state()
-        else:
-            broadcast_game_state()
-    
-    @socketio.on('disconnect')
-
-    def handle_disconnect():
-        if request.sid in game_state.players:
-            player_name = game_state.players[request.sid]['name']
-            print(f'📱 {player_name} disconnected (socket: {request.sid[:8]})')
-            print(f'  💾 Player data preserved for reconnection')
-
-            # Track disconnect during active bidding war
-            if game_state.bidding_war.get('active'):
-                if request.sid in game_state.bidding_war['participants']:
-                    if request.sid not in game_state.bidding_war['bids']:
-                        # They disconnected without submitting a bid
-                        print(f'  ⚠️ {player_name} disconnected during bidding war without submitting bid')
+        player_command('vote', data['nominee_index'])
 
-                        # Add to bidding_war state to track disconnect time
-                        if 'disconnect_times' not in game_state.bidding_war:
-                            game_state.bidding_war['disconnect_times'] = {}
+    @on('audience_vote')
+    def handle_audience_vote(data):
+        """An audience member votes in the open award category"""
+        room = current_room()
+        if room is None or room.engine.frozen:
+            return {'error': 'Voting is not open here'}
+        voter = data.get('voter')
+        if not isinstance(voter, str) or not VOTER_PATTERN.match(voter):
+            return {'error': 'Invalid voter'}
 
-                        import time
-                        game_state.bidding_war['disconnect_times'][request.sid] = time.time()
+        # No engine lock: the tally is sharded so thousands of votes don't queue
+        try:
+            counted = room.engine.audience_vote(f'audience:{voter}', data.get('nominee_index'))
+        except GameError as e:
+            return {'error': e.message}
+        if counted:
+            schedule_tally(room)
+        return {'counted': counted}
 
-                        # Schedule auto-bid after timeout
-                        schedule_auto_bid(request.sid, player_name)
-
-                        # Broadcast updated state to show disconnect status
-                        broadcast_game_state()
+    @on('continue_from_awards')
+    def handle_continue_from_awards():
+        """Handle continuing from awards results to game complete"""
+        player_command('continue_from_awards')
 
+    @socketio.on('disconnect')
+    def handle_disconnect():
         # DON'T delete the player - keep their data for reconnection
-        # When they reconnect, join_game will update their socket.id
-        # This prevents losing progress when mobile phones go to sleep
\ No newline at end of file
+        # When they reconnect, resume_session rebinds their new socket
+        # This prevents losing progress when mobile phones go to sleep
+        room = current_room()
+        rooms.unbind_sid(request.sid)
+        audience_sids.discard(request.sid)
+        limiter.forget(request.sid)
+        outbox.drop(request.sid)
+        if room is None:
+            return
+        with room.engine.lock:
+            if room.engine.frozen or not room.engine.disconnect(request.sid):
+                return
+        schedule_broadcast(room)
+
+    return limiter, admission, outbox
@@ -0,0 +1,76 @@
+// Audience screen logic for Hollywood Moguls
+
+// The audience joins a room's award voting with ?room=<id> (default 'main')
+const ROOM = new URLSearchParams(window.location.search).get('room') || 'main';
+const socket = io({ query: { room: ROOM, role: 'audience' } });
+
+// One vote per browser: a random voter token kept across reloads
+let voterToken = localStorage.getItem('audienceVoter');
+if (!voterToken) {
+    voterToken = Array.from(crypto.getRandomValues(new Uint8Array(16)), b => b.toString(16).padStart(2, '0')).join('');
+    localStorage.setItem('audienceVoter', voterToken);
+}
+
+let currentCategory = null;
+let myVote = null;
+
+// The room was moved to another server process: reconnect there
+socket.on('room_moved', (data) => {
+    const target = new URL(window.location.href);
+    target.port = data.port;
+    socket.io.uri = target.origin;
+    socket.disconnect();
+    socket.connect();
+});
+
+socket.on('audience_state', (data) => {
+    if (!data.category) {
+        currentCategory = null;
+        showScreen('waiting-screen');
+        return;
+    }
+    if (!currentCategory || currentCategory.key !== data.category.key) {
+        myVote = null;
+    }
+    currentCategory = data.category;
+    showScreen('voting-screen');
+    renderNominees();
+});
+
+function renderNominees() {
+    document.getElementById('audienceCategory').textContent = currentCategory.name;
+    
+    const nomineesDiv = document.getElementById('audience-nominees');
+    nomineesDiv.innerHTML = '';
+    currentCategory.nominees.forEach((film, index) => {
+        const isSelected = myVote === index;
+        nomineesDiv.innerHTML += `
+            <div class="info-box" style="margin: 10px 0; ${isSelected ? 'border: 2px solid #FFD700;' : ''}">
+                <h3 style="color: #FFD700;">${film.title}</h3>
+                <p><strong>Studio:</strong> ${film.studio}</p>
+                <p style="font-style: italic;">"${film.teaser}"</p>
+                <button onclick="audienceVote(${index})" ${isSelected ? 'disabled' : ''}>
+                    ${isSelected ? 'Voted ✓' : 'Vote for This Film'}
+                </button>
+            </div>
+        `;
+    });
+}
+
+function audienceVote(index) {
+    socket.emit('audience_vote', { voter: voterToken, nominee_index: index }, (result) => {
+        const statusDiv = document.getElementById('audience-vote-status');
+        if (result && result.error) {
+            statusDiv.innerHTML = `<p style="color: #ff9800;">${result.error}</p>`;
+            return;
+        }
+        myVote = index;
+        statusDiv.innerHTML = `<p style="color: #FFD700; font-size: 18px;">✓ You voted for: <strong>${currentCategory.nominees[index].title}</strong></p>`;
+        renderNominees();
+    });
+}
+
+function showScreen(screenId) {
+    document.querySelectorAll('.screen').forEach(s => s.classList.remove('active'));
+    document.getElementById(screenId).classList.add('active');
+}
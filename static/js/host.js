@@ -1,9 +1,64 @@
 // Host screen logic for Hollywood Moguls
 
-const socket = io();
+// Each game runs in its own room, picked with ?room=<id> (default 'main')
+const ROOM = new URLSearchParams(window.location.search).get('room') || 'main';
+const socket = io({ query: { room: ROOM, codecs: WIRE_CODECS } });
+let lastState = null;
 
-socket.on('game_update', (data) => {
+// The room was moved to another server process: reconnect there (the
+// player's resume token and missed updates carry over)
+socket.on('room_moved', (data) => {
+    const target = new URL(window.location.href);
+    target.port = data.port;
+    socket.io.uri = target.origin;
+    socket.disconnect();
+    socket.connect();
+});
+
+// How game updates will be encoded (see wire.js)
+socket.on('codec', (info) => {
+    wireCodec = info;
+});
+
+socket.on('game_update', (payload) => {
+    const data = decodeState(payload);
+    lastState = data;
     updateDisplay(data);
+    // Tells the server this phone keeps up; until it does, newer states are held back
+    socket.emit('update_ack', { version: data.version });
+});
+
+// Throttled award vote counts while the audience is voting
+socket.on('tally_update', (tallies) => {
+    if (!lastState || lastState.phase !== 'awards_voting') return;
+    const currentCat = lastState.awards.current_category;
+    renderAudienceTally(lastState.awards.categories[currentCat], tallies[currentCat]);
+});
+
+// Leading bids of live auctions, streamed at a capped rate between full updates
+socket.on('auction_update', (data) => {
+    serverClockOffset = data.server_time - Date.now() / 1000;
+    if (!lastState || !lastState.phase.endsWith('_bidding') || !lastState.bidding_war.active) return;
+    data.wars.forEach(update => {
+        const war = lastState.bidding_war.wars.find(w => w.card_index === update.card_index);
+        if (war) {
+            war.bids = update.bids;
+            war.closes_at = update.closes_at;
+        }
+    });
+    updateDisplay(lastState);
+});
+
+// Reconnect backoff advertised by the server (jittered)
+socket.on('reconnect_policy', (policy) => {
+    socket.io.reconnectionDelay(policy.delay);
+    socket.io.reconnectionDelayMax(policy.delay_max);
+    socket.io.randomizationFactor(policy.randomization);
+});
+
+// (Re)connected: fetch the current state rather than wait for the next change
+socket.on('connect', () => {
+    socket.emit('request_update');
 });
 
 function updateDisplay(state) {
@@ -52,23 +107,29 @@ function updateDisplay(state) {
         contentDiv.innerHTML += '</div>';
     } else if (state.phase === 'phase0_complete') {
         detailsDiv.innerHTML = '<p>All talent generated! Ready to start production.</p>';
-        contentDiv.innerHTML = '<h3>Talent Pool:</h3>';
-        
-        const byRole = {screenwriter: [], director: [], star: []};
-        state.talent_pool.forEach(t => byRole[t.role].push(t));
-        
-        for (let [role, talents] of Object.entries(byRole)) {
-            contentDiv.innerHTML += `<h4>${role.toUpperCase()}S:</h4>`;
-            talents.forEach(t => {
-                contentDiv.innerHTML += `
-                    <div class="talent-card">
-                        <strong>${t.name}</strong><br>
-                        Heat: ${t.heat_bucket} | Prestige: ${t.prestige_bucket}<br>
-                        Salary: $${t.salary}M
-                    </div>
-                `;
-            });
-        }
+        contentDiv.innerHTML = '<h3>Talent Pool:</h3><div id="talent-pool-list"><p><em>Loading talent pool...</em></p></div>';
+        
+        fetchCollection('get_talent_pool', {}, state.collections.talent_pool.version, talentPool => {
+            const listDiv = document.getElementById('talent-pool-list');
+            if (!listDiv) return;
+            
+            const byRole = {screenwriter: [], director: [], star: []};
+            talentPool.forEach(t => byRole[t.role].push(t));
+            
+            listDiv.innerHTML = '';
+            for (let [role, talents] of Object.entries(byRole)) {
+                listDiv.innerHTML += `<h4>${role.toUpperCase()}S:</h4>`;
+                talents.forEach(t => {
+                    listDiv.innerHTML += `
+                        <div class="talent-card">
+                            <strong>${t.name}</strong><br>
+                            Heat: ${t.heat_bucket} | Prestige: ${t.prestige_bucket}<br>
+                            Salary: $${t.salary}M
+                        </div>
+                    `;
+                });
+            }
+        });
         
         document.getElementById('start-btn').innerHTML = 'Start Phase 1 (Production)';
         document.getElementById('start-btn').onclick = startPhase1;
@@ -99,129 +160,32 @@ function updateDisplay(state) {
         }
         contentDiv.innerHTML += `</div><p>${numSelections}/${numPlayers} players have selected</p>`;
     } else if (state.phase === 'phase1_bidding' || state.phase === 'phase1_bidding_results') {
-        const bw = state.bidding_war;
-        const isResults = state.phase === 'phase1_bidding_results';
+        const isResults = state.phase.endsWith('_bidding_results');
+        const wars = state.bidding_war ? state.bidding_war.wars : [];
         
-        detailsDiv.innerHTML = `<p>💥 Winter BIDDING WAR - Turn ${state.turn} of 5</p>`;
-        
-        if (bw && bw.card_data) {
-            const card = bw.card_data;
-            contentDiv.innerHTML = `
-                <div style="background: #8B0000; padding: 20px; border-radius: 10px; margin: 20px 0;">
-                    <h2 style="color: #FFD700; text-align: center; margin: 0;">💥 BIDDING WAR 💥</h2>
-                </div>
-                
-                <div class="talent-card" style="border: 3px solid #FFD700; background: #2a2a2a;">
-                    <h2 style="color: #FFD700; margin-top: 0;">CONTESTED ROLE:</h2>
-                    <h3>${card.name}</h3>
-                    <p><strong>Role:</strong> ${card.role.toUpperCase()}</p>
-                    <p><strong>Heat:</strong> ${card.heat_bucket} | <strong>Prestige:</strong> ${card.prestige_bucket}</p>
-                    <p><strong>Base Salary:</strong> $${card.salary}M</p>
-                    ${card.genre ? `<p><strong>Genre:</strong> ${card.genre}</p>` : ''}
-                    ${card.audience ? `<p><strong>Audience:</strong> ${card.audience}</p>` : ''}
-                </div>
-                
-                <h3 style="margin-top: 30px;">Participants:</h3>
-                <div class="submissions">
-            `;
-            
-            bw.participants.forEach(sid => {
-                const player = state.players[sid];
-                const hasBid = bw.bids[sid] !== undefined;
-                const status = hasBid ? '✓ Bid Submitted' : '⏳ Bidding...';
-                
-                contentDiv.innerHTML += `
-                    <div class="player-card" style="display: inline-block; margin: 10px;">
-                        <h3>${player.name}</h3>
-                        <p>💰 Budget: $${player.money}M</p>
-                        <p>${status}</p>
-                    </div>
-                `;
-            });
-            
-            contentDiv.innerHTML += '</div>';
-            
-            const numBids = Object.keys(bw.bids).length;
-            const numParticipants = bw.participants.length;
-            contentDiv.innerHTML += `<p style="text-align: center; font-size: 18px; margin-top: 20px;">
-                ${numBids} of ${numParticipants} players have bid
-            </p>`;
-            
-            if (isResults) {
-                contentDiv.innerHTML += `
-                    <div style="background: #1a1a1a; padding: 20px; margin: 20px 0; border-radius: 10px;">
-                        <h2 style="color: #FFD700; text-align: center;">BIDDING RESULTS</h2>
-                `;
-                
-                // Show all bids
-                bw.participants.forEach(sid => {
-                    const player = state.players[sid];
-                    const bid = bw.bids[sid] || 0;
-                    contentDiv.innerHTML += `<p style="font-size: 18px;"><strong>${player.name}:</strong> $${bid}M</p>`;
-                });
-                
-                contentDiv.innerHTML += '</div>';
-            }
-        } else {
-            contentDiv.innerHTML = '<p>Bidding war state not properly initialized...</p>';
-        }
+        detailsDiv.innerHTML = `<p>💥 Winter BIDDING WAR${wars.length > 1 ? 'S' : ''} - Turn ${state.turn} of 5</p>`;
+        contentDiv.innerHTML = renderBiddingWars(state, wars, isResults);
     } else if (state.phase === 'phase1_packaging') {
         detailsDiv.innerHTML = '<p>Spring Packaging - Players assembling their films...</p>';
         contentDiv.innerHTML = '<h3>Player Progress:</h3><div class="submissions">';
         
+        const gate = state.ready.spring_packaging;
         for (let [sid, player] of Object.entries(state.players)) {
-            const ready = player.spring_ready ? '✅' : '⏳';
+            const ready = gate.arrived.includes(sid) ? '✅' : '⏳';
             const roleCount = player.roles ? player.roles.length : 0;
-            const filmCount = player.films ? player.films.length : 0;
+            const filmCount = player.film_count || 0;
             contentDiv.innerHTML += `<p>${ready} ${player.name} - ${roleCount} roles, ${filmCount} films</p>`;
         }
-        contentDiv.innerHTML += '</div>';
+        contentDiv.innerHTML += `</div>${readyDeadlineText(gate)}`;
     } else if (state.phase === 'phase1_releases') {
         detailsDiv.innerHTML = '<p>🎬 Spring Releases - Box Office Results! 🎬</p>';
         contentDiv.innerHTML = '<h2>This Season\'s Films:</h2>';
         
-        // Collect all films from all players
-        let allFilms = [];
-        for (let [sid, player] of Object.entries(state.players)) {
-            if (player.films) {
-                player.films.forEach(film => {
-                    allFilms.push({
-                        ...film,
-                        studio: player.name
-                    });
-                });
-            }
-        }
-        
-        // Display each film
-        allFilms.forEach(film => {
-            contentDiv.innerHTML += `
-                <div class="talent-card" style="width: 90%; max-width: 600px; background: #2a2a2a; border-left: 4px solid #e50914;">
-                    <h3 style="color: #e50914; margin-top: 0;">${film.title}</h3>
-                    <p style="font-style: italic; color: #aaa;">"${film.teaser || 'No teaser provided'}"</p>
-                    <p><strong>Studio:</strong> ${film.studio}</p>
-                    <p><strong>Genre:</strong> ${film.genre} | <strong>Audience:</strong> ${film.audience}</p>
-                    
-                    <div style="background: #1a1a1a; padding: 10px; margin: 10px 0; border-radius: 5px;">
-                        <h4 style="margin-top: 0;">Cast & Crew:</h4>
-                        ${film.roles.map(r => `
-                            <p style="margin: 5px 0;">
-                                <strong>${r.role.toUpperCase()}:</strong> ${r.name}
-                                <span style="color: #888;">(Heat: ${r.heat_bucket}, Prestige: ${r.prestige_bucket})</span>
-                            </p>
-                        `).join('')}
-                    </div>
-                    
-                    <div style="background: #1a1a1a; padding: 15px; margin: 10px 0; border-radius: 5px; border: 2px solid ${film.box_office > 100 ? '#4CAF50' : '#ff9800'};">
-                        <h4 style="margin-top: 0; color: #4CAF50;">📊 Box Office Results</h4>
-                        <p><strong>Total Heat:</strong> ${film.heat}</p>
-                        <p><strong>Market Multiplier:</strong> ${film.multiplier}x</p>
-                        <p style="font-size: 24px; color: #4CAF50; margin: 10px 0;">
-                            <strong>💰 $${film.box_office}M</strong>
-                        </p>
-                    </div>
-                </div>
-            `;
+        // Films are fetched page by page rather than broadcast with every update
+        contentDiv.innerHTML += '<div id="release-films"><p><em>Loading films...</em></p></div>';
+        fetchCollection('get_films', {}, state.collections.films.version, films => {
+            const filmsDiv = document.getElementById('release-films');
+            if (filmsDiv) filmsDiv.innerHTML = films.map(renderReleasedFilm).join('');
         });
         
         // Show player standings
@@ -235,7 +199,7 @@ function updateDisplay(state) {
         playerArray.forEach((player, index) => {
             const medal = index === 0 ? '🥇' : index === 1 ? '🥈' : index === 2 ? '🥉' : '';
             contentDiv.innerHTML += `
-                <p>${medal} <strong>${player.name}:</strong> $${player.money}M budget | ${player.score} points | ${player.films ? player.films.length : 0} films</p>
+                <p>${medal} <strong>${player.name}:</strong> $${player.money}M budget | ${player.score} points | ${player.film_count || 0} films</p>
             `;
         });
         contentDiv.innerHTML += '</div>';
@@ -270,129 +234,32 @@ function updateDisplay(state) {
         }
         contentDiv.innerHTML += `</div><p>${numSelections2}/${numPlayers2} players have selected</p>`;
     } else if (state.phase === 'phase2_bidding' || state.phase === 'phase2_bidding_results') {
-        const bw = state.bidding_war;
-        const isResults = state.phase === 'phase2_bidding_results';
-        
-        detailsDiv.innerHTML = `<p>💥 Summer BIDDING WAR - Turn ${state.turn} of 5</p>`;
+        const isResults = state.phase.endsWith('_bidding_results');
+        const wars = state.bidding_war ? state.bidding_war.wars : [];
         
-        if (bw && bw.card_data) {
-            const card = bw.card_data;
-            contentDiv.innerHTML = `
-                <div style="background: #8B0000; padding: 20px; border-radius: 10px; margin: 20px 0;">
-                    <h2 style="color: #FFD700; text-align: center; margin: 0;">💥 BIDDING WAR 💥</h2>
-                </div>
-                
-                <div class="talent-card" style="border: 3px solid #FFD700; background: #2a2a2a;">
-                    <h2 style="color: #FFD700; margin-top: 0;">CONTESTED ROLE:</h2>
-                    <h3>${card.name}</h3>
-                    <p><strong>Role:</strong> ${card.role.toUpperCase()}</p>
-                    <p><strong>Heat:</strong> ${card.heat_bucket} | <strong>Prestige:</strong> ${card.prestige_bucket}</p>
-                    <p><strong>Base Salary:</strong> $${card.salary}M</p>
-                    ${card.genre ? `<p><strong>Genre:</strong> ${card.genre}</p>` : ''}
-                    ${card.audience ? `<p><strong>Audience:</strong> ${card.audience}</p>` : ''}
-                </div>
-                
-                <h3 style="margin-top: 30px;">Participants:</h3>
-                <div class="submissions">
-            `;
-            
-            bw.participants.forEach(sid => {
-                const player = state.players[sid];
-                const hasBid = bw.bids[sid] !== undefined;
-                const status = hasBid ? '✓ Bid Submitted' : '⏳ Bidding...';
-                
-                contentDiv.innerHTML += `
-                    <div class="player-card" style="display: inline-block; margin: 10px;">
-                        <h3>${player.name}</h3>
-                        <p>💰 Budget: $${player.money}M</p>
-                        <p>${status}</p>
-                    </div>
-                `;
-            });
-            
-            contentDiv.innerHTML += '</div>';
-            
-            const numBids = Object.keys(bw.bids).length;
-            const numParticipants = bw.participants.length;
-            contentDiv.innerHTML += `<p style="text-align: center; font-size: 18px; margin-top: 20px;">
-                ${numBids} of ${numParticipants} players have bid
-            </p>`;
-            
-            if (isResults) {
-                contentDiv.innerHTML += `
-                    <div style="background: #1a1a1a; padding: 20px; margin: 20px 0; border-radius: 10px;">
-                        <h2 style="color: #FFD700; text-align: center;">BIDDING RESULTS</h2>
-                `;
-                
-                // Show all bids
-                bw.participants.forEach(sid => {
-                    const player = state.players[sid];
-                    const bid = bw.bids[sid] || 0;
-                    contentDiv.innerHTML += `<p style="font-size: 18px;"><strong>${player.name}:</strong> $${bid}M</p>`;
-                });
-                
-                contentDiv.innerHTML += '</div>';
-            }
-        } else {
-            contentDiv.innerHTML = '<p>Bidding war state not properly initialized...</p>';
-        }
+        detailsDiv.innerHTML = `<p>💥 Summer BIDDING WAR${wars.length > 1 ? 'S' : ''} - Turn ${state.turn} of 5</p>`;
+        contentDiv.innerHTML = renderBiddingWars(state, wars, isResults);
     } else if (state.phase === 'phase2_packaging') {
         detailsDiv.innerHTML = '<p>🎄 Holiday Packaging - Players assembling their films...</p>';
         contentDiv.innerHTML = '<h3>Player Progress:</h3><div class="submissions">';
         
+        const gate = state.ready.holiday_packaging;
         for (let [sid, player] of Object.entries(state.players)) {
-            const ready = player.holiday_ready ? '✅' : '⏳';
+            const ready = gate.arrived.includes(sid) ? '✅' : '⏳';
             const roleCount = player.roles ? player.roles.length : 0;
-            const filmCount = player.films ? player.films.length : 0;
+            const filmCount = player.film_count || 0;
             contentDiv.innerHTML += `<p>${ready} ${player.name} - ${roleCount} roles, ${filmCount} films</p>`;
         }
-        contentDiv.innerHTML += '</div>';
+        contentDiv.innerHTML += `</div>${readyDeadlineText(gate)}`;
     } else if (state.phase === 'phase2_releases') {
         detailsDiv.innerHTML = '<p>🎬 Holiday Releases - Box Office Results! 🎬</p>';
         contentDiv.innerHTML = '<h2>This Season\'s Films:</h2>';
         
-        // Collect all films from all players
-        let allFilms = [];
-        for (let [sid, player] of Object.entries(state.players)) {
-            if (player.films) {
-                player.films.forEach(film => {
-                    allFilms.push({
-                        ...film,
-                        studio: player.name
-                    });
-                });
-            }
-        }
-        
-        // Display each film
-        allFilms.forEach(film => {
-            contentDiv.innerHTML += `
-                <div class="talent-card" style="width: 90%; max-width: 600px; background: #2a2a2a; border-left: 4px solid #e50914;">
-                    <h3 style="color: #e50914; margin-top: 0;">${film.title}</h3>
-                    <p style="font-style: italic; color: #aaa;">"${film.teaser || 'No teaser provided'}"</p>
-                    <p><strong>Studio:</strong> ${film.studio}</p>
-                    <p><strong>Genre:</strong> ${film.genre} | <strong>Audience:</strong> ${film.audience}</p>
-                    
-                    <div style="background: #1a1a1a; padding: 10px; margin: 10px 0; border-radius: 5px;">
-                        <h4 style="margin-top: 0;">Cast & Crew:</h4>
-                        ${film.roles.map(r => `
-                            <p style="margin: 5px 0;">
-                                <strong>${r.role.toUpperCase()}:</strong> ${r.name}
-                                <span style="color: #888;">(Heat: ${r.heat_bucket}, Prestige: ${r.prestige_bucket})</span>
-                            </p>
-                        `).join('')}
-                    </div>
-                    
-                    <div style="background: #1a1a1a; padding: 15px; margin: 10px 0; border-radius: 5px; border: 2px solid ${film.box_office > 100 ? '#4CAF50' : '#ff9800'};">
-                        <h4 style="margin-top: 0; color: #4CAF50;">📊 Box Office Results</h4>
-                        <p><strong>Total Heat:</strong> ${film.heat}</p>
-                        <p><strong>Market Multiplier:</strong> ${film.multiplier}x</p>
-                        <p style="font-size: 24px; color: #4CAF50; margin: 10px 0;">
-                            <strong>💰 $${film.box_office}M</strong>
-                        </p>
-                    </div>
-                </div>
-            `;
+        // Films are fetched page by page rather than broadcast with every update
+        contentDiv.innerHTML += '<div id="release-films"><p><em>Loading films...</em></p></div>';
+        fetchCollection('get_films', {}, state.collections.films.version, films => {
+            const filmsDiv = document.getElementById('release-films');
+            if (filmsDiv) filmsDiv.innerHTML = films.map(renderReleasedFilm).join('');
         });
         
         // Show player standings
@@ -406,7 +273,7 @@ function updateDisplay(state) {
         playerArray2.forEach((player, index) => {
             const medal = index === 0 ? '🥇' : index === 1 ? '🥈' : index === 2 ? '🥉' : '';
             contentDiv.innerHTML += `
-                <p>${medal} <strong>${player.name}:</strong> $${player.money}M budget | ${player.score} points | ${player.films ? player.films.length : 0} films</p>
+                <p>${medal} <strong>${player.name}:</strong> $${player.money}M budget | ${player.score} points | ${player.film_count || 0} films</p>
             `;
         });
         contentDiv.innerHTML += '</div>';
@@ -450,6 +317,10 @@ function updateDisplay(state) {
         
         contentDiv.innerHTML += `</div><p>${numVotes}/${numPlayers3} players have voted</p>`;
         
+        // Live audience votes (also streamed between game updates)
+        contentDiv.innerHTML += '<h2 style="margin-top: 30px;">Audience:</h2><div id="audience-tally"></div>';
+        renderAudienceTally(category, state.award_tallies[currentCat]);
+        
     } else if (state.phase === 'awards_results') {
         const currentCat = state.awards.current_category;
         const category = state.awards.categories[currentCat];
@@ -481,7 +352,7 @@ function updateDisplay(state) {
         playerArray3.forEach((player, index) => {
             const medal = index === 0 ? '🥇' : index === 1 ? '🥈' : index === 2 ? '🥉' : '';
             contentDiv.innerHTML += `
-                <p style="font-size: 20px;">${medal} <strong>${player.name}:</strong> ${player.score} points | ${player.films ? player.films.length : 0} films</p>
+                <p style="font-size: 20px;">${medal} <strong>${player.name}:</strong> ${player.score} points | ${player.film_count || 0} films</p>
             `;
         });
         contentDiv.innerHTML += '</div>';
@@ -491,8 +362,202 @@ function updateDisplay(state) {
     }
 }
 
+function renderAudienceTally(category, tally) {
+    const tallyDiv = document.getElementById('audience-tally');
+    if (!tallyDiv || !tally) return;
+    
+    const voters = tally.audience_voters;
+    tallyDiv.innerHTML = `<p>${voters} audience vote${voters === 1 ? '' : 's'} - join at /audience${ROOM !== 'main' ? '?room=' + ROOM : ''}</p>`;
+    category.nominees.forEach((film, index) => {
+        const votes = tally.audience[index];
+        const share = voters ? Math.round(100 * votes / voters) : 0;
+        tallyDiv.innerHTML += `
+            <p style="margin: 5px 0;"><strong>${film.title}</strong>: ${votes} (${share}%)</p>
+            <div style="background: #1a1a1a; width: 90%; max-width: 600px; height: 10px; border-radius: 5px;">
+                <div style="background: #FFD700; width: ${share}%; height: 10px; border-radius: 5px;"></div>
+            </div>
+        `;
+    });
+}
+
+function renderReleasedFilm(film) {
+    return `
+        <div class="talent-card" style="width: 90%; max-width: 600px; background: #2a2a2a; border-left: 4px solid #e50914;">
+            <h3 style="color: #e50914; margin-top: 0;">${film.title}</h3>
+            <p style="font-style: italic; color: #aaa;">"${film.teaser || 'No teaser provided'}"</p>
+            <p><strong>Studio:</strong> ${film.studio}</p>
+            <p><strong>Genre:</strong> ${film.genre} | <strong>Audience:</strong> ${film.audience}</p>
+            
+            <div style="background: #1a1a1a; padding: 10px; margin: 10px 0; border-radius: 5px;">
+                <h4 style="margin-top: 0;">Cast & Crew:</h4>
+                ${film.roles.map(r => `
+                    <p style="margin: 5px 0;">
+                        <strong>${r.role.toUpperCase()}:</strong> ${r.name}
+                        <span style="color: #888;">(Heat: ${r.heat_bucket}, Prestige: ${r.prestige_bucket})</span>
+                    </p>
+                `).join('')}
+            </div>
+            
+            <div style="background: #1a1a1a; padding: 15px; margin: 10px 0; border-radius: 5px; border: 2px solid ${film.box_office > 100 ? '#4CAF50' : '#ff9800'};">
+                <h4 style="margin-top: 0; color: #4CAF50;">📊 Box Office Results</h4>
+                <p><strong>Total Heat:</strong> ${film.heat}</p>
+                <p><strong>Market Multiplier:</strong> ${film.multiplier}x</p>
+                <p style="font-size: 24px; color: #4CAF50; margin: 10px 0;">
+                    <strong>💰 $${film.box_office}M</strong>
+                </p>
+            </div>
+        </div>
+    `;
+}
+
+// Live auctions: the server's clock minus ours, in seconds (from auction_update)
+let serverClockOffset = 0;
+
+function auctionSecondsLeft(closesAt) {
+    return Math.max(0, Math.ceil(closesAt - (Date.now() / 1000 + serverClockOffset)));
+}
+
+// Tick down every auction clock on screen
+setInterval(() => {
+    document.querySelectorAll('.auction-clock').forEach(el => {
+        el.textContent = auctionSecondsLeft(parseFloat(el.dataset.closesAt));
+    });
+}, 1000);
+
+function renderBiddingWars(state, wars, isResults) {
+    if (!wars || wars.length === 0) {
+        return '<p>Bidding war state not properly initialized...</p>';
+    }
+    const isAuction = state.bidding_mode === 'auction';
+    
+    let html = `
+        <div style="background: #8B0000; padding: 20px; border-radius: 10px; margin: 20px 0;">
+            <h2 style="color: #FFD700; text-align: center; margin: 0;">💥 BIDDING WAR${wars.length > 1 ? 'S' : ''} 💥</h2>
+        </div>
+    `;
+    
+    wars.forEach(bw => {
+        const card = bw.card_data;
+        html += `
+            <div class="talent-card" style="border: 3px solid #FFD700; background: #2a2a2a;">
+                <h2 style="color: #FFD700; margin-top: 0;">CONTESTED ROLE:</h2>
+                <h3>${card.name}</h3>
+                <p><strong>Role:</strong> ${card.role.toUpperCase()}</p>
+                <p><strong>Heat:</strong> ${card.heat_bucket} | <strong>Prestige:</strong> ${card.prestige_bucket}</p>
+                <p><strong>Base Salary:</strong> $${card.salary}M</p>
+                ${card.genre ? `<p><strong>Genre:</strong> ${card.genre}</p>` : ''}
+                ${card.audience ? `<p><strong>Audience:</strong> ${card.audience}</p>` : ''}
+            </div>
+            
+            <h3 style="margin-top: 30px;">Participants:</h3>
+            <div class="submissions">
+        `;
+        
+        bw.participants.forEach(sid => {
+            const player = state.players[sid];
+            const hasBid = bw.bids[sid] !== undefined;
+            let status = hasBid ? '✓ Bid Submitted' : '⏳ Bidding...';
+            if (isAuction && !isResults) {
+                status = hasBid ? `🔨 Leading at $${bw.bids[sid]}M` : '⏳ Bidding...';
+            }
+            
+            html += `
+                <div class="player-card" style="display: inline-block; margin: 10px;">
+                    <h3>${player.name}</h3>
+                    <p>💰 Budget: $${player.money}M</p>
+                    <p>${status}</p>
+                </div>
+            `;
+        });
+        
+        html += '</div>';
+        
+        if (isAuction && !isResults) {
+            html += `<p style="text-align: center; font-size: 18px; margin-top: 20px;">
+                🔨 Live auction - closes in <span class="auction-clock" data-closes-at="${bw.closes_at}">${auctionSecondsLeft(bw.closes_at)}</span>s
+            </p>`;
+        } else if (!isAuction) {
+            const numBids = Object.keys(bw.bids).length;
+            html += `<p style="text-align: center; font-size: 18px; margin-top: 20px;">
+                ${numBids} of ${bw.participants.length} players have bid
+            </p>`;
+        }
+        
+        if (isResults) {
+            html += `
+                <div style="background: #1a1a1a; padding: 20px; margin: 20px 0; border-radius: 10px;">
+                    <h2 style="color: #FFD700; text-align: center;">BIDDING RESULTS</h2>
+            `;
+            
+            // Show all bids
+            bw.participants.forEach(sid => {
+                const player = state.players[sid];
+                const bid = bw.bids[sid] || 0;
+                html += `<p style="font-size: 18px;"><strong>${player.name}:</strong> $${bid}M</p>`;
+            });
+            
+            let outcome = bw.winner ? `🏆 ${state.players[bw.winner].name} wins ${card.name}` : '💔 Tie - nobody gets the role';
+            if (!bw.winner && bw.winning_bid === null) {
+                outcome = '🦗 No bids - nobody gets the role';
+            }
+            html += `<p style="font-size: 20px; text-align: center;">${outcome}</p></div>`;
+        }
+    });
+    
+    return html;
+}
+
+// Paginated collections (talent pool, films) cached by query and version
+const PAGE_SIZE = 50;
+const collectionCache = {};
+
+function fetchCollection(event, query, version, onLoaded) {
+    const key = event + JSON.stringify(query);
+    const cached = collectionCache[key];
+    if (cached && cached.version === version) {
+        onLoaded(cached.items);
+        return;
+    }
+    
+    const items = [];
+    const loadPage = cursor => {
+        socket.emit(event, { ...query, cursor: cursor, limit: PAGE_SIZE }, page => {
+            if (page.error) {
+                // The collection changed mid-way: start over from the first page
+                if (cursor) loadPage(null);
+                return;
+            }
+            if (!cursor) items.length = 0;
+            items.push(...page.items);
+            if (page.next_cursor) {
+                loadPage(page.next_cursor);
+            } else {
+                collectionCache[key] = { version: page.version, items: items };
+                onLoaded(items);
+            }
+        });
+    };
+    loadPage(null);
+}
+
+function readyDeadlineText(gate) {
+    if (!gate || !gate.deadline) return '';
+    const secondsLeft = Math.max(0, Math.round(gate.deadline - Date.now() / 1000));
+    return `<p>${gate.ready}/${gate.total} ready - auto-continues in ${secondsLeft}s</p>`;
+}
+
 function startPhase0() {
-    socket.emit('start_phase0');
+    const modeSelect = document.getElementById('bidding-mode');
+    socket.emit('start_phase0', { bidding_mode: modeSelect.value });
+    modeSelect.style.display = 'none';
+    document.getElementById('quick-start-btn').style.display = 'none';
+}
+
+function quickStart() {
+    const modeSelect = document.getElementById('bidding-mode');
+    socket.emit('quick_start', { bidding_mode: modeSelect.value });
+    modeSelect.style.display = 'none';
+    document.getElementById('quick-start-btn').style.display = 'none';
 }
 
 function startPhase1() {
@@ -0,0 +1,86 @@
+// Find-a-game page for Hollywood Moguls: queue for a matchmade table, then
+// go to its room's player view once enough studios are waiting
+
+// Seconds each status request may wait for a match (long-poll)
+const POLL_WAIT = 25;
+
+let ticket = null;
+
+const savedName = sessionStorage.getItem('playerName');
+if (savedName) {
+    document.getElementById('playerName').value = savedName;
+}
+
+async function findGame() {
+    const name = document.getElementById('playerName').value.trim();
+    const errorDiv = document.getElementById('find-error');
+    if (!name) {
+        errorDiv.innerHTML = '<p style="color: #ff9800;">Enter your studio name first</p>';
+        return;
+    }
+    errorDiv.innerHTML = '';
+    // A seat from another room can't be resumed at the new table
+    sessionStorage.setItem('playerName', name);
+    sessionStorage.removeItem('playerId');
+    sessionStorage.removeItem('resumeToken');
+
+    const response = await fetch('/api/matchmaking', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+            seats: parseInt(document.getElementById('seats').value, 10),
+            bidding_mode: document.getElementById('bidding-mode').value
+        })
+    });
+    const data = await response.json();
+    if (!response.ok) {
+        errorDiv.innerHTML = `<p style="color: #ff9800;">${data.error || 'Matchmaking is unavailable'}</p>`;
+        return;
+    }
+    ticket = data.ticket;
+    showScreen('queue-screen');
+    handleStatus(data);
+}
+
+async function pollTicket() {
+    const current = ticket;
+    if (!current) return;
+    try {
+        const response = await fetch(`/api/matchmaking/${current}?wait=${POLL_WAIT}`);
+        if (current !== ticket) return;     // Cancelled meanwhile
+        if (response.status === 404) {
+            ticket = null;
+            showScreen('find-screen');
+            document.getElementById('find-error').innerHTML =
+                '<p style="color: #ff9800;">Your place in the queue expired, please try again</p>';
+            return;
+        }
+        handleStatus(await response.json());
+    } catch (e) {
+        console.log('⚠️ Matchmaking poll failed, retrying:', e);
+        setTimeout(pollTicket, 2000);
+    }
+}
+
+function handleStatus(data) {
+    if (data.status === 'matched') {
+        window.location.href = `/player?room=${encodeURIComponent(data.room)}`;
+        return;
+    }
+    document.getElementById('queueStatus').textContent =
+        `${data.waiting} of ${data.seats} studios waiting (${Math.round(data.waited)}s)...`;
+    pollTicket();
+}
+
+function leaveQueue() {
+    if (ticket) {
+        fetch(`/api/matchmaking/${ticket}`, { method: 'DELETE' });
+        ticket = null;
+    }
+    showScreen('find-screen');
+}
+
+function showScreen(screenId) {
+    document.querySelectorAll('.screen').forEach(s => s.classList.remove('active'));
+    document.getElementById(screenId).classList.add('active');
+}
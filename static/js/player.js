@@ -1,16 +1,38 @@
 // Player screen logic for Hollywood Moguls
 
-const socket = io();
+// Each game runs in its own room, picked with ?room=<id> (default 'main')
+const ROOM = new URLSearchParams(window.location.search).get('room') || 'main';
+const socket = io({ query: { room: ROOM, codecs: WIRE_CODECS } });
+
+// The room was moved to another server process: reconnect there (the
+// player's resume token and missed updates carry over)
+socket.on('room_moved', (data) => {
+    const target = new URL(window.location.href);
+    target.port = data.port;
+    socket.io.uri = target.origin;
+    socket.disconnect();
+    socket.connect();
+});
 let myName = '';
+let myPlayerId = null;
+let resumeToken = null;
+let lastState = null;
 let currentPackage = [];
 let greenlitFilms = [];
 let currentBidAmount = 0;
+let minimumBid = 0;            // Live auctions: the least raise that would lead
 
 // Check for saved session on page load
 const savedPlayerName = sessionStorage.getItem('playerName');
 if (savedPlayerName) {
     myName = savedPlayerName;
+    myPlayerId = sessionStorage.getItem('playerId');
+    resumeToken = sessionStorage.getItem('resumeToken');
     console.log('📱 Found saved session for:', myName);
+    if (!resumeToken) {
+        // Sent here by the find-a-game page: the name is already chosen
+        document.getElementById('playerName').value = myName;
+    }
 }
 
 // Configure Socket.IO reconnection
@@ -27,12 +49,39 @@ function updateConnectionStatus(status, message) {
 
 // Socket.IO reconnection handlers
 socket.on('connect', () => {
-    // Auto-rejoin if we have saved name
-    if (myName && myName !== '') {
-        socket.emit('join_game', {name: myName});
+    // Reclaim our seat with the resume token, asking only for missed updates
+    if (resumeToken) {
+        socket.emit('resume_session', {
+            token: resumeToken,
+            last_version: lastState ? lastState.version : -1
+        });
     }
 });
 
+// Reconnect backoff advertised by the server, jittered so that after a
+// Wi-Fi drop the whole room doesn't reconnect at the same instant
+socket.on('reconnect_policy', (policy) => {
+    socket.io.reconnectionDelay(policy.delay);
+    socket.io.reconnectionDelayMax(policy.delay_max);
+    socket.io.randomizationFactor(policy.randomization);
+});
+
+// The server is working through a reconnection storm: ask again later
+socket.on('retry_later', (data) => {
+    updateConnectionStatus('disconnected', 'Server busy, rejoining shortly...');
+    setTimeout(() => {
+        if (!socket.connected) return;  // The next connect resumes anyway
+        if (data.event === 'resume_session' && resumeToken) {
+            socket.emit('resume_session', {
+                token: resumeToken,
+                last_version: lastState ? lastState.version : -1
+            });
+        } else if (data.event === 'join_game' && myName) {
+            socket.emit('join_game', {name: myName});
+        }
+    }, data.after_ms);
+});
+
 socket.on('disconnect', (reason) => {
     updateConnectionStatus('disconnected', 'Connection lost...');
 });
@@ -89,11 +138,16 @@ function joinGame() {
     }
 }
 
-socket.on('joined', () => {
+socket.on('joined', (data) => {
+    myName = data.name;
+    myPlayerId = data.player_id;
+    resumeToken = data.token;
     console.log('✅ Successfully joined game as:', myName);
     
     // Save to session storage
     sessionStorage.setItem('playerName', myName);
+    sessionStorage.setItem('playerId', myPlayerId);
+    sessionStorage.setItem('resumeToken', resumeToken);
 
     showScreen('lobby-screen');
     document.getElementById('studioName').textContent = myName;
@@ -106,6 +160,19 @@ socket.on('joined', () => {
 
 });
 
+socket.on('join_error', (data) => {
+    alert(data.message);
+});
+
+socket.on('resume_failed', (data) => {
+    console.log('⚠️ Could not resume session:', data.message);
+    resumeToken = null;
+    myPlayerId = null;
+    sessionStorage.removeItem('playerId');
+    sessionStorage.removeItem('resumeToken');
+    showScreen('join-screen');
+});
+
 socket.on('selection_error', (data) => {
     alert(data.message);
 });
@@ -114,12 +181,71 @@ socket.on('package_error', (data) => {
     alert(data.message);
 });
 
+socket.on('package_suggestions', (data) => {
+    renderPackageSuggestions(data);
+});
+
 socket.on('vote_error', (data) => {
     alert(data.message);
 });
 
-socket.on('game_update', (data) => {
-    const myData = data.players[socket.id];
+socket.on('naming_error', (data) => {
+    alert(data.message);
+});
+
+socket.on('bid_error', (data) => {
+    if (lastState && lastState.bidding_mode === 'auction') {
+        // Raises race each other in a live auction; being outbid isn't worth a popup
+        document.getElementById('bid-status').innerHTML +=
+            `<p style="color: #ff9800; text-align: center;">${data.message}</p>`;
+        return;
+    }
+    alert(data.message);
+});
+
+// Leading bids of live auctions, streamed at a capped rate between full updates
+socket.on('auction_update', (data) => {
+    serverClockOffset = data.server_time - Date.now() / 1000;
+    if (!lastState || !lastState.phase.endsWith('_bidding') || !lastState.bidding_war.active) return;
+    data.wars.forEach(update => {
+        const war = lastState.bidding_war.wars.find(w => w.card_index === update.card_index);
+        if (war) {
+            war.bids = update.bids;
+            war.closes_at = update.closes_at;
+        }
+    });
+    updateBiddingView(lastState, lastState.players[myPlayerId]);
+});
+
+// How game updates will be encoded (see wire.js)
+socket.on('codec', (info) => {
+    wireCodec = info;
+});
+
+socket.on('game_update', (payload) => {
+    const data = decodeState(payload);
+    lastState = data;
+    renderGameState(data);
+    // Tells the server this phone keeps up; until it does, newer states are held back
+    socket.emit('update_ack', { version: data.version });
+});
+
+// Missed updates after a reconnect: apply each changed field in order
+socket.on('game_replay', (data) => {
+    if (!lastState) {
+        socket.emit('request_update');
+        return;
+    }
+    data.updates.forEach(update => {
+        Object.assign(lastState, update.changes);
+        lastState.version = update.version;
+    });
+    lastState.version = data.version;
+    renderGameState(lastState);
+});
+
+function renderGameState(data) {
+    const myData = data.players[myPlayerId];
     if (!myData) return;
     
     // Update money displays
@@ -131,22 +257,36 @@ socket.on('game_update', (data) => {
     document.getElementById('resultsMoney').textContent = myData.money;
     document.getElementById('relScore').textContent = myData.score;
     
-    // Update greenlit films from server
-    if (myData.films) {
-        greenlitFilms = myData.films;
+    // Update greenlit films from server (fetched only when the film list changes)
+    fetchCollection('get_films', { studio: myPlayerId }, data.collections.films.version, films => {
+        greenlitFilms = films;
+        updateGreenlitDisplay();
+    });
+    
+    // Matchmade tables start by themselves once everyone is seated
+    if (data.phase === 'lobby' && data.match) {
+        document.getElementById('lobbyStatus').textContent =
+            `Matched table: ${Object.keys(data.players).length}/${data.match.seats} studios here - the game starts when the table is full`;
+    }
+    if (data.match && data.match.closed) {
+        showScreen('lobby-screen');
+        document.getElementById('lobbyStatus').innerHTML =
+            'Not enough studios showed up for this table. <a href="/play">Find another game</a>';
+        return;
     }
     
     // Handle phase transitions
     if (data.phase === 'phase0_naming') {
         showScreen('naming-screen');
         
-        const myProg = data.naming_progress.submissions[socket.id];
+        const myProg = data.naming_progress.submissions[myPlayerId];
         if (!myProg) return;
         
         if (myProg.complete) {
             document.getElementById('roleType').textContent = 'All Done!';
             document.getElementById('roleProgress').textContent = 'Waiting for other players...';
             document.getElementById('submit-btn').disabled = true;
+            document.getElementById('submit-all-btn').disabled = true;
             document.getElementById('talentName').disabled = true;
             return;
         }
@@ -169,6 +309,7 @@ socket.on('game_update', (data) => {
             document.getElementById('roleType').textContent = 'All Done!';
             document.getElementById('roleProgress').textContent = 'Waiting for other players...';
             document.getElementById('submit-btn').disabled = true;
+            document.getElementById('submit-all-btn').disabled = true;
             document.getElementById('talentName').disabled = true;
             return;
         }
@@ -182,6 +323,7 @@ socket.on('game_update', (data) => {
         document.getElementById('roleType').textContent = roleLabels[currentRole];
         document.getElementById('roleProgress').textContent = `${currentCount + 1} of ${maxCount}`;
         document.getElementById('submit-btn').disabled = false;
+        document.getElementById('submit-all-btn').disabled = false;
         document.getElementById('talentName').disabled = false;
         
         // ONLY pre-fill with default name if this is a NEW role type
@@ -261,7 +403,7 @@ socket.on('game_update', (data) => {
         showScreen('awards-results-screen');
         updateAwardsResultsView(data, myData);
     }
-});
+}
 
 function submitName() {
     const name = document.getElementById('talentName').value.trim();
@@ -270,6 +412,32 @@ function submitName() {
     }
 }
 
+// Talent each player names in phase 0, in the order the server fills them
+const NAMING_QUOTAS = {screenwriter: 3, director: 3, star: 5};
+
+function submitSuggestedNames() {
+    /**
+     * Submit the typed name plus the suggestions for every remaining slot
+     * in a single message
+     */
+    const myProg = lastState && lastState.naming_progress.submissions[myPlayerId];
+    if (!myProg) return;
+    
+    const names = [];
+    for (const [role, quota] of Object.entries(NAMING_QUOTAS)) {
+        for (let count = myProg[role].length; count < quota; count++) {
+            names.push(getDefaultName(role, count) || `${role} ${count + 1}`);
+        }
+    }
+    const typed = document.getElementById('talentName').value.trim();
+    if (typed && names.length) {
+        names[0] = typed;
+    }
+    if (names.length) {
+        socket.emit('submit_talent_names', {names: names});
+    }
+}
+
 function selectCard(index) {
     socket.emit('select_card', {index: index});
 }
@@ -309,7 +477,7 @@ function renderProductionCards(data, myData) {
         phase: data.phase,
         turn: data.turn,
         player_selections: data.player_selections,
-        my_selection: data.player_selections?.[socket.id]
+        my_selection: data.player_selections?.[myPlayerId]
     });
 
     // Safety check: if phase is production, selections should be empty or valid for current turn
@@ -329,8 +497,8 @@ function renderProductionCards(data, myData) {
     cardsArea.innerHTML = '<h3>Select a Role:</h3>';
     
     data.current_turn_cards.forEach((card, index) => {
-        const selected = data.player_selections[socket.id] === index;
-        const disabled = data.player_selections[socket.id] !== undefined;
+        const selected = data.player_selections[myPlayerId] === index;
+        const disabled = data.player_selections[myPlayerId] !== undefined;
         const canAfford = myData.money >= card.salary;
         
         cardsArea.innerHTML += `
@@ -348,8 +516,8 @@ function renderProductionCards(data, myData) {
         `;
     });
     
-    const passDisabled = data.player_selections[socket.id] !== undefined;
-    const passSelected = data.player_selections[socket.id] === 'pass';
+    const passDisabled = data.player_selections[myPlayerId] !== undefined;
+    const passSelected = data.player_selections[myPlayerId] === 'pass';
     cardsArea.innerHTML += `
         <button onclick="selectPass()" ${passDisabled ? 'disabled' : ''} 
                 style="background: #666; margin-top: 10px;">
@@ -358,7 +526,7 @@ function renderProductionCards(data, myData) {
     `;
     
     const statusDiv = document.getElementById('selection-status');
-    if (data.player_selections[socket.id] !== undefined) {
+    if (data.player_selections[myPlayerId] !== undefined) {
         statusDiv.innerHTML = '<p style="color: #e50914;">✓ Selection made! Waiting for other players...</p>';
     } else {
         statusDiv.innerHTML = '';
@@ -493,6 +661,48 @@ function updatePackageDisplay(availableRoles, noNameTalent) {
     }
 }
 
+function suggestPackages(objective) {
+    document.getElementById('package-suggestions').innerHTML = '<p><em>Thinking...</em></p>';
+    socket.emit('suggest_packages', { objective: objective, top_k: 3 });
+}
+
+function renderPackageSuggestions(data) {
+    const div = document.getElementById('package-suggestions');
+    if (data.suggestions.length === 0) {
+        div.innerHTML = '<p><em>No suggestions - you have no roles to package</em></p>';
+        return;
+    }
+    
+    const roles = (lastState && lastState.players[myPlayerId].roles) || [];
+    const noNameArray = Object.values((lastState && lastState.no_name_talent) || {});
+    const roleName = idx => {
+        const role = idx < 0 ? noNameArray[Math.abs(idx) - 1] : roles[idx];
+        return role ? role.name : '?';
+    };
+    
+    div.innerHTML = '';
+    data.suggestions.forEach((suggestion, s) => {
+        let html = `<div style="margin: 10px 0; border-top: 1px solid #444;"><h4>Option ${s + 1}</h4>`;
+        suggestion.films.forEach(film => {
+            html += `
+                <p>🎬 ${film.role_indices.map(roleName).join(', ')}<br>
+                Heat: ${film.heat} | Prestige: ${film.prestige} | ${film.genre} / ${film.audience}
+                <button onclick='usePackage(${JSON.stringify(film.role_indices)})'>Use</button></p>
+            `;
+        });
+        div.innerHTML += html + '</div>';
+    });
+    if (!data.complete) {
+        div.innerHTML += '<p style="color: #888;"><em>Best found in the time available</em></p>';
+    }
+}
+
+function usePackage(roleIndices) {
+    currentPackage = roleIndices.slice();
+    document.getElementById('package-suggestions').innerHTML = '';
+    socket.emit('request_update');
+}
+
 function clearPackage() {
     currentPackage = [];
     socket.emit('request_update');
@@ -514,12 +724,47 @@ function greenlight() {
     });
     
     currentPackage = [];
+    document.getElementById('package-suggestions').innerHTML = '';
     document.getElementById('filmTitle').value = '';
     document.getElementById('filmTeaser').value = '';
 }
 
+// Paginated collections (talent pool, films) cached by query and version
+const PAGE_SIZE = 50;
+const collectionCache = {};
+
+function fetchCollection(event, query, version, onLoaded) {
+    const key = event + JSON.stringify(query);
+    const cached = collectionCache[key];
+    if (cached && cached.version === version) {
+        onLoaded(cached.items);
+        return;
+    }
+    
+    const items = [];
+    const loadPage = cursor => {
+        socket.emit(event, { ...query, cursor: cursor, limit: PAGE_SIZE }, page => {
+            if (page.error) {
+                // The collection changed mid-way: start over from the first page
+                if (cursor) loadPage(null);
+                return;
+            }
+            if (!cursor) items.length = 0;
+            items.push(...page.items);
+            if (page.next_cursor) {
+                loadPage(page.next_cursor);
+            } else {
+                collectionCache[key] = { version: page.version, items: items };
+                onLoaded(items);
+            }
+        });
+    };
+    loadPage(null);
+}
+
 function updateGreenlitDisplay() {
     const greenlitDiv = document.getElementById('greenlit-films');
+    if (!greenlitDiv) return;
     if (greenlitFilms.length === 0) {
         greenlitDiv.innerHTML = '<p><em>No films greenlit yet</em></p>';
     } else {
@@ -542,18 +787,9 @@ function finishPackaging() {
     }
 }
 
-function updateReleasesView(gameData, playerData, seasonName) {
-    const continueBtn = document.getElementById('continue-btn');
-    if (seasonName === 'Spring') {
-        continueBtn.textContent = 'Continue to Summer Production ☀️';
-        continueBtn.onclick = () => socket.emit('continue_to_summer');
-    } else {
-        continueBtn.textContent = 'Continue to Award Season 🏆';
-        continueBtn.onclick = () => socket.emit('start_awards');
-    }
-    
+function renderReleasedFilms(films, playerData) {
     const myFilmsDiv = document.getElementById('my-films');
-    const myFilms = playerData.films || [];
+    const myFilms = films.filter(film => film.player_id === myPlayerId);
     
     if (myFilms.length === 0) {
         myFilmsDiv.innerHTML = '<p><em>You didn\'t release any films this season</em></p>';
@@ -575,18 +811,8 @@ function updateReleasesView(gameData, playerData, seasonName) {
     const allFilmsDiv = document.getElementById('all-films');
     allFilmsDiv.innerHTML = '';
     
-    let allFilms = [];
-    for (let [sid, player] of Object.entries(gameData.players)) {
-        if (player.films) {
-            player.films.forEach(film => {
-                allFilms.push({
-                    ...film,
-                    studio: player.name
-                });
-            });
-        }
-    }
-    
+    // Films arrive with their box office results already merged in
+    const allFilms = [...films];
     allFilms.sort((a, b) => b.box_office - a.box_office);
     
     allFilms.forEach((film, index) => {
@@ -600,13 +826,28 @@ function updateReleasesView(gameData, playerData, seasonName) {
             </div>
         `;
     });
+}
+
+function updateReleasesView(gameData, playerData, seasonName) {
+    const continueBtn = document.getElementById('continue-btn');
+    if (seasonName === 'Spring') {
+        continueBtn.textContent = 'Continue to Summer Production ☀️';
+        continueBtn.onclick = () => socket.emit('continue_to_summer');
+    } else {
+        continueBtn.textContent = 'Continue to Award Season 🏆';
+        continueBtn.onclick = () => socket.emit('start_awards');
+    }
+    
+    fetchCollection('get_films', {}, gameData.collections.films.version, films => {
+        renderReleasedFilms(films, playerData);
+    });
     
     // Show ready status
     const statusDiv = document.getElementById('releases-ready-status');
-    const readyFlag = seasonName === 'Spring' ? 'spring_releases_ready' : 'holiday_releases_ready';
-    const readyCount = Object.values(gameData.players).filter(p => p[readyFlag]).length;
-    const totalCount = Object.keys(gameData.players).length;
-    const imReady = playerData[readyFlag];
+    const gate = gameData.ready[seasonName === 'Spring' ? 'spring_releases' : 'holiday_releases'];
+    const readyCount = gate.ready;
+    const totalCount = gate.total;
+    const imReady = gate.arrived.includes(myPlayerId);
     
     if (imReady) {
         statusDiv.innerHTML = `<p style="color: #4CAF50; font-size: 18px;">✓ You're ready! Waiting for others... (${readyCount}/${totalCount})</p>`;
@@ -619,6 +860,7 @@ function updateReleasesView(gameData, playerData, seasonName) {
         } else {
             statusDiv.innerHTML = '';
         }
+        statusDiv.innerHTML += readyDeadlineText(gate);
     }
 }
 
@@ -640,11 +882,11 @@ function updateAwardsVotingView(gameData, playerData) {
     nomineesArea.innerHTML = '';
     
     const myStudio = playerData.name;
-    const hasVoted = category.votes[socket.id] !== undefined;
+    const hasVoted = category.votes[myPlayerId] !== undefined;
     
     category.nominees.forEach((film, index) => {
         const isMyFilm = film.studio === myStudio;
-        const isSelected = category.votes[socket.id] === index;
+        const isSelected = category.votes[myPlayerId] === index;
         
         nomineesArea.innerHTML += `
             <div class="info-box" style="margin: 10px 0; ${isSelected ? 'border: 2px solid #FFD700;' : ''} ${isMyFilm ? 'opacity: 0.5;' : ''}">
@@ -661,7 +903,7 @@ function updateAwardsVotingView(gameData, playerData) {
     
     const statusDiv = document.getElementById('vote-status');
     if (hasVoted) {
-        const votedFilm = category.nominees[category.votes[socket.id]];
+        const votedFilm = category.nominees[category.votes[myPlayerId]];
         statusDiv.innerHTML = `<p style="color: #FFD700; font-size: 18px;">✓ You voted for: <strong>${votedFilm.title}</strong></p><p>Waiting for other players...</p>`;
     } else {
         statusDiv.innerHTML = '';
@@ -702,7 +944,7 @@ function updateAwardsResultsView(gameData, playerData) {
         standingsDiv.innerHTML += `
             <div class="info-box" style="margin: 10px 0; ${isMe ? 'border: 2px solid #e50914;' : ''}">
                 <p style="font-size: 20px; margin: 0;">${medal} <strong>${player.name}</strong></p>
-                <p style="margin: 5px 0;">${player.score} points | ${player.films ? player.films.length : 0} films</p>
+                <p style="margin: 5px 0;">${player.score} points | ${player.film_count || 0} films</p>
             </div>
         `;
     });
@@ -710,9 +952,10 @@ function updateAwardsResultsView(gameData, playerData) {
     // Show ready status
     const statusDiv = document.getElementById('awards-ready-status');
     const awardsBtn = document.getElementById('continue-awards-btn');
-    const readyCount = Object.values(gameData.players).filter(p => p.awards_results_ready).length;
-    const totalCount = Object.keys(gameData.players).length;
-    const imReady = playerData.awards_results_ready;
+    const gate = gameData.ready.awards_results;
+    const readyCount = gate.ready;
+    const totalCount = gate.total;
+    const imReady = gate.arrived.includes(myPlayerId);
     
     if (imReady) {
         statusDiv.innerHTML = `<p style="color: #4CAF50; font-size: 18px;">✓ You're ready! Waiting for others... (${readyCount}/${totalCount})</p>`;
@@ -725,6 +968,7 @@ function updateAwardsResultsView(gameData, playerData) {
         } else {
             statusDiv.innerHTML = '';
         }
+        statusDiv.innerHTML += readyDeadlineText(gate);
     }
 }
 
@@ -750,14 +994,18 @@ function updateBiddingView(gameData, playerData) {
     
      console.log('✅ Active bidding war confirmed');
 
-    const cardData = biddingWar.card_data;
-    const isParticipant = biddingWar.participants.includes(socket.id);
-    const hasAlreadyBid = biddingWar.bids && biddingWar.bids[socket.id] !== undefined;
+    // Several wars can run at once; show the one this player is fighting in
+    const war = myBiddingWar(biddingWar);
+
+    const cardData = war.card_data;
+    const isParticipant = war.participants.includes(myPlayerId);
+    const hasAlreadyBid = war.bids && war.bids[myPlayerId] !== undefined;
     
     // ALWAYS check if this is a new bidding war and reset bid amount
-    const currentCard = biddingWar.card_index;
+    const currentCard = war.card_index;
     if (window.lastBiddingCardIndex !== currentCard) {
         currentBidAmount = 0;
+        minimumBid = 0;
         window.lastBiddingCardIndex = currentCard;
         console.log('New bidding war detected - reset bid to $0M');
     }
@@ -787,12 +1035,21 @@ function updateBiddingView(gameData, playerData) {
     // Set base salary
     document.getElementById('baseSalary').textContent = cardData.salary;
     
+    const isAuction = gameData.bidding_mode === 'auction';
+    document.getElementById('submit-bid-btn').textContent = isAuction ? 'Raise 🔨' : 'Submit Bid';
+    if (isAuction && isParticipant) {
+        updateAuctionView(gameData, war, playerData);
+        return;
+    }
+    
     if (!isParticipant) {
         // Not participating in this bidding war
         document.getElementById('bid-status').innerHTML = `
             <div class="info-box" style="background: #2a2a2a; text-align: center;">
                 <p style="font-size: 18px; color: #aaa;">
-                    You're not involved in this bidding war.
+                    ${biddingWar.wars.length > 1
+                        ? `You're not involved in any of the ${biddingWar.wars.length} bidding wars.`
+                        : "You're not involved in this bidding war."}
                 </p>
                 <p style="margin-top: 10px;">Waiting for other players to bid...</p>
             </div>
@@ -806,7 +1063,7 @@ function updateBiddingView(gameData, playerData) {
 
     } else if (hasAlreadyBid) {
         // Already submitted bid
-        const myBid = biddingWar.bids[socket.id];
+        const myBid = war.bids[myPlayerId];
         document.getElementById('bid-status').innerHTML = `
             <div class="info-box" style="background: #1a1a1a; border: 2px solid #4CAF50; text-align: center;">
                 <p style="font-size: 20px; color: #4CAF50;">✓ Bid Submitted!</p>
@@ -838,14 +1095,14 @@ function updateBiddingView(gameData, playerData) {
     // Show disconnect status for waiting participants (if already bid)
     if (hasAlreadyBid) {
         const disconnectTimes = biddingWar.disconnect_times || {};
-        const waitingParticipants = biddingWar.participants.filter(sid => !biddingWar.bids[sid]);
+        const waitingParticipants = war.participants.filter(sid => war.bids[sid] === undefined);
 
         if (waitingParticipants.length > 0) {
             let waitingHtml = '<div style="margin-top: 20px; color: #aaa; text-align: left;">';
             waitingHtml += '<p style="margin: 5px 0;">Waiting for:</p><ul style="margin: 5px 0; padding-left: 20px;">';
 
             waitingParticipants.forEach(sid => {
-                const playerName = data.players[sid]?.name || 'Unknown';
+                const playerName = gameData.players[sid]?.name || 'Unknown';
                 const isDisconnected = disconnectTimes[sid] !== undefined;
 
                 if (isDisconnected) {
@@ -865,6 +1122,64 @@ function updateBiddingView(gameData, playerData) {
     }
 }
 
+// Live auctions: the server's clock minus ours, in seconds (from auction_update)
+let serverClockOffset = 0;
+const AUCTION_MIN_RAISE = 1;
+
+function auctionSecondsLeft(closesAt) {
+    return Math.max(0, Math.ceil(closesAt - (Date.now() / 1000 + serverClockOffset)));
+}
+
+// Tick down every auction clock on screen
+setInterval(() => {
+    document.querySelectorAll('.auction-clock').forEach(el => {
+        el.textContent = auctionSecondsLeft(parseFloat(el.dataset.closesAt));
+    });
+}, 1000);
+
+function updateAuctionView(gameData, war, playerData) {
+    /**
+     * Live auction: keep raising over the high bid until the window closes
+     */
+    const leader = Object.keys(war.bids)[0];
+    const highBid = leader !== undefined ? war.bids[leader] : null;
+    const leading = leader === myPlayerId;
+    minimumBid = highBid === null ? 0 : highBid + AUCTION_MIN_RAISE;
+    if (currentBidAmount < minimumBid) {
+        currentBidAmount = minimumBid;
+    }
+    
+    const leadText = highBid === null
+        ? 'No bids yet - open the bidding!'
+        : `🔨 High bid: $${highBid}M by ${leading ? 'you' : gameData.players[leader].name}`;
+    document.getElementById('bid-status').innerHTML = `
+        <div class="info-box" style="background: #1a1a1a; border: 2px solid ${leading ? '#4CAF50' : '#FFD700'}; text-align: center;">
+            <p style="font-size: 20px; margin: 5px 0;">${leadText}</p>
+            <p style="color: #aaa;">
+                Closes in <span class="auction-clock" data-closes-at="${war.closes_at}">${auctionSecondsLeft(war.closes_at)}</span>s
+                (every new bid keeps it open a little longer)
+            </p>
+        </div>
+    `;
+    
+    // The leader waits to be outbid; everyone else can raise
+    const visibility = leading ? 'hidden' : 'visible';
+    document.querySelector('[onclick="decreaseBid()"]').style.visibility = visibility;
+    document.querySelector('[onclick="increaseBid()"]').style.visibility = visibility;
+    document.getElementById('currentBid').parentElement.parentElement.style.visibility = visibility;
+    document.getElementById('submit-bid-btn').style.display = leading ? 'none' : 'block';
+    if (!leading) {
+        updateBidDisplay(war.card_data.salary, playerData.money);
+    }
+}
+
+function myBiddingWar(biddingWar) {
+    /**
+     * The running bidding war this player is in (or the first one, to watch)
+     */
+    return biddingWar.wars.find(w => w.participants.includes(myPlayerId)) || biddingWar.wars[0];
+}
+
 function updateBidDisplay(baseSalary, playerMoney) {
     /**
      * Updates the bid display elements (current bid, total cost, affordability)
@@ -902,9 +1217,9 @@ function increaseBid() {
 
 function decreaseBid() {
     /**
-     * Decrease bid by $1M (minimum $0M)
+     * Decrease bid by $1M (down to $0M, or the least raise in an auction)
      */
-    if (currentBidAmount > 0) {
+    if (currentBidAmount > minimumBid) {
         currentBidAmount--;
         const baseSalary = parseInt(document.getElementById('baseSalary').textContent);
         const playerMoney = parseInt(document.getElementById('biddingMoney').textContent);
@@ -917,7 +1232,8 @@ function submitBid() {
      * Submit the current bid to the server
      */
     console.log(`Submitting bid: $${currentBidAmount}M`);
-    socket.emit('submit_bid', {bid_amount: currentBidAmount});
+    const event = lastState && lastState.bidding_mode === 'auction' ? 'raise_bid' : 'submit_bid';
+    socket.emit(event, {bid_amount: currentBidAmount});
 }
 
 function updateBiddingResultsView(gameData, playerData) {
@@ -933,9 +1249,10 @@ function updateBiddingResultsView(gameData, playerData) {
     // Update budget display
     document.getElementById('resultsMoney').textContent = playerData.money;
 
-    const cardData = biddingWar.card_data;
-    const bids = biddingWar.bids || {};
-    const participants = biddingWar.participants || [];
+    const war = myBiddingWar(biddingWar);
+    const cardData = war.card_data;
+    const bids = war.bids || {};
+    const participants = war.participants || [];
     
     // Display the contested role name
     document.getElementById('contestedRoleName').textContent = cardData.name;
@@ -954,7 +1271,7 @@ function updateBiddingResultsView(gameData, playerData) {
         .sort((a, b) => b.bid - a.bid);
     
     sortedBids.forEach((bidder, index) => {
-        const isMe = bidder.sid === socket.id;
+        const isMe = bidder.sid === myPlayerId;
         const isHighest = index === 0;
         const borderColor = isMe ? '#e50914' : (isHighest ? '#4CAF50' : '#666');
         
@@ -970,13 +1287,34 @@ function updateBiddingResultsView(gameData, playerData) {
         `;
     });
     
+    // Outcome of the other wars that ran at the same time
+    const otherWars = biddingWar.wars.filter(w => w !== war);
+    if (otherWars.length > 0) {
+        allBidsDiv.innerHTML += '<h3>Other Bidding Wars:</h3>';
+        otherWars.forEach(w => {
+            const outcome = w.winner
+                ? `won by ${gameData.players[w.winner].name} for $${w.card_data.salary + w.winning_bid}M`
+                : w.winning_bid === null ? 'no bids - nobody gets the role' : 'tied - nobody gets the role';
+            allBidsDiv.innerHTML += `<p>${w.card_data.name}: ${outcome}</p>`;
+        });
+    }
+    
     // Determine winner
-    const maxBid = Math.max(...Object.values(bids));
+    const maxBid = war.winning_bid;
     const winners = participants.filter(sid => bids[sid] === maxBid);
     
     const winnerBox = document.getElementById('winner-announcement-box');
     
-    if (winners.length > 1) {
+    if (winners.length === 0) {
+        // A live auction nobody bid in
+        winnerBox.innerHTML = `
+            <h1 style="font-size: 48px; margin: 20px 0;">🦗</h1>
+            <h2 style="color: #ff9800; margin: 10px 0;">NO BIDS</h2>
+            <p style="font-size: 18px; color: #aaa;">
+                Nobody bid for ${cardData.name}, who stays unsigned.
+            </p>
+        `;
+    } else if (winners.length > 1) {
         // TIE - Nobody gets it!
         winnerBox.innerHTML = `
             <h1 style="font-size: 48px; margin: 20px 0;">💔</h1>
@@ -995,7 +1333,7 @@ function updateBiddingResultsView(gameData, playerData) {
         // We have a winner!
         const winnerSid = winners[0];
         const winnerName = gameData.players[winnerSid].name;
-        const isYou = winnerSid === socket.id;
+        const isYou = winnerSid === myPlayerId;
         
         winnerBox.innerHTML = `
             <h1 style="font-size: 64px; margin: 20px 0;">🏆</h1>
@@ -1016,9 +1354,10 @@ function updateBiddingResultsView(gameData, playerData) {
     // Show ready status
     const statusDiv = document.getElementById('bidding-ready-status');
     const biddingBtn = document.querySelector('#bidding-results-screen button');
-    const readyCount = Object.values(gameData.players).filter(p => p.bidding_results_ready).length;
-    const totalCount = Object.keys(gameData.players).length;
-    const imReady = playerData.bidding_results_ready;
+    const gate = gameData.ready.bidding_results;
+    const readyCount = gate.ready;
+    const totalCount = gate.total;
+    const imReady = gate.arrived.includes(myPlayerId);
     
     if (imReady) {
         statusDiv.innerHTML = `<p style="color: #4CAF50; font-size: 18px;">✓ You're ready! Waiting for others... (${readyCount}/${totalCount})</p>`;
@@ -1031,9 +1370,16 @@ function updateBiddingResultsView(gameData, playerData) {
         } else {
             statusDiv.innerHTML = '';
         }
+        statusDiv.innerHTML += readyDeadlineText(gate);
     }
 }
 
+function readyDeadlineText(gate) {
+    if (!gate.deadline) return '';
+    const secondsLeft = Math.max(0, Math.round(gate.deadline - Date.now() / 1000));
+    return `<p style="color: #888; font-size: 14px;">Auto-continues in ${secondsLeft}s</p>`;
+}
+
 function continueAfterBidding() {
     /**
      * Signal to server that we're ready to continue after viewing results
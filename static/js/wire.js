@@ -0,0 +1,108 @@
+// Hollywood Moguls - Decoding game updates in the codec the server picked
+// (see wire.py). Loaded before host.js / player.js.
+
+// Most preferred first; the server answers with a 'codec' event
+const WIRE_CODECS = 'msgpack,orjson,json';
+let wireCodec = { codec: 'json' };
+
+function decodeState(payload) {
+    // json: Socket.IO has decoded it already
+    if (!(payload instanceof ArrayBuffer) && !ArrayBuffer.isView(payload)) return payload;
+    const bytes = payload instanceof ArrayBuffer
+        ? new Uint8Array(payload)
+        : new Uint8Array(payload.buffer, payload.byteOffset, payload.byteLength);
+    if (wireCodec.codec === 'msgpack') return decodeMsgpack(bytes, wireCodec.shapes);
+    return JSON.parse(new TextDecoder().decode(bytes));
+}
+
+// MessagePack, plus ext type 1: a card or film sent as [shape, ...values]
+function decodeMsgpack(bytes, shapes) {
+    const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+    const text = new TextDecoder();
+    let pos = 0;
+
+    function number(size, getter) {
+        const value = view[getter](pos);
+        pos += size;
+        return value;
+    }
+    function str(length) {
+        const value = text.decode(bytes.subarray(pos, pos + length));
+        pos += length;
+        return value;
+    }
+    function bin(length) {
+        const value = bytes.slice(pos, pos + length);
+        pos += length;
+        return value;
+    }
+    function array(length) {
+        const value = new Array(length);
+        for (let i = 0; i < length; i++) value[i] = read();
+        return value;
+    }
+    function map(length) {
+        const value = {};
+        for (let i = 0; i < length; i++) {
+            const key = read();
+            value[key] = read();
+        }
+        return value;
+    }
+    function ext(length) {
+        const type = number(1, 'getInt8');
+        const end = pos + length;
+        if (type !== 1) {
+            pos = end;
+            return null;
+        }
+        const [shape, ...values] = read();
+        const record = {};
+        shapes[shape].forEach((key, i) => { record[key] = values[i]; });
+        pos = end;
+        return record;
+    }
+    function read() {
+        const byte = bytes[pos++];
+        if (byte <= 0x7f) return byte;
+        if (byte <= 0x8f) return map(byte & 0x0f);
+        if (byte <= 0x9f) return array(byte & 0x0f);
+        if (byte <= 0xbf) return str(byte & 0x1f);
+        if (byte >= 0xe0) return byte - 0x100;
+        switch (byte) {
+            case 0xc0: return null;
+            case 0xc2: return false;
+            case 0xc3: return true;
+            case 0xc4: return bin(number(1, 'getUint8'));
+            case 0xc5: return bin(number(2, 'getUint16'));
+            case 0xc6: return bin(number(4, 'getUint32'));
+            case 0xc7: return ext(number(1, 'getUint8'));
+            case 0xc8: return ext(number(2, 'getUint16'));
+            case 0xc9: return ext(number(4, 'getUint32'));
+            case 0xca: return number(4, 'getFloat32');
+            case 0xcb: return number(8, 'getFloat64');
+            case 0xcc: return number(1, 'getUint8');
+            case 0xcd: return number(2, 'getUint16');
+            case 0xce: return number(4, 'getUint32');
+            case 0xcf: return Number(number(8, 'getBigUint64'));
+            case 0xd0: return number(1, 'getInt8');
+            case 0xd1: return number(2, 'getInt16');
+            case 0xd2: return number(4, 'getInt32');
+            case 0xd3: return Number(number(8, 'getBigInt64'));
+            case 0xd4: return ext(1);
+            case 0xd5: return ext(2);
+            case 0xd6: return ext(4);
+            case 0xd7: return ext(8);
+            case 0xd8: return ext(16);
+            case 0xd9: return str(number(1, 'getUint8'));
+            case 0xda: return str(number(2, 'getUint16'));
+            case 0xdb: return str(number(4, 'getUint32'));
+            case 0xdc: return array(number(2, 'getUint16'));
+            case 0xdd: return array(number(4, 'getUint32'));
+            case 0xde: return map(number(2, 'getUint16'));
+            case 0xdf: return map(number(4, 'getUint32'));
+        }
+        throw new Error(`Unexpected MessagePack byte 0x${byte.toString(16)}`);
+    }
+    return read();
+}
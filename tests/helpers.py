@@ -0,0 +1,39 @@
+"""
+Shared helpers for driving a GameEngine headless in tests
+"""
+import tournament
+from bots import STRATEGIES
+
+
+class FakeScheduler:
+    """Collects timers instead of running them; fire() runs the next one"""
+
+    def __init__(self):
+        self.calls = []
+
+    def call_later(self, delay, fn, *args):
+        self.calls.append((delay, fn, args))
+        return self
+
+    def cancel(self):
+        pass
+
+    def fire(self):
+        _, fn, args = self.calls.pop(0)
+        fn(*args)
+
+
+def seat_bots(engine, lineup, seed=0):
+    bots = {}
+    for seat, strategy in enumerate(lineup):
+        player_id, _ = engine.join(f'sid-{seat}', f'{strategy.title()} Studios {seat + 1}')
+        bots[player_id] = STRATEGIES[strategy](seed * 1000 + seat)
+    return bots
+
+
+def play_until(engine, bots, phase):
+    for _ in range(tournament.MAX_STEPS):
+        if engine.game_state.phase == phase:
+            return
+        tournament.play_phase(engine, bots)
+    raise AssertionError(f'Never reached {phase} (stuck in {engine.game_state.phase})')
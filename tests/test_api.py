@@ -0,0 +1,95 @@
+"""
+Read-only API: views are rendered once per state version, revalidated with
+ETags, and long-polled until the state moves on
+"""
+import threading
+
+import pytest
+from flask import Flask, redirect
+
+import api
+from rooms import RoomRegistry
+
+
+@pytest.fixture
+def rooms():
+    rooms = RoomRegistry()
+    room = rooms.get_or_create('main')
+    room.game_state.add_player('sid-ada', 'Ada')
+    room.game_state.record_update()
+    return rooms
+
+
+@pytest.fixture
+def client(rooms):
+    app = Flask(__name__)
+    api.register_api(app, rooms, lambda room_id: redirect('http://localhost:8082/') if room_id == 'away' else None)
+    return app.test_client()
+
+
+def update(room):
+    room.game_state.record_update()
+    room.notify_update()
+
+
+def test_views_are_rendered_once_per_version(client, rooms, monkeypatch):
+    renders = []
+    render_view, params = api.VIEWS['standings']
+    monkeypatch.setitem(api.VIEWS, 'standings', (lambda *args: renders.append(1) or render_view(*args), params))
+
+    first = client.get('/api/rooms/main/standings')
+    again = client.get('/api/rooms/main/standings')
+    assert first.status_code == again.status_code == 200
+    assert first.json['standings'][0]['name'] == 'Ada'
+    assert first.headers['Cache-Control'] == 'no-cache'
+    assert first.headers['ETag'] == again.headers['ETag']
+    assert len(renders) == 1
+
+    update(rooms.get('main'))
+    later = client.get('/api/rooms/main/standings')
+    assert later.headers['ETag'] != first.headers['ETag']
+    assert later.json['version'] == first.json['version'] + 1
+    assert len(renders) == 2
+
+
+def test_unchanged_state_revalidates_with_304(client, rooms):
+    etag = client.get('/api/rooms/main/phase').headers['ETag']
+    cached = client.get('/api/rooms/main/phase', headers={'If-None-Match': etag})
+    assert cached.status_code == 304 and cached.headers['ETag'] == etag and not cached.data
+
+    update(rooms.get('main'))
+    fresh = client.get('/api/rooms/main/phase', headers={'If-None-Match': etag})
+    assert fresh.status_code == 200 and fresh.headers['ETag'] != etag
+
+
+def test_query_variants_get_their_own_etag(client):
+    everything = client.get('/api/rooms/main/releases')
+    spring = client.get('/api/rooms/main/releases?season=Spring')
+    assert spring.json == {'season': 'Spring', 'films': [], 'version': everything.json['version']}
+    assert spring.headers['ETag'] != everything.headers['ETag']
+    assert client.get('/api/rooms/main/releases', headers={'If-None-Match': spring.headers['ETag']}).status_code == 200
+
+
+def test_long_poll_answers_when_the_state_moves_on(client, rooms):
+    response = client.get('/api/rooms/main/state')
+    etag, version = response.headers['ETag'], response.json['version']
+
+    timer = threading.Timer(0.1, update, (rooms.get('main'),))
+    timer.start()
+    polled = client.get('/api/rooms/main/state?wait=5', headers={'If-None-Match': etag})
+    timer.join()
+    assert polled.status_code == 200
+    assert polled.json['version'] == version + 1
+
+
+def test_long_poll_times_out_with_304(client):
+    etag = client.get('/api/rooms/main/awards').headers['ETag']
+    polled = client.get('/api/rooms/main/awards?wait=0.05', headers={'If-None-Match': etag})
+    assert polled.status_code == 304
+
+
+def test_unknown_views_rooms_and_other_workers_rooms(client):
+    assert client.get('/api/rooms/main/secrets').status_code == 404
+    assert client.get('/api/rooms/nowhere/state').status_code == 404
+    moved = client.get('/api/rooms/away/state')
+    assert moved.status_code == 302 and moved.headers['Location'] == 'http://localhost:8082/'
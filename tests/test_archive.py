@@ -0,0 +1,85 @@
+"""
+Game archive: finished games are written in batches by a background thread,
+and a batch holding an already-archived game still saves the others
+"""
+import io
+import json
+
+import pytest
+
+import tournament
+from archive import COLUMNS, GameArchive
+
+LINEUP = ['heat', 'prestige', 'thrifty', 'planner']
+
+
+@pytest.fixture(scope='module')
+def finished_game():
+    return tournament.play_game(LINEUP, seed=3, archive=True, run_id='test')['archive']
+
+
+def renamed(rows, game_id):
+    """The same game's rows under another game ID"""
+    return {table: [(game_id, *row[1:]) for row in rows[table]] for table in COLUMNS}
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = GameArchive(str(tmp_path / 'games.db'), batch_size=3, flush_interval=0.5)
+    yield archive
+    archive.close()
+
+
+def record_batches(archive, monkeypatch):
+    batches = []
+    insert = archive._insert
+
+    def counting_insert(conn, games):
+        batches.append([game['games'][0][0] for game in games])
+        insert(conn, games)
+    monkeypatch.setattr(archive, '_insert', counting_insert)
+    return batches
+
+
+def test_queued_games_are_written_in_batches(archive, finished_game, monkeypatch):
+    batches = record_batches(archive, monkeypatch)
+    for n in range(7):
+        archive.submit(renamed(finished_game, f'g{n}'))
+    archive.close()
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert archive.written == 7
+    games = archive.query('SELECT game_id, num_players FROM games ORDER BY game_id')
+    assert games == [{'game_id': f'g{n}', 'num_players': len(LINEUP)} for n in range(7)]
+    films = archive.query('SELECT COUNT(*) AS films FROM films')[0]['films']
+    assert films == 7 * len(finished_game['films'])
+
+
+def test_an_archived_game_does_not_sink_its_batch(archive, finished_game, monkeypatch):
+    archive.submit(renamed(finished_game, 'first'))
+    archive.flush()
+    batches = record_batches(archive, monkeypatch)
+
+    for game_id in ('before', 'first', 'after'):
+        archive.submit(renamed(finished_game, game_id))
+    archive.close()
+
+    # The batch fails as a whole, then each game is retried on its own
+    assert batches[0] == ['before', 'first', 'after']
+    assert batches[1:] == [['before'], ['first'], ['after']]
+    assert archive.duplicates == 1
+    assert archive.written == 3
+    players = archive.query('SELECT game_id, COUNT(*) AS seats FROM players GROUP BY game_id ORDER BY game_id')
+    assert players == [{'game_id': game_id, 'seats': len(LINEUP)} for game_id in ('after', 'before', 'first')]
+
+
+def test_archived_games_export_as_json_lines(archive, finished_game):
+    archive.submit(finished_game)
+    archive.flush()
+
+    out = io.StringIO()
+    assert archive.export_jsonl(out) == 1
+    [game] = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert game['game_id'] == finished_game['games'][0][0]
+    assert sorted(player['strategy'] for player in game['players']) == sorted(LINEUP)
+    assert {row['strategy'] for row in archive.win_rate_by_strategy()} == set(LINEUP)
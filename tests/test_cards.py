@@ -0,0 +1,66 @@
+"""
+Interned card and film records: shared between every view of the game, so
+nothing may change one in place
+"""
+import copy
+import pickle
+
+import pytest
+
+from cards import CardStore, Record
+
+MUTATIONS = {
+    'setitem': lambda r: r.__setitem__('heat', 99),
+    'delitem': lambda r: r.__delitem__('heat'),
+    'ior': lambda r: r.__ior__({'heat': 99}),
+    'clear': lambda r: r.clear(),
+    'pop': lambda r: r.pop('heat'),
+    'popitem': lambda r: r.popitem(),
+    'setdefault': lambda r: r.setdefault('genre', 'Horror'),
+    'update': lambda r: r.update(heat=99),
+}
+
+
+def card():
+    return CardStore().intern({'name': 'Meryl', 'role': 'star', 'heat': 5, 'prestige': 9, 'salary': 4})
+
+
+@pytest.mark.parametrize('mutation', MUTATIONS.values(), ids=list(MUTATIONS))
+def test_records_cannot_be_mutated(mutation):
+    record = card()
+    before = dict(record)
+    with pytest.raises(TypeError):
+        mutation(record)
+    assert record == before
+
+
+def test_in_place_or_leaves_shared_record_alone():
+    record = card()
+    alias = record
+    with pytest.raises(TypeError):
+        alias |= {'heat': 99}
+    assert record['heat'] == 5
+
+
+def test_or_builds_a_new_plain_dict():
+    record = card()
+    merged = record | {'heat': 99}
+    assert merged['heat'] == 99 and record['heat'] == 5
+    assert not isinstance(merged, Record)
+
+
+def test_copies_share_the_record_and_pickles_rebuild_it():
+    record = card()
+    assert copy.copy(record) is record
+    assert copy.deepcopy({'cards': [record]})['cards'][0] is record
+    restored = pickle.loads(pickle.dumps(record))
+    assert isinstance(restored, Record) and restored == record
+
+
+def test_intern_assigns_ids_once():
+    store = CardStore()
+    record = store.intern({'name': 'Ava', 'role': 'director'})
+    film = store.intern_film({'title': 'Heat Wave'})
+    assert record['id'] == 'c1' and film['id'] == 'f1'
+    assert store.intern(record) is record
+    assert store.get('c1') is record and len(store) == 2
@@ -0,0 +1,36 @@
+"""
+Engine tests: whole bot games played headless through the real GameEngine
+(see tournament.py)
+"""
+import pytest
+
+import game_logic
+import tournament
+
+LINEUP = ['heat', 'prestige', 'thrifty', 'planner']
+
+
+@pytest.mark.parametrize('bidding_mode', game_logic.BIDDING_MODES)
+def test_full_game_in_each_bidding_mode(bidding_mode):
+    game_state = game_logic.GameState()
+    result = tournament.play_game(LINEUP, seed=7, bidding_mode=bidding_mode, game_state=game_state)
+
+    assert game_state.phase == 'game_complete'
+    assert game_state.bidding_mode == bidding_mode
+    assert [seat['strategy'] for seat in result['seats']] == LINEUP
+    assert result['winners']
+    assert any(player.get('films') for player in game_state.players.values())
+
+
+def test_games_are_reproducible_from_a_seed():
+    first = tournament.play_game(LINEUP, seed=11)
+    second = tournament.play_game(LINEUP, seed=11)
+    assert first['seats'] == second['seats']
+
+
+def test_identical_bots_still_win_cards():
+    # Six seats: two HeatBots and two PlannerBots. Tied bids lose the card
+    result = tournament.play_game(['heat', 'planner', 'random', 'heat', 'planner', 'prestige'], seed=3)
+    for seat in result['seats']:
+        if seat['strategy'] in ('heat', 'planner'):
+            assert seat['score'] > 0
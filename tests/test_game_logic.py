@@ -0,0 +1,79 @@
+"""
+State versions: frozen snapshots share unchanged parts, so diffs and
+missed-update replays cost O(fields)
+"""
+import pytest
+
+import game_logic
+from cards import Record
+from game_logic import GameState, diff_snapshots, freeze
+
+
+def test_freeze_makes_everything_immutable():
+    frozen = freeze({'players': {'p1': {'roles': [1, 2]}}, 'ready': {'a', 'b'}, 'turn': 1})
+    assert isinstance(frozen, Record)
+    assert frozen['players']['p1']['roles'] == (1, 2)
+    assert frozen['ready'] == frozenset({'a', 'b'})
+    with pytest.raises(TypeError):
+        frozen['players']['p1']['money'] = 0
+
+
+def test_unchanged_parts_are_shared_between_versions():
+    state = {'players': {'p1': {'money': 100}, 'p2': {'money': 90}}, 'cards': [[1], [2]], 'turn': 1}
+    first = freeze(state)
+    assert freeze(state, first) is first
+
+    state['players']['p2']['money'] = 80
+    state['turn'] = 2
+    second = freeze(state, first)
+    assert second is not first
+    assert second['players']['p1'] is first['players']['p1']
+    assert second['players']['p2'] is not first['players']['p2']
+    assert second['cards'] is first['cards']
+
+
+def test_structural_changes_are_not_mistaken_for_equal():
+    first = freeze({'a': 1, 'b': [1, 2]})
+    assert freeze({'a': 1}, first) == {'a': 1}
+    assert freeze({'a': 1, 'b': [1, 2, 3]}, first)['b'] == (1, 2, 3)
+    assert freeze({'a': True, 'b': [1, 2]}, first)['a'] is True
+    card = Record({'name': 'Ada', 'id': 'c1'})
+    assert freeze({'card': card})['card'] is card
+
+
+def test_diff_lists_only_changed_fields():
+    old = freeze({'phase': 'lobby', 'turn': 0, 'players': {}, 'version': 1})
+    new = freeze({'phase': 'lobby', 'turn': 1, 'players': {}, 'match': None, 'version': 2}, old)
+    assert diff_snapshots(old, new) == {'turn': 1, 'match': None}
+    assert diff_snapshots(new, new) == {}
+
+
+def test_missed_updates_replay_into_the_current_state():
+    game_state = GameState()
+    first = game_state.version
+    game_state.add_player('sid-1', 'Ada')
+    game_state.record_update()
+    game_state.turn = 3
+    game_state.record_update()
+    game_state.record_update()
+
+    updates = game_state.updates_since(first)
+    assert [update['version'] for update in updates] == [first + 1, first + 2, first + 3]
+    assert 'players' in updates[0]['changes'] and 'phase' not in updates[0]['changes']
+    assert updates[1]['changes'] == {'turn': 3}
+    assert updates[2]['changes'] == {}
+
+    replayed = dict(game_state.snapshots[0])
+    for update in updates:
+        replayed.update(update['changes'], version=update['version'])
+    assert replayed == game_state.snapshot
+    assert game_state.updates_since(game_state.version) == []
+
+
+def test_clients_too_far_behind_get_a_full_state():
+    game_state = GameState()
+    for _ in range(game_logic.UPDATE_LOG_SIZE + 1):
+        game_state.record_update()
+    assert game_state.updates_since(0) is None
+    assert game_state.updates_since(game_state.version + 1) is None
+    assert len(game_state.updates_since(1)) == game_logic.UPDATE_LOG_SIZE
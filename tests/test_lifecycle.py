@@ -0,0 +1,106 @@
+"""
+Room lifecycle: the sweep spills idle rooms, evicts least recently used
+ones, expires finished games and old snapshots, and leaves rooms that are
+being moved to another worker alone
+"""
+import os
+import time
+
+import pytest
+
+import lifecycle
+from lifecycle import RoomLifecycle, SnapshotStore
+from rooms import RoomDirectory, RoomRegistry, snapshot_room
+
+
+@pytest.fixture
+def rooms(tmp_path):
+    return RoomRegistry(0, 2, directory=RoomDirectory(2), store=SnapshotStore(str(tmp_path)))
+
+
+def idle(room):
+    room.last_active = time.time() - lifecycle.IDLE_AFTER - 1
+    return room
+
+
+def test_idle_rooms_spill_and_reload(rooms):
+    active = rooms.get_or_create('busy')
+    spilled = idle(rooms.get_or_create('quiet'))
+    player_id, _ = spilled.game_state.add_player('sid-ada', 'Ada')
+
+    actions = RoomLifecycle(rooms).sweep()
+    assert actions == {'quiet': 'spilled'}
+    assert list(rooms.rooms) == ['busy']
+    assert rooms.store.load('quiet') is not None
+
+    reloaded = rooms.get('quiet')
+    assert reloaded is not spilled
+    assert reloaded.game_state.players[player_id]['name'] == 'Ada'
+    assert rooms.store.load('quiet') is None
+    assert rooms.get('busy') is active
+
+
+def test_rooms_with_sockets_are_not_idle(rooms):
+    idle(rooms.get_or_create('watched'))
+    rooms.bind_sid('sid-1', 'watched')
+    assert RoomLifecycle(rooms).sweep() == {}
+
+
+def test_least_recently_used_rooms_go_first(rooms):
+    for room_id in ('old', 'middle', 'new'):
+        rooms.get_or_create(room_id)
+    rooms.touch(rooms.rooms['old'])
+
+    actions = RoomLifecycle(rooms, max_rooms=1).sweep()
+    assert actions == {'middle': 'spilled', 'new': 'spilled'}
+    assert list(rooms.rooms) == ['old']
+
+
+def test_finished_rooms_expire_after_their_players_leave(rooms):
+    room = rooms.get_or_create('done')
+    room.game_state.phase = 'game_complete'
+    sweeper = RoomLifecycle(rooms)
+
+    now = time.time()
+    assert sweeper.sweep(now) == {}
+    assert sweeper.sweep(now + lifecycle.FINISHED_TTL + 1) == {'done': 'expired'}
+    assert 'done' not in rooms.rooms
+    assert 'done' not in rooms.directory.assignments
+
+
+def test_old_snapshots_expire(rooms):
+    idle(rooms.get_or_create('gone'))
+    sweeper = RoomLifecycle(rooms)
+    sweeper.sweep()
+    path = os.path.join(rooms.store.path, 'gone' + lifecycle.SNAPSHOT_SUFFIX)
+    stale = time.time() - lifecycle.SNAPSHOT_TTL - 1
+    os.utime(path, (stale, stale))
+
+    assert sweeper.sweep() == {'gone': 'snapshot expired'}
+    assert rooms.get('gone') is None
+    assert 'gone' not in rooms.directory.assignments
+
+
+def test_rooms_being_moved_are_left_alone(rooms):
+    # A migration froze these rooms and is posting them to worker 1
+    moving = idle(rooms.get_or_create('moving'))
+    moving.engine.freeze()
+    evictable = rooms.get_or_create('evictable')
+    evictable.engine.freeze()
+
+    assert RoomLifecycle(rooms, max_rooms=0).sweep() == {}
+    assert rooms.spill('moving') is False
+    assert rooms.store.load('moving') is None
+    assert set(rooms.rooms) == {'moving', 'evictable'}
+
+
+def test_adopting_a_room_deletes_its_old_snapshot(rooms):
+    room = idle(rooms.get_or_create('back'))
+    payload = snapshot_room(room)
+    RoomLifecycle(rooms).sweep()
+    assert rooms.store.load('back') is not None
+
+    # The room comes back from another worker before its snapshot expires
+    rooms.adopt(payload)
+    assert rooms.store.load('back') is None
+    assert rooms.directory.assignments['back'] == 0
@@ -0,0 +1,246 @@
+"""
+Matchmaking: the bucketed queue, matchmade tables in the engine, and which
+worker runs the queue
+"""
+import time
+
+import pytest
+from flask import Flask
+
+import game_logic
+import matchmaking
+from app import create_app
+from config import load_config
+from engine import GameEngine, GameError
+from helpers import FakeScheduler, seat_bots
+from matchmaking import MATCHMAKING_KEY, Matchmaker
+from rooms import RoomDirectory, RoomRegistry, worker_for_room
+
+LINEUP = ['heat', 'prestige', 'thrifty', 'planner']
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(matchmaking.time, 'monotonic', clock)
+    return clock
+
+
+@pytest.fixture
+def matchmaker(clock):
+    return Matchmaker(RoomRegistry())
+
+
+def test_full_bucket_is_matched_at_once(matchmaker):
+    first = matchmaker.enqueue(3, 'auction')
+    second = matchmaker.enqueue(3, 'auction')
+    other = matchmaker.enqueue(3, 'concurrent')
+    assert matchmaker.status(first)['status'] == 'waiting'
+
+    third = matchmaker.enqueue(3, 'auction')
+    rooms = {matchmaker.status(ticket)['room'] for ticket in (first, second, third)}
+    assert len(rooms) == 1
+    room_id = rooms.pop()
+    assert matchmaker.rooms.directory.reservations[room_id]['seats'] == 3
+    assert matchmaker.rooms.directory.reservations[room_id]['bidding_mode'] == 'auction'
+    assert matchmaker.status(other)['status'] == 'waiting'
+
+
+def test_bad_preferences_are_refused(matchmaker):
+    with pytest.raises(ValueError):
+        matchmaker.enqueue(game_logic.MATCH_SEATS.stop)
+    with pytest.raises(ValueError):
+        matchmaker.enqueue(4, 'silent')
+
+
+def test_smaller_table_starts_after_the_fill_target(matchmaker, clock):
+    tickets = [matchmaker.enqueue(4) for _ in range(2)]
+    clock.now += matchmaking.FILL_TARGET - 1
+    matchmaker.match()
+    assert matchmaker.status(tickets[0])['status'] == 'waiting'
+
+    clock.now += 1
+    matchmaker.match()
+    statuses = [matchmaker.status(ticket) for ticket in tickets]
+    assert {status['status'] for status in statuses} == {'matched'}
+    room_id = statuses[0]['room']
+    assert matchmaker.rooms.directory.reservations[room_id]['seats'] == 2
+    assert matchmaker.stats()['short_tables'] == 1
+
+
+def test_lone_player_keeps_waiting(matchmaker, clock):
+    ticket = matchmaker.enqueue(2)
+    clock.now += matchmaking.FILL_TARGET + 1
+    matchmaker.match()
+    assert matchmaker.status(ticket)['status'] == 'waiting'
+
+
+def test_cancelled_and_abandoned_tickets_are_skipped(matchmaker, clock):
+    cancelled = matchmaker.enqueue(2)
+    assert matchmaker.cancel(cancelled) is True
+    assert matchmaker.cancel(cancelled) is False
+    assert matchmaker.status(cancelled) is None
+
+    abandoned = matchmaker.enqueue(2)
+    clock.now += matchmaking.ABANDON_AFTER + 1
+    waiting = matchmaker.enqueue(2)
+    assert matchmaker.status(waiting)['status'] == 'waiting'
+    assert matchmaker.status(abandoned) is None
+
+    stats = matchmaker.stats()
+    assert stats['cancelled'] == 1 and stats['abandoned'] == 1 and stats['waiting'] == 1
+
+
+def test_matched_tickets_and_unclaimed_reservations_expire(matchmaker, clock):
+    tickets = [matchmaker.enqueue(2) for _ in range(2)]
+    room_id = matchmaker.status(tickets[0])['room']
+    stale = dict(matchmaker.rooms.directory.reservations[room_id], at=0)
+    matchmaker.rooms.directory.reservations[room_id] = stale
+
+    clock.now += matchmaking.TICKET_TTL + 1
+    matchmaker.match()
+    assert matchmaker.status(tickets[0]) is None
+    assert room_id not in matchmaker.rooms.directory.reservations
+    assert not matchmaker.buckets
+
+
+def test_time_to_match_is_reported(matchmaker, clock):
+    first = matchmaker.enqueue(2)
+    clock.now += 4
+    matchmaker.enqueue(2)
+    stats = matchmaker.stats()
+    assert stats['time_to_match']['max'] == 4
+    assert stats['rooms'] == 1 and stats['matched'] == 2
+    assert matchmaker.status(first)['status'] == 'matched'
+
+
+def test_reserved_room_becomes_a_matchmade_table(matchmaker):
+    tickets = [matchmaker.enqueue(2, 'sequential') for _ in range(2)]
+    room_id = matchmaker.status(tickets[0])['room']
+
+    room = matchmaker.rooms.get_or_create(room_id)
+    assert room.game_state.match['seats'] == 2
+    assert room.game_state.bidding_mode == 'sequential'
+    assert room_id not in matchmaker.rooms.directory.reservations
+    room.engine.freeze()
+
+
+def test_host_commands_only_run_from_their_phase():
+    engine = GameEngine(game_logic.GameState())
+    seat_bots(engine, LINEUP[:2])
+
+    assert engine.start_phase1() is False
+    assert engine.start_phase0() is True
+    assert engine.start_phase0() is False
+    assert engine.quick_start() is True
+    assert engine.game_state.phase == 'phase0_complete'
+    assert engine.quick_start() is False
+    assert engine.start_phase1() is True
+    assert engine.start_phase1() is False
+    assert engine.game_state.phase == 'phase1_production'
+
+
+def test_matchmade_table_starts_itself_and_refuses_host_commands():
+    scheduler = FakeScheduler()
+    engine = GameEngine(game_logic.GameState(), scheduler=scheduler)
+    engine.setup_match(2, 'auction')
+    engine.join('sid-0', 'First')
+    assert engine.start_phase0() is False
+    assert engine.quick_start() is False
+
+    engine.join('sid-1', 'Second')
+    assert engine.game_state.phase == 'phase0_naming'
+    assert engine.game_state.bidding_mode == 'auction'
+    with pytest.raises(GameError):
+        engine.join('sid-2', 'Third')
+
+    # Nobody names anything: the naming deadline does it and production starts
+    scheduler.calls = [call for call in scheduler.calls if call[2][0] == engine.naming_deadline]
+    scheduler.fire()
+    assert engine.game_state.phase == 'phase1_production'
+    assert len(engine.game_state.talent_pool) == 2 * sum(game_logic.NAMING_QUOTAS.values())
+
+
+def test_matchmade_table_closes_when_nobody_else_comes():
+    scheduler = FakeScheduler()
+    engine = GameEngine(game_logic.GameState(), scheduler=scheduler)
+    engine.setup_match(4, 'concurrent')
+    engine.join('sid-0', 'Lonely')
+
+    for _ in range(game_logic.MATCH_EXTENSIONS + 1):
+        scheduler.fire()
+    assert engine.game_state.match['closed']
+    assert engine.game_state.phase == 'game_complete'
+    assert not scheduler.calls
+
+
+# ============================================================================
+# WHICH WORKER RUNS THE QUEUE
+# ============================================================================
+
+def worker_app(worker_index, directory, monkeypatch):
+    monkeypatch.setattr(matchmaking, 'MATCH_INTERVAL', 0.01)
+    config = load_config({'WORKERS': '2', 'PORT': '18080', 'SECRET_KEY': 'test', 'ARCHIVE_PATH': '', 'SPILL_DIR': ''})
+    app, _ = create_app(config, async_mode='threading', worker_index=worker_index, directory=directory)
+    return app, config
+
+
+def wait_for_sweeps(matchmaker, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while matchmaker.sweeps == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return matchmaker.sweeps
+
+
+def test_restarted_queue_worker_runs_the_sweep(monkeypatch):
+    # A rolling restart drains the worker, then boots its replacement while
+    # the directory still marks it draining
+    queue_worker = worker_for_room(MATCHMAKING_KEY, 2)
+    directory = RoomDirectory(2, draining={queue_worker: True})
+    app, config = worker_app(queue_worker, directory, monkeypatch)
+    matchmaker = app.extensions['matchmaker']
+
+    assert matchmaker.running
+    assert wait_for_sweeps(matchmaker) > 0
+    port = config['WORKER_PORT_BASE'] + queue_worker
+    response = app.test_client().get('/api/matchmaking', base_url=f'http://localhost:{port}')
+    assert response.status_code == 200
+
+
+def test_other_workers_send_matchmaking_to_the_queue_worker(monkeypatch):
+    queue_worker = worker_for_room(MATCHMAKING_KEY, 2)
+    other = 1 - queue_worker
+    # Even while the queue worker is draining, the queue doesn't move
+    directory = RoomDirectory(2, draining={queue_worker: True})
+    app, config = worker_app(other, directory, monkeypatch)
+    directory.draining[queue_worker] = True
+    matchmaker = app.extensions['matchmaker']
+
+    port = config['WORKER_PORT_BASE'] + other
+    response = app.test_client().post('/api/matchmaking', json={'seats': 2},
+                                      base_url=f'http://localhost:{port}')
+    assert response.status_code == 302
+    assert response.headers['Location'].startswith(f"http://localhost:{config['WORKER_PORT_BASE'] + queue_worker}/")
+    assert not matchmaker.running
+
+
+def test_queue_sweep_starts_with_the_first_request(monkeypatch):
+    rooms = RoomRegistry()
+    matchmaker = Matchmaker(rooms)
+    monkeypatch.setattr(matchmaking, 'MATCH_INTERVAL', 0.01)
+    app = Flask(__name__)
+    matchmaking.register_matchmaking(app, matchmaker, lambda: None)
+
+    assert not matchmaker.running
+    response = app.test_client().post('/api/matchmaking', json={'seats': 2})
+    assert response.status_code == 201 and response.json['status'] == 'waiting'
+    assert matchmaker.running
+    assert wait_for_sweeps(matchmaker) > 0
@@ -0,0 +1,141 @@
+"""
+Outbound backpressure: connections over budget hold only the newest update,
+acks release it, and slow connections drop to snapshot-only mode
+"""
+import pytest
+
+import outbound
+from helpers import FakeScheduler
+from outbound import Outbox
+
+SIZE = outbound.OUTBOUND_BUDGET // 4
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(outbound.time, 'monotonic', clock)
+    return clock
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    scheduler = FakeScheduler()
+    monkeypatch.setattr(outbound, 'scheduler', scheduler)
+    return scheduler
+
+
+@pytest.fixture
+def outbox(clock, scheduler):
+    outbox = Outbox()
+    outbox.add('fast', 'room', 'json')
+    outbox.add('phone', 'room', 'msgpack')
+    return outbox
+
+
+def state(version):
+    return {'version': version}
+
+
+def broadcast(outbox, version, size=SIZE):
+    return outbox.route('room', state(version), lambda codec: size)
+
+
+def test_updates_within_budget_all_go_out(outbox):
+    for version in range(1, 4):
+        assert broadcast(outbox, version) == []
+    assert outbox.stats()['sent'] == 6
+    assert outbox.codecs('room') == {'json', 'msgpack'}
+
+
+def test_stale_updates_are_conflated_and_the_ack_releases_the_newest(outbox):
+    for version in range(1, 5):
+        assert broadcast(outbox, version) == []
+    for version in range(1, 5):
+        outbox.ack('fast', version)
+
+    # The phone hasn't acked anything: the next three are held, newest only
+    assert broadcast(outbox, 5) == ['phone']
+    assert broadcast(outbox, 6) == ['phone']
+    assert broadcast(outbox, 7) == ['phone']
+    stats = outbox.stats()
+    assert stats['held'] == 1 and stats['conflated'] == 2 and stats['holding'] == 1
+
+    assert outbox.ack('phone', 1) == state(7)
+    assert outbox.ack('phone', 2) is None
+    assert outbox.stats()['holding'] == 0
+
+
+def test_an_update_bigger_than_the_budget_still_goes_out_alone(outbox):
+    assert broadcast(outbox, 1, size=outbound.OUTBOUND_BUDGET * 2) == []
+    assert sorted(broadcast(outbox, 2, size=1)) == ['fast', 'phone']
+
+
+def test_lost_acks_stop_counting_against_the_budget(outbox, clock):
+    for version in range(1, 5):
+        broadcast(outbox, version)
+    assert sorted(broadcast(outbox, 5)) == ['fast', 'phone']
+
+    clock.now += outbound.ACK_TIMEOUT + 1
+    assert broadcast(outbox, 6) == []
+
+
+def test_slow_connections_get_snapshots_until_they_catch_up(outbox, clock):
+    for version in range(1, outbound.SLOW_STRIKES + 1):
+        broadcast(outbox, version, size=1)
+        outbox.ack('fast', version)
+        clock.now += outbound.SLOW_ACK + 0.1
+        outbox.ack('phone', version)
+    assert outbox.connections['phone'].slow and not outbox.connections['fast'].slow
+    assert outbox.stats()['slowed'] == 1
+
+    clock.now += outbound.SLOW_INTERVAL
+    assert broadcast(outbox, 10, size=1) == []
+    assert broadcast(outbox, 11, size=1) == ['phone']
+    clock.now += outbound.SLOW_INTERVAL
+    assert outbox.ack('phone', 10) == state(11)
+
+    for version in range(12, 12 + outbound.RECOVER_ACKS):
+        clock.now += outbound.SLOW_INTERVAL
+        broadcast(outbox, version, size=1)
+        outbox.ack('phone', version)
+    assert not outbox.connections['phone'].slow
+    assert outbox.stats()['recovered'] == 1
+
+
+def test_held_updates_are_pumped_out(outbox, scheduler):
+    sent = []
+    outbox.start(lambda sid, snapshot: sent.append((sid, snapshot['version'])))
+    for version in range(1, 5):
+        broadcast(outbox, version)
+    broadcast(outbox, 5)
+    assert len(scheduler.calls) == 1
+
+    # Connections still over budget keep the pump going
+    scheduler.fire()
+    assert sent == [] and len(scheduler.calls) == 1
+
+    outbox.connections['fast'].in_flight.clear()
+    outbox.connections['phone'].in_flight.clear()
+    scheduler.fire()
+    assert sorted(sent) == [('fast', 5), ('phone', 5)]
+    assert scheduler.calls == [] and not outbox.pumping
+
+
+def test_bad_acks_and_gone_sockets_are_ignored(outbox):
+    broadcast(outbox, 1)
+    assert outbox.ack('phone', 'latest') is None
+    assert outbox.ack('nobody', 1) is None
+
+    outbox.drop('fast')
+    outbox.drop('phone')
+    assert outbox.rooms == {} and outbox.codecs('room') == set()
+    assert outbox.codec('phone') is None
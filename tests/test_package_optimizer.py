@@ -0,0 +1,113 @@
+"""
+Film package suggestions: the pruned search finds the same best packages
+as trying every partition, scored exactly like greenlight_film
+"""
+import random
+from collections import OrderedDict
+
+import pytest
+
+import game_logic
+import package_optimizer
+from package_optimizer import ROLE_TYPES, suggest_packages
+
+NO_NAME = {
+    role_type: {'name': f'No Name {role_type}', 'role': role_type, 'heat': 0, 'prestige': 50,
+                'genre': 'Drama', 'audience': 'Everyone'}
+    for role_type in ROLE_TYPES
+}
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(package_optimizer, '_cache', OrderedDict())
+
+
+def random_roles(count, seed):
+    rng = random.Random(seed)
+    roles = []
+    for n in range(count):
+        role = {'name': f'Talent {n}', 'role': rng.choice(ROLE_TYPES),
+                'heat': rng.randint(0, 255), 'prestige': rng.randint(0, 100)}
+        if role['role'] == 'producer':
+            role['genre'] = rng.choice(['Drama', 'Comedy', 'Horror'])
+        if role['role'] == 'screenwriter':
+            role['audience'] = rng.choice(['Everyone', 'Adults'])
+        roles.append(role)
+    return roles
+
+
+def partitions(items):
+    """Every way to split `items` into non-empty groups"""
+    if not items:
+        yield []
+        return
+    first, rest = items[0], items[1:]
+    for partition in partitions(rest):
+        yield [[first]] + partition
+        for i in range(len(partition)):
+            yield partition[:i] + [[first] + partition[i]] + partition[i + 1:]
+
+
+def film_stats(roles, indices):
+    members = [roles[i] if i >= 0 else list(NO_NAME.values())[-i - 1] for i in indices]
+    assert game_logic.validate_film_package(members)
+    return game_logic.calculate_film_stats(members)
+
+
+def best_score(roles, objective):
+    """Exhaustive search (leaving roles out too, for prestige)"""
+    search = package_optimizer.PackageSearch(roles, NO_NAME, objective, 1, 1000)
+    best = None
+    subsets = [range(len(roles))]
+    if objective == 'prestige':
+        subsets = [[i for i in range(len(roles)) if mask >> i & 1] for mask in range(1, 2 ** len(roles))]
+    for subset in subsets:
+        for partition in partitions(list(subset)):
+            score = search.score([search.film(group) for group in partition])
+            best = score if best is None or score > best else best
+    return list(best)
+
+
+@pytest.mark.parametrize('objective', ['heat', 'prestige'])
+@pytest.mark.parametrize('seed', range(6))
+def test_search_finds_the_best_packages(objective, seed):
+    roles = random_roles(6, seed)
+    result = suggest_packages(roles, NO_NAME, objective=objective)
+    assert result['complete']
+    assert result['suggestions'][0]['score'] == best_score(roles, objective)
+
+    scores = [suggestion['score'] for suggestion in result['suggestions']]
+    assert scores == sorted(scores, reverse=True) and len(scores) == 3
+
+
+def test_suggested_films_are_what_greenlighting_makes():
+    roles = random_roles(7, seed=42)
+    for suggestion in suggest_packages(roles, NO_NAME)['suggestions']:
+        used = []
+        for film in suggestion['films']:
+            stats = film_stats(roles, film['role_indices'])
+            assert {key: film[key] for key in stats} == stats
+            used += [i for i in film['role_indices'] if i >= 0]
+        # The heat objective packages every role, each once
+        assert sorted(used) == list(range(len(roles)))
+
+
+def test_results_are_cached_unless_the_budget_ran_out():
+    roles = random_roles(5, seed=1)
+    first = suggest_packages(roles, NO_NAME)
+    assert suggest_packages(roles, NO_NAME) is first
+    assert suggest_packages(roles, NO_NAME, objective='prestige') is not first
+
+    many = random_roles(10, seed=2)
+    partial = suggest_packages(many, NO_NAME, budget_ms=0)
+    assert not partial['complete']
+    assert suggest_packages(many, NO_NAME, budget_ms=0) is not partial
+
+
+def test_nothing_to_suggest():
+    assert suggest_packages([], NO_NAME)['suggestions'] == []
+    missing = {role_type: talent for role_type, talent in NO_NAME.items() if role_type != 'star'}
+    assert suggest_packages(random_roles(3, seed=3), missing)['suggestions'] == []
+    with pytest.raises(ValueError):
+        suggest_packages([], NO_NAME, objective='box_office')
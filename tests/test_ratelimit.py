@@ -0,0 +1,152 @@
+"""
+Inbound backpressure: per-socket token buckets, each room's bounded queue
+of events waiting on its engine, and paced admission of joins
+"""
+import pytest
+
+import ratelimit
+from helpers import FakeScheduler
+from ratelimit import AdmissionQueue, InboundQueue, RateLimiter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ratelimit.time, 'monotonic', clock)
+    return clock
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    scheduler = FakeScheduler()
+    monkeypatch.setattr(ratelimit, 'scheduler', scheduler)
+    return scheduler
+
+
+# ============================================================================
+# RATE LIMITS
+# ============================================================================
+
+def test_bursts_are_allowed_then_throttled_until_tokens_refill(clock):
+    limiter = RateLimiter({'select_card': (2, 3)})
+    assert [limiter.allow('sid', 'select_card') for _ in range(4)] == [True, True, True, False]
+    assert limiter.throttled == {'select_card': 1}
+
+    clock.now += 0.5
+    assert limiter.allow('sid', 'select_card')
+    assert not limiter.allow('sid', 'select_card')
+
+    # Tokens never build up past the burst
+    clock.now += 60
+    assert sum(limiter.allow('sid', 'select_card') for _ in range(10)) == 3
+
+
+def test_buckets_are_per_socket_and_per_event(clock):
+    limiter = RateLimiter({'request_update': (1, 1)}, default=(1, 2))
+    assert limiter.allow('a', 'request_update')
+    assert not limiter.allow('a', 'request_update')
+    assert limiter.allow('b', 'request_update')
+    assert limiter.allow('a', 'submit_bid') and limiter.allow('a', 'submit_bid')
+    assert not limiter.allow('a', 'submit_bid')
+
+    limiter.forget('a')
+    assert 'a' not in limiter.buckets
+    assert limiter.allow('a', 'request_update')
+
+
+def test_every_listed_event_can_burst():
+    for event, (rate, burst) in ratelimit.EVENT_LIMITS.items():
+        assert rate > 0 and burst >= 1, event
+
+
+# ============================================================================
+# ROOM INBOUND QUEUE
+# ============================================================================
+
+def test_full_room_sheds_events_until_a_slot_frees():
+    inbound = InboundQueue(size=2)
+    first = inbound.admit('a', 'select_card')
+    second = inbound.admit('b', 'select_card')
+    assert first and second
+    assert inbound.admit('c', 'submit_bid') is None
+    assert inbound.shed == {'submit_bid': 1}
+
+    first()
+    assert inbound.pending == 1
+    assert inbound.admit('c', 'submit_bid') is not None
+
+
+def test_repeated_idempotent_events_are_merged():
+    inbound = InboundQueue()
+    release = inbound.admit('a', 'request_update')
+    assert inbound.admit('a', 'request_update') is None
+    assert inbound.admit('b', 'request_update') is not None
+    assert inbound.merged == {'request_update': 1}
+
+    # Commands are never merged: each one counts
+    assert inbound.admit('a', 'select_card') and inbound.admit('a', 'select_card')
+
+    release()
+    assert inbound.admit('a', 'request_update') is not None
+
+
+# ============================================================================
+# ADMISSION
+# ============================================================================
+
+def test_joins_beyond_the_burst_wait_their_turn_in_order(clock, scheduler):
+    admission = AdmissionQueue(rate=8, burst=2, size=10)
+    joined = []
+    for n in range(5):
+        assert admission.submit(lambda n=n: joined.append(n)) is None
+    assert joined == [0, 1]
+    assert [delay for delay, _, _ in scheduler.calls] == [0.125]
+
+    clock.now += 0.125
+    scheduler.fire()
+    assert joined == [0, 1, 2]
+    # Still waiting: the pump reschedules itself, and new joins queue behind
+    assert admission.submit(lambda: joined.append(5)) is None
+    clock.now += 0.25
+    scheduler.fire()
+    assert joined == [0, 1, 2, 3, 4]
+    clock.now += 0.125
+    scheduler.fire()
+    assert joined == [0, 1, 2, 3, 4, 5]
+    assert scheduler.calls == [] and not admission.pumping
+    assert admission.counts == {'immediate': 2, 'queued': 4}
+
+
+def test_full_admission_queue_asks_sockets_to_retry(clock, scheduler, monkeypatch):
+    monkeypatch.setattr(ratelimit.random, 'uniform', lambda low, high: high)
+    admission = AdmissionQueue(rate=2, burst=1, size=3)
+    for _ in range(4):
+        assert admission.submit(lambda: None) is None
+    assert admission.submit(lambda: None) == 3.0
+    assert admission.counts['deferred'] == 1
+
+    admission.size = 1000
+    for _ in range(997):
+        admission.submit(lambda: None)
+    assert admission.submit(lambda: None) == ratelimit.MAX_RETRY_AFTER
+
+
+def test_a_failing_join_does_not_stall_the_queue(clock, scheduler):
+    admission = AdmissionQueue(rate=8, burst=2, size=10)
+    joined = []
+    admission.submit(lambda: None)
+    admission.submit(lambda: None)
+    admission.submit(lambda: 1 / 0)
+    admission.submit(lambda: joined.append('next'))
+
+    clock.now += 0.25
+    scheduler.fire()
+    assert joined == ['next']
@@ -0,0 +1,71 @@
+"""
+Tracing: spans land on per-room tracks, and a worker only keeps (and names)
+tracks for the rooms it still hosts
+"""
+import json
+
+import rooms as rooms_module
+from lifecycle import SnapshotStore
+from rooms import RoomRegistry
+from tracing import Tracer
+
+
+def read_events(path):
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    return json.loads(text.rstrip().rstrip(',') + ']')
+
+
+def track_names(events):
+    return {event['tid']: event['args']['name'] for event in events if event['name'] == 'thread_name'}
+
+
+def test_spans_go_on_their_room_track(tmp_path):
+    tracer = Tracer()
+    path = str(tmp_path / 'trace.json')
+    tracer.configure(path, process_name='worker 0')
+    with tracer.span('deal', 'engine', room='a', turn=1):
+        pass
+    tracer.begin('selection', 'p1', room='b')
+    tracer.end('selection', 'p1', room='b')
+    tracer.flush()
+
+    events = read_events(path)
+    names = track_names(events)
+    assert sorted(names.values()) == ['room a', 'room b']
+    [deal] = [event for event in events if event['name'] == 'deal']
+    assert names[deal['tid']] == 'room a' and deal['args'] == {'turn': 1, 'room': 'a'}
+
+
+def test_dropped_rooms_are_not_named_in_new_files(tmp_path):
+    tracer = Tracer()
+    path = str(tmp_path / 'trace.json')
+    tracer.configure(path, backups=1)
+    for room_id in ('gone', 'kept'):
+        tracer.emit({'name': 'broadcast', 'ph': 'i', 'ts': 0}, room_id)
+    tracer.flush()
+
+    tracer.drop('gone')
+    tracer.max_bytes = 0   # Rotate on the next flush
+    tracer.emit({'name': 'broadcast', 'ph': 'i', 'ts': 0}, 'new')
+    tracer.flush()
+    tracer.file.flush()   # The new file's header is written with the next flush
+
+    assert set(tracer.tracks) == {'kept', 'new'}
+    assert sorted(track_names(read_events(path)).values()) == ['room kept', 'room new']
+    # Track IDs are never reused, even after a room is dropped
+    assert len(set(tracer.tracks.values())) == 2 and tracer.tracks['new'] == 3
+
+
+def test_rooms_leaving_the_worker_drop_their_tracks(tmp_path, monkeypatch):
+    tracer = Tracer()
+    monkeypatch.setattr(rooms_module, 'tracer', tracer)
+    rooms = RoomRegistry(store=SnapshotStore(str(tmp_path)))
+    for room_id in ('spilled', 'expired', 'moved', 'hosted'):
+        rooms.get_or_create(room_id)
+        tracer.emit({'name': 'broadcast', 'ph': 'i', 'ts': 0}, room_id)
+
+    rooms.spill('spilled')
+    rooms.expire('expired')
+    rooms.remove('moved')
+    assert set(tracer.tracks) == {'hosted'}
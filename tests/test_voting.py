@@ -0,0 +1,133 @@
+"""
+Award voting: sharded vote tallies (audience and player votes), and the
+engine's rules for when a player's vote counts
+"""
+import pickle
+import random
+import threading
+import time
+
+import pytest
+
+import game_logic
+from engine import GameEngine, GameError
+from helpers import play_until, seat_bots
+from voting import VoteTally
+
+
+def test_votes_are_counted_once_per_voter_and_can_move():
+    tally = VoteTally(3, shards=4)
+    assert tally.cast('a', 0) is True
+    assert tally.cast('b', 0) is True
+    assert tally.cast('a', 0) is False       # Repeat vote
+    assert tally.cast('a', 2) is True        # Moved
+    assert tally.counts() == [1, 0, 1]
+    assert tally.voters() == 2
+
+
+def test_out_of_range_votes_are_ignored():
+    tally = VoteTally(2)
+    assert tally.cast('a', 2) is False
+    assert tally.cast('a', -1) is False
+    assert tally.counts() == [0, 0]
+
+
+def test_leader_breaks_ties_by_the_nominee_field():
+    tally = VoteTally(2)
+    nominees = [{'prestige': 3}, {'prestige': 7}]
+    assert tally.leader(nominees, 'prestige') is None
+    tally.cast('a', 0)
+    tally.cast('b', 1)
+    assert tally.leader(nominees, 'prestige') == 1
+
+
+def test_closed_tally_refuses_votes():
+    tally = VoteTally(2)
+    tally.cast('a', 1)
+    tally.close()
+    assert tally.cast('b', 0) is False
+    assert tally.counts() == [0, 1]
+
+
+def test_vote_in_flight_during_close_is_not_added_afterwards():
+    tally = VoteTally(2, shards=1)
+    shard = tally.shards[0]
+    shard.lock.acquire()                      # The vote is mid-way, waiting on its shard
+    voter = threading.Thread(target=tally.cast, args=('late', 0))
+    voter.start()
+    time.sleep(0.05)
+
+    closed = {}
+
+    def close():
+        tally.close()
+        closed['counts'] = tally.counts()
+    closer = threading.Thread(target=close)
+    closer.start()
+    time.sleep(0.05)
+    shard.lock.release()
+    voter.join()
+    closer.join()
+
+    # Whatever close() saw is final
+    assert tally.counts() == closed['counts']
+
+
+def test_many_threads_tally_exactly():
+    tally = VoteTally(4)
+
+    def vote(worker):
+        for i in range(500):
+            tally.cast(f'{worker}-{i}', i % 4)
+    threads = [threading.Thread(target=vote, args=(w,)) for w in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert tally.counts() == [1000, 1000, 1000, 1000]
+
+
+def test_pickles_without_locks():
+    tally = VoteTally(2, shards=2)
+    tally.cast('a', 1)
+    restored = pickle.loads(pickle.dumps(tally))
+    assert restored.counts() == [0, 1]
+    assert restored.cast('a', 1) is False and restored.cast('b', 0) is True
+
+
+def test_late_award_vote_is_ignored():
+    random.seed(5)
+    engine = GameEngine(game_logic.GameState())
+    bots = seat_bots(engine, ['heat', 'prestige', 'thrifty', 'planner'], seed=5)
+    engine.quick_start()
+    engine.start_phase1()
+    play_until(engine, bots, 'awards_results')
+
+    scores = {player_id: player['score'] for player_id, player in engine.game_state.players.items()}
+    for player_id in bots:
+        assert engine.vote(player_id, 0) is False
+    assert {player_id: player['score'] for player_id, player in engine.game_state.players.items()} == scores
+    assert engine.game_state.phase == 'awards_results'
+
+
+def test_players_vote_once_for_a_real_nominee():
+    random.seed(6)
+    engine = GameEngine(game_logic.GameState())
+    bots = seat_bots(engine, ['heat', 'prestige', 'thrifty', 'planner'], seed=6)
+    engine.quick_start()
+    engine.start_phase1()
+    play_until(engine, bots, 'awards_voting')
+
+    awards = engine.game_state.awards
+    nominees = awards['categories'][awards['current_category']]['nominees']
+    player_id = next(iter(bots))
+    studio = engine.game_state.players[player_id]['name']
+    allowed = next(i for i, film in enumerate(nominees) if film.get('studio') != studio)
+
+    for bad in ('0', len(nominees), -1):
+        with pytest.raises(GameError):
+            engine.vote(player_id, bad)
+    assert engine.vote(player_id, allowed) is True
+    if engine.game_state.phase == 'awards_voting':
+        with pytest.raises(GameError):
+            engine.vote(player_id, allowed)
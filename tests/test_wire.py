@@ -0,0 +1,62 @@
+"""
+Wire codecs: each state is encoded once per codec, and the json codec's
+text reaches clients as an object, not a string
+"""
+import json
+
+from socketio import packet
+
+import wire
+from app import create_app
+from cards import Record
+from config import load_config
+
+STATE = {
+    'phase': 'talent_selection',
+    'version': 3,
+    'talent_pool': [Record({'name': 'Ada', 'heat': 3, 'id': 'c1'})],
+    'bids': {1: 'p1'},
+    'title': 'Café Society',
+}
+
+
+def test_json_payload_is_encoded_once(monkeypatch):
+    calls = []
+    encode_json = wire.encode_json
+    monkeypatch.setattr(wire, 'encode_json', lambda state: calls.append(state) or encode_json(state))
+
+    payloads = wire.Payloads(STATE)
+    payload, size = payloads.get('json')
+    assert payloads.payload('json') is payload
+    assert payloads.size('json') == size
+    assert len(calls) == 1
+
+    assert isinstance(payload, wire.EncodedJSON)
+    assert size == len(payload.encode('utf-8'))
+    assert json.loads(payload)['bids'] == {'1': 'p1'}
+
+
+def test_packet_json_splices_encoded_arguments():
+    payload = wire.Payloads(STATE).payload('json')
+    packet = wire.PacketJSON.dumps(['game_update', payload], separators=(',', ':'))
+    assert json.loads(packet) == ['game_update', json.loads(json.dumps(STATE))]
+
+    plain = ['event', {'a': [1, 2]}, 'text']
+    assert wire.PacketJSON.dumps(plain, separators=(',', ':')) == json.dumps(plain, separators=(',', ':'))
+    assert wire.PacketJSON.loads('{"a": 1}') == {'a': 1}
+
+
+def test_clients_receive_the_json_codec_as_an_object():
+    config = load_config({'SECRET_KEY': 'test', 'ARCHIVE_PATH': '', 'SPILL_DIR': ''})
+    _, socketio = create_app(config, async_mode='threading')
+    packet_class = socketio.server.packet_class
+
+    sent = packet_class(packet.EVENT, data=['game_update', wire.Payloads(STATE).payload('json')]).encode()
+    received = packet_class(encoded_packet=sent)
+    assert received.data == ['game_update', json.loads(json.dumps(STATE))]
+
+
+def test_negotiate_falls_back_to_json():
+    assert wire.negotiate('carrier-pigeon, json') == 'json'
+    assert wire.negotiate(None) == wire.DEFAULT_CODEC
+    assert wire.handshake('json') == {'codec': 'json'}
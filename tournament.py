@@ -0,0 +1,239 @@
+"""
+Headless tournament runner for Hollywood Moguls
+
+Plays complete games through the real GameEngine (no sockets) with bot
+strategies in every seat, spread across all cores, and reports per-strategy
+win rates and throughput.
+
+Usage:
+    python tournament.py --games 2000 --players 4 --strategies heat,prestige,thrifty,random
+"""
+import argparse
+import contextlib
+import os
+import random
+import secrets
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import game_logic
+from archive import GameArchive, snapshot_game
+from bots import STRATEGIES
+from engine import GameEngine, GameError, minimum_raise, player_war
+
+# Safety net: no real game needs anywhere near this many bot actions
+MAX_STEPS = 20000
+
+def play_game(strategy_names, seed, bidding_mode=game_logic.DEFAULT_BIDDING_MODE, archive=False, game_state=None,
+              observe=None, run_id=None):
+    """
+    Play one full game with a bot per seat.
+
+    Args:
+        strategy_names: Strategy name for each seat
+        seed: Seed for the game's randomness and the bots' decisions
+        bidding_mode: 'concurrent', 'sequential' or 'auction' bidding wars
+        archive: Also return the game's archive rows (see archive.snapshot_game)
+        game_state: GameState to play on, reset() first (default: a new one)
+        observe: Called with the GameState after every round of bot actions
+        run_id: Tag of the run, so archived game IDs (sim-<run_id>-<seed>)
+            don't collide with earlier runs' (default: a random one)
+
+    Returns:
+        Dict with each seat's strategy and final score, and the winning seats
+    """
+    random.seed(seed)
+    if game_state is None:
+        game_state = game_logic.GameState()
+    else:
+        game_state.reset()
+    engine = GameEngine(game_state)
+
+    bots = {}
+    for seat, strategy in enumerate(strategy_names):
+        player_id, _ = engine.join(f'sim-{seat}', f'{strategy.title()} Studios {seat + 1}')
+        bots[player_id] = STRATEGIES[strategy](seed * 1000 + seat)
+
+    engine.quick_start(bidding_mode)
+    engine.start_phase1()
+
+    steps = 0
+    while game_state.phase != 'game_complete':
+        steps += 1
+        if steps > MAX_STEPS:
+            raise RuntimeError(f'Game stalled in {game_state.phase}')
+        play_phase(engine, bots)
+        if observe is not None:
+            observe(game_state)
+
+    scores = {player_id: game_state.players[player_id]['score'] for player_id in bots}
+    best = max(scores.values())
+    result = {
+        'seats': [
+            {'strategy': bots[player_id].name, 'score': scores[player_id]}
+            for player_id in bots
+        ],
+        'winners': [bots[player_id].name for player_id in bots if scores[player_id] == best]
+    }
+    if archive:
+        strategies = {player_id: bot.name for player_id, bot in bots.items()}
+        result['archive'] = snapshot_game(game_state, f'sim-{run_id or secrets.token_hex(4)}-{seed}',
+                                          strategies=strategies)
+    return result
+
+
+def play_phase(engine, bots):
+    """Let every bot act once in the current phase"""
+    game_state = engine.game_state
+    phase = game_state.phase
+    raised = False
+
+    for player_id, bot in bots.items():
+        try:
+            if phase.endswith('_production'):
+                if player_id not in game_state.player_selections:
+                    engine.select_card(player_id, bot.choose_card(game_state, player_id))
+            elif phase.endswith('_bidding'):
+                war = player_war(game_state.bidding_war, player_id)
+                if war is None or player_id in war['bids']:
+                    pass
+                elif game_state.bidding_mode == 'auction':
+                    # A bot's sealed bid is the most it will go to in an auction
+                    amount = minimum_raise(war)
+                    if bot.choose_bid(game_state, player_id) >= amount:
+                        raised = engine.raise_bid(player_id, amount)
+                else:
+                    engine.submit_bid(player_id, bot.choose_bid(game_state, player_id))
+            elif phase.endswith('_bidding_results'):
+                engine.continue_after_bidding(player_id)
+            elif phase.endswith('_packaging'):
+                package_films(engine, bot, player_id)
+                engine.finish_packaging(player_id)
+            elif phase == 'phase1_releases':
+                engine.continue_to_summer(player_id)
+            elif phase == 'phase2_releases':
+                engine.start_awards(player_id)
+            elif phase == 'awards_voting':
+                category = game_state.awards['categories'][game_state.awards['current_category']]
+                if player_id not in category['votes']:
+                    choice = bot.choose_vote(game_state, player_id, category['nominees'])
+                    if choice is not None:
+                        engine.vote(player_id, choice)
+            elif phase == 'awards_results':
+                engine.continue_from_awards(player_id)
+        except GameError:
+            # Bots that ask for something illegal just lose their action;
+            # a rejected card selection falls back to passing
+            if phase.endswith('_production') and player_id not in game_state.player_selections:
+                engine.select_card(player_id, 'pass')
+
+        if game_state.phase != phase:
+            return
+
+    # Nobody raised this round: let the auctions close rather than wait them out
+    if phase.endswith('_bidding') and not raised:
+        engine.close_auctions()
+
+
+def package_films(engine, bot, player_id):
+    """Greenlight films until the bot has no roles left"""
+    count = 0
+    while True:
+        package = bot.next_film(engine.game_state, player_id)
+        if not package:
+            return
+        count += 1
+        engine.greenlight_film(player_id, package, f'{bot.name.title()} Picture {count}')
+
+
+def run_batch(lineups, seeds, bidding_mode, archive=False, run_id=None):
+    """Worker entry point: play a batch of games with the engine's logging silenced"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        return [play_game(lineup, seed, bidding_mode, archive, run_id=run_id)
+                for lineup, seed in zip(lineups, seeds)]
+
+
+def run_tournament(strategy_names, games, players, workers=None, batch_size=50, seed=0,
+                   bidding_mode=game_logic.DEFAULT_BIDDING_MODE, archive=None):
+    """
+    Play `games` games across a process pool, rotating strategies through seats.
+    If `archive` (a GameArchive) is given, every game is archived to it.
+
+    Returns:
+        Dict with per-strategy stats, total games and games per second
+    """
+    lineups = [
+        [strategy_names[(game + seat) % len(strategy_names)] for seat in range(players)]
+        for game in range(games)
+    ]
+    seeds = [seed + game for game in range(games)]
+    run_id = secrets.token_hex(4)
+
+    stats = {name: {'seats': 0, 'wins': 0.0, 'total_score': 0} for name in strategy_names}
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(run_batch, lineups[i:i + batch_size], seeds[i:i + batch_size], bidding_mode,
+                        archive is not None, run_id)
+            for i in range(0, games, batch_size)
+        ]
+        for future in futures:
+            for result in future.result():
+                if archive is not None:
+                    archive.submit(result['archive'])
+                for seat in result['seats']:
+                    stats[seat['strategy']]['seats'] += 1
+                    stats[seat['strategy']]['total_score'] += seat['score']
+                # Shared wins are split between the tied seats
+                for winner in result['winners']:
+                    stats[winner]['wins'] += 1 / len(result['winners'])
+
+    elapsed = time.perf_counter() - start
+    return {
+        'strategies': stats,
+        'games': games,
+        'seconds': elapsed,
+        'games_per_second': games / elapsed if elapsed else float('inf')
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run headless Hollywood Moguls tournaments')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--players', type=int, default=4)
+    parser.add_argument('--strategies', default=','.join(STRATEGIES),
+                        help=f'comma-separated, from: {", ".join(STRATEGIES)}')
+    parser.add_argument('--workers', type=int, default=None, help='default: all cores')
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--bidding-mode', choices=game_logic.BIDDING_MODES, default=game_logic.DEFAULT_BIDDING_MODE)
+    parser.add_argument('--archive', metavar='DB', help='also archive every game to this SQLite file')
+    args = parser.parse_args()
+
+    strategy_names = args.strategies.split(',')
+    unknown = [name for name in strategy_names if name not in STRATEGIES]
+    if unknown:
+        parser.error(f'unknown strategies: {", ".join(unknown)}')
+
+    archive = GameArchive(args.archive) if args.archive else None
+    report = run_tournament(strategy_names, args.games, args.players,
+                            workers=args.workers, batch_size=args.batch_size, seed=args.seed,
+                            bidding_mode=args.bidding_mode, archive=archive)
+    if archive is not None:
+        archive.close()
+
+    print("\n" + "="*50)
+    print(f"🎬 TOURNAMENT: {report['games']} games, {args.players} players")
+    print("="*50)
+    for name, s in sorted(report['strategies'].items(), key=lambda kv: -kv[1]['wins']):
+        seats = s['seats'] or 1
+        print(f"  {name:<10} win rate {s['wins'] / seats:6.1%}   avg score {s['total_score'] / seats:8.1f}   ({s['seats']} seats)")
+    print(f"\n  {report['seconds']:.2f}s, {report['games_per_second']:.1f} games/sec")
+    if archive is not None:
+        print(f"  {archive.written} games archived to {args.archive}")
+    print("="*50 + "\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+"""
+Chrome trace / Perfetto spans for Hollywood Moguls
+
+Tracing is off unless TRACE_DIR is set. Each worker then writes
+TRACE_DIR/moguls-<worker>.trace.json in the Chrome trace event format (open
+it at ui.perfetto.dev or chrome://tracing), rotating it once it grows past
+TRACE_MAX_MB and keeping TRACE_BACKUPS older files. Events are appended as
+they are flushed and the closing ']' is never written, which both viewers
+accept, so a worker can be killed at any time without losing its trace.
+
+Every room gets a track of its own, with two kinds of spans on it:
+
+    complete spans  server work: socket handlers, dealing a turn, resolving
+                    selections, awarding cards, each bidding war's result,
+                    releases, award tallies and broadcasting state
+    async spans     waiting: for each player's card selection, and for each
+                    bidding war from its start to its resolution
+
+Spans carry the room, phase, turn and (where there is one) player, so a
+40-second turn shows whether the time went to the server, to a player who
+hadn't chosen yet, or to fanning updates out to the room. A room's track
+is dropped when it is spilled, expires or moves away (it gets a new one if
+it comes back), so each new file only names the rooms still hosted.
+"""
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+from scheduler import scheduler
+
+# Seconds between writes of the buffered events
+FLUSH_INTERVAL = 1.0
+
+# Buffered events that force a write before the next flush
+MAX_BUFFERED = 10000
+
+
+def now_us():
+    # Wall-clock microseconds, so traces from different workers line up
+    return time.time_ns() // 1000
+
+
+class Tracer:
+    """Buffers trace events and writes them to a rotating file"""
+
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self.max_bytes = 0
+        self.backups = 0
+        self.process_name = None
+        self.pid = os.getpid()
+        self.tracks = {}     # {room_id: tid} for the rooms this worker hosts
+        self.last_tid = 0
+        self.buffer = []
+        self.lock = threading.Lock()
+        self.file = None
+
+    def configure(self, path, max_mb=50, backups=3, process_name=None):
+        """Start tracing to `path` (rotated to path.1 ... path.<backups>)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self.lock:
+            self.path = path
+            self.max_bytes = max_mb * 1024 * 1024
+            self.backups = backups
+            self.process_name = process_name
+            self.pid = os.getpid()
+            self._open()
+            self.enabled = True
+        print(f'🔍 Tracing to {path}')
+
+    def _open(self):
+        is_new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self.file = open(self.path, 'a', encoding='utf-8')
+        if is_new:
+            self.file.write('[\n')
+        # Track names go at the top of every file, so each one opens on its own
+        if self.process_name:
+            self._write({'name': 'process_name', 'ph': 'M', 'pid': self.pid,
+                         'args': {'name': self.process_name}})
+        for room_id, tid in self.tracks.items():
+            self._write(self._track_name(room_id, tid))
+
+    def _rotate(self):
+        self.file.close()
+        for index in range(self.backups, 0, -1):
+            source = self.path if index == 1 else f'{self.path}.{index - 1}'
+            if os.path.exists(source):
+                os.replace(source, f'{self.path}.{index}')
+        if not self.backups:
+            os.remove(self.path)
+        self._open()
+
+    def _write(self, event):
+        self.file.write(json.dumps(event, separators=(',', ':'), default=str) + ',\n')
+
+    def _track_name(self, room_id, tid):
+        return {'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': tid,
+                'args': {'name': f'room {room_id}'}}
+
+    def _track(self, room_id):
+        tid = self.tracks.get(room_id)
+        if tid is None:
+            self.last_tid += 1
+            tid = self.tracks[room_id] = self.last_tid
+            self.buffer.append(self._track_name(room_id, tid))
+        return tid
+
+    def drop(self, room_id):
+        """Forget a room's track once this worker no longer hosts it"""
+        with self.lock:
+            self.tracks.pop(room_id, None)
+
+    def emit(self, event, room=None):
+        """Queue one raw trace event on `room`'s track"""
+        with self.lock:
+            event['pid'] = self.pid
+            event['tid'] = self._track(room)
+            self.buffer.append(event)
+            full = len(self.buffer) >= MAX_BUFFERED
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            if not self.enabled or not self.buffer:
+                return
+            events, self.buffer = self.buffer, []
+            for event in events:
+                self._write(event)
+            self.file.flush()
+            if self.file.tell() >= self.max_bytes:
+                self._rotate()
+
+    def start(self):
+        """Flush every FLUSH_INTERVAL seconds on the shared scheduler"""
+        def run():
+            try:
+                self.flush()
+            except OSError as e:
+                print(f'❌ Writing trace failed: {e}')
+            scheduler.call_later(FLUSH_INTERVAL, run)
+        scheduler.call_later(FLUSH_INTERVAL, run)
+
+    # ============================================================================
+    # SPANS
+    # ============================================================================
+
+    @contextlib.contextmanager
+    def _span(self, name, cat, room, args):
+        started = now_us()
+        try:
+            yield
+        finally:
+            self.emit({'name': name, 'cat': cat, 'ph': 'X', 'ts': started,
+                       'dur': now_us() - started, 'args': args}, room)
+
+    def span(self, name, cat, room=None, **args):
+        """Context manager timing a block of server work"""
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._span(name, cat, room, dict(args, room=room))
+
+    def begin(self, name, key, room=None, **args):
+        """Start waiting on something (ended by end() with the same key)"""
+        if self.enabled:
+            self.emit({'name': name, 'cat': 'wait', 'ph': 'b', 'id': f'{room}/{key}',
+                       'ts': now_us(), 'args': dict(args, room=room)}, room)
+
+    def end(self, name, key, room=None, **args):
+        if self.enabled:
+            self.emit({'name': name, 'cat': 'wait', 'ph': 'e', 'id': f'{room}/{key}',
+                       'ts': now_us(), 'args': args}, room)
+
+
+# Process-wide tracer shared by every room
+tracer = Tracer()
+
+
+def traced(name, player=False):
+    """
+    Decorator for GameEngine methods: a span per call on the game's room
+    track. With player=True the method's first argument is the player ID.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not tracer.enabled:
+                return method(self, *args, **kwargs)
+            attributes = self.trace_args(args[0] if player else None)
+            with tracer.span(name, 'engine', **attributes):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,104 @@
+"""
+Incremental, sharded vote tallies for Hollywood Moguls award voting
+
+An award category can be voted on by the seated players and by a live
+audience of thousands. Each voter's choice lands in one of several shards
+(picked by hashing the voter ID), and each shard keeps its own per-nominee
+counters under its own lock, so concurrent votes rarely contend and nothing
+is ever recounted: reading the totals costs shards x nominees, however many
+votes were cast. A voter who votes again moves their vote rather than
+adding a second one.
+"""
+import threading
+import zlib
+
+DEFAULT_SHARDS = 16
+
+
+class TallyShard:
+    __slots__ = ('lock', 'choices', 'counts')
+
+    def __init__(self, num_nominees):
+        self.lock = threading.Lock()
+        self.choices = {}                   # {voter_id: nominee_index}
+        self.counts = [0] * num_nominees
+
+
+class VoteTally:
+    """Per-nominee vote counters, deduplicated by voter"""
+
+    def __init__(self, num_nominees, shards=DEFAULT_SHARDS):
+        self.num_nominees = num_nominees
+        self.shards = [TallyShard(num_nominees) for _ in range(shards)]
+        self.closed = False
+
+    def _shard(self, voter_id):
+        return self.shards[zlib.crc32(voter_id.encode('utf-8')) % len(self.shards)]
+
+    def cast(self, voter_id, nominee_index):
+        """
+        Record (or move) a voter's vote.
+
+        Returns:
+            True if the tally changed, False for a repeat vote or once closed
+        """
+        if not 0 <= nominee_index < self.num_nominees:
+            return False
+        shard = self._shard(voter_id)
+        with shard.lock:
+            # Checked under the lock: close() holds every shard's while it closes
+            if self.closed:
+                return False
+            previous = shard.choices.get(voter_id)
+            if previous == nominee_index:
+                return False
+            if previous is not None:
+                shard.counts[previous] -= 1
+            shard.choices[voter_id] = nominee_index
+            shard.counts[nominee_index] += 1
+        return True
+
+    def close(self):
+        """Stop accepting votes; votes already being counted finish first"""
+        for shard in self.shards:
+            shard.lock.acquire()
+        try:
+            self.closed = True
+        finally:
+            for shard in self.shards:
+                shard.lock.release()
+
+    def counts(self):
+        """Votes per nominee"""
+        totals = [0] * self.num_nominees
+        for shard in self.shards:
+            for index, count in enumerate(shard.counts):
+                totals[index] += count
+        return totals
+
+    def voters(self):
+        return sum(len(shard.choices) for shard in self.shards)
+
+    def leader(self, nominees, tiebreak):
+        """Index of the nominee with the most votes (ties: highest `tiebreak`), or None"""
+        counts = self.counts()
+        if not any(counts):
+            return None
+        return max(range(self.num_nominees), key=lambda i: (counts[i], nominees[i].get(tiebreak, 0)))
+
+    def __getstate__(self):
+        # Locks can't be pickled (rooms are pickled when they move between workers)
+        return {
+            'num_nominees': self.num_nominees,
+            'closed': self.closed,
+            'shards': [(dict(shard.choices), list(shard.counts)) for shard in self.shards]
+        }
+
+    def __setstate__(self, state):
+        self.num_nominees = state['num_nominees']
+        self.closed = state['closed']
+        self.shards = []
+        for choices, counts in state['shards']:
+            shard = TallyShard(self.num_nominees)
+            shard.choices, shard.counts = choices, counts
+            self.shards.append(shard)
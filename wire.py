@@ -0,0 +1,159 @@
+"""
+Wire codecs for Hollywood Moguls game state
+
+game_update is the one big, frequent message, so each socket picks how it
+is encoded when it connects (?codecs=msgpack,orjson,json, most preferred
+first) and the server takes the first one it has installed:
+
+    json      plain JSON (always available), encoded once per state and
+              spliced into each Socket.IO packet as is (see PacketJSON)
+    orjson    the same JSON, encoded by orjson and sent as a binary attachment
+    msgpack   MessagePack, with talent cards and films compacted: a record
+              whose keys match one of RECORD_SHAPES goes out as ext type 1
+              holding [shape index, *values] instead of a map, so 'name',
+              'heat_bucket', 'prestige_bucket', ... aren't repeated on every
+              card. The shapes are sent to the client when it connects.
+
+orjson and msgpack are optional (pip install orjson msgpack). A room
+broadcasts once per codec in use, so encoding costs grow with the
+codecs its sockets chose, not with how many sockets there are.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # Optional: the fast-JSON codec is only offered when installed
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # Optional: the MessagePack codec is only offered when installed
+    msgpack = None
+
+from cards import Record
+
+DEFAULT_CODEC = 'json'
+
+# MessagePack extension type of a compacted record
+RECORD_EXT = 1
+
+# Key orders of the interned records every game sends (talent, talent with
+# an audience or genre, and films)
+RECORD_SHAPES = [
+    ('name', 'role', 'heat', 'heat_bucket', 'prestige', 'prestige_bucket', 'salary', 'id'),
+    ('name', 'role', 'heat', 'heat_bucket', 'prestige', 'prestige_bucket', 'salary', 'audience', 'id'),
+    ('name', 'role', 'heat', 'heat_bucket', 'prestige', 'prestige_bucket', 'salary', 'genre', 'id'),
+    ('title', 'teaser', 'roles', 'studio', 'player_id', 'heat', 'prestige', 'genre', 'audience', 'id'),
+]
+SHAPE_INDEX = {shape: index for index, shape in enumerate(RECORD_SHAPES)}
+
+
+# Cards and films are immutable and sent over and over, so each one is
+# packed once: {id(record): (record, packed)}, cleared when it gets this big
+MAX_PACKED = 50000
+_packed = {}
+
+
+def _msgpack_default(value):
+    # strict_types sends every Record and tuple here, so cards can be compacted
+    if isinstance(value, Record):
+        cached = _packed.get(id(value))
+        if cached is not None and cached[0] is value:
+            return cached[1]
+        shape = SHAPE_INDEX.get(tuple(value))
+        if shape is None:
+            return dict(value)
+        if len(_packed) >= MAX_PACKED:
+            _packed.clear()
+        packed = msgpack.ExtType(RECORD_EXT, _pack([shape, *value.values()]))
+        _packed[id(value)] = (value, packed)
+        return packed
+    if isinstance(value, tuple):
+        return list(value)
+    raise TypeError(f'Cannot encode {type(value).__name__}')
+
+
+def _pack(value):
+    return msgpack.packb(value, default=_msgpack_default, strict_types=True, use_bin_type=True)
+
+
+def encode_json(state):
+    return json.dumps(state, separators=(',', ':'))
+
+
+class EncodedJSON(str):
+    """JSON text that PacketJSON puts in a Socket.IO packet without re-encoding"""
+
+    __slots__ = ()
+
+
+def encode_packet_json(state):
+    return EncodedJSON(encode_json(state))
+
+
+class PacketJSON:
+    """
+    The json module the Socket.IO server encodes packets with (see
+    create_app): like json, except EncodedJSON arguments are inserted
+    verbatim, so the client receives them as objects, not strings
+    """
+
+    @staticmethod
+    def dumps(data, **kwargs):
+        if isinstance(data, list) and any(isinstance(item, EncodedJSON) for item in data):
+            return '[' + ','.join(item if isinstance(item, EncodedJSON) else json.dumps(item, **kwargs)
+                                  for item in data) + ']'
+        return json.dumps(data, **kwargs)
+
+    loads = staticmethod(json.loads)
+
+
+def encode_orjson(state):
+    # Like json, some dicts are keyed by card index
+    return orjson.dumps(state, option=orjson.OPT_NON_STR_KEYS)
+
+
+# {codec: encode(state) -> payload}
+CODECS = {'json': encode_packet_json}
+if orjson is not None:
+    CODECS['orjson'] = encode_orjson
+if msgpack is not None:
+    CODECS['msgpack'] = _pack
+
+
+def negotiate(requested):
+    """The first installed codec of a comma-separated preference list"""
+    for name in (requested or '').split(','):
+        if name.strip() in CODECS:
+            return name.strip()
+    return DEFAULT_CODEC
+
+
+def handshake(codec):
+    """What a client needs to decode `codec`"""
+    info = {'codec': codec}
+    if codec == 'msgpack':
+        info['shapes'] = RECORD_SHAPES
+    return info
+
+
+class Payloads:
+    """One state's payload and size per codec, each encoded at most once"""
+
+    def __init__(self, state):
+        self.state = state
+        self.encoded = {}   # {codec: (payload, bytes)}
+
+    def get(self, codec):
+        encoded = self.encoded.get(codec)
+        if encoded is None:
+            payload = CODECS[codec](self.state)
+            encoded = (payload, len(payload))   # JSON is ASCII (ensure_ascii), so characters are bytes
+            self.encoded[codec] = encoded
+        return encoded
+
+    def payload(self, codec):
+        return self.get(codec)[0]
+
+    def size(self, codec):
+        return self.get(codec)[1]